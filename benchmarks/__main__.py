@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Benchmark pype's startup and dispatch latency on synthetic plugin trees.
+
+Every scenario runs pype in a fresh interpreter and reports percentiles of
+the wall-clock time in milliseconds. Results can be stored as a JSON baseline
+and later runs compared against it to detect regressions.
+"""
+
+import platform
+import subprocess
+import sys
+from itertools import product
+from json import dump, load
+from os import environ, path
+from tempfile import TemporaryDirectory
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+from tabulate import tabulate
+
+from benchmarks.tree import BenchmarkTree
+
+# Python code to run pype as it is run from its console script
+PYPE_MAIN_CODE = ('import sys; sys.argv[0] = "pype"; '
+                  'from pype.__main__ import main; main()')
+
+# Bash code completing "pype plugin0 " with the static completion script
+COMPLETION_CODE = ('. "$1/complete-bsh"; COMP_WORDS=(pype plugin0 ""); '
+                   'COMP_CWORD=2; _pype_cli; echo "${COMPREPLY[@]}"')
+
+PERCENTILES = [50, 90, 99]
+
+ScenarioCommand = Callable[[BenchmarkTree], List[str]]
+
+
+def _pype(*arguments: str) -> ScenarioCommand:
+    return lambda tree: [sys.executable, '-c', PYPE_MAIN_CODE] + list(
+        arguments)
+
+
+# Scenarios as name, command and whether caches are reset before each run
+SCENARIOS: Dict[str, Tuple[ScenarioCommand, bool]] = {
+    'cold-start': (_pype('--help'), True),
+    'help': (_pype('--help'), False),
+    'list': (_pype('--list-pypes'), False),
+    'aliases': (_pype('--aliases'), False),
+    'dispatch': (_pype('plugin0', 'pype0', '--name', 'a'), False),
+    'completion': (lambda tree: [
+        'bash', '-c', COMPLETION_CODE, 'bash', tree.config_dir
+    ], False)
+}
+
+
+@click.command(help=__doc__)
+@click.option('--plugins', '-p', default='1,10', show_default=True,
+              help='Comma-separated numbers of plugins.')
+@click.option('--pypes', '-y', default='10,100', show_default=True,
+              help='Comma-separated numbers of pypes per plugin.')
+@click.option('--sizes', '-s', default='small,huge', show_default=True,
+              help='Comma-separated pype sizes (small, huge).')
+@click.option('--scenario', '-c', 'scenarios', multiple=True,
+              type=click.Choice(list(SCENARIOS.keys())),
+              help='Scenario to run (default: all).')
+@click.option('--repeat', '-r', default=10, show_default=True,
+              help='Measured runs per scenario.')
+@click.option('--warmup', '-w', default=1, show_default=True,
+              help='Unmeasured runs per scenario.')
+@click.option('--save', metavar='FILE',
+              help='Store results as JSON baseline.')
+@click.option('--compare', metavar='FILE',
+              help='Compare results with a JSON baseline.')
+@click.option('--threshold', '-t', default=0.2, show_default=True,
+              help='Relative p50 increase considered a regression.')
+def main(
+    plugins: str,
+    pypes: str,
+    sizes: str,
+    scenarios: Tuple[str, ...],
+    repeat: int,
+    warmup: int,
+    save: Optional[str],
+    compare: Optional[str],
+    threshold: float
+) -> None:
+    """Script's main entry point."""
+    results: Dict[str, Dict[str, float]] = {}
+    with TemporaryDirectory() as base_dir:
+        for plugin_count, pype_count, size in product(
+            __split_ints(plugins), __split_ints(pypes), sizes.split(',')
+        ):
+            tree = BenchmarkTree(base_dir, plugin_count, pype_count, size)
+            for scenario in scenarios or SCENARIOS.keys():
+                key = f'{tree.name}/{scenario}'
+                print(f'Running {key}', file=sys.stderr)
+                results[key] = run_scenario(tree, scenario, repeat, warmup)
+    print(format_results(results))
+    if save:
+        with open(save, 'w+') as baseline_file:
+            dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'repeat': repeat
+                },
+                'results': results
+            }, baseline_file, indent=4, sort_keys=True)
+        print(f'Stored baseline to {save}', file=sys.stderr)
+    if compare:
+        with open(compare, 'r') as baseline_file:
+            baseline = load(baseline_file)['results']
+        report, regressions = compare_results(results, baseline, threshold)
+        print(report)
+        if regressions:
+            print(f'{regressions} regression(s) found.', file=sys.stderr)
+            exit(1)
+
+
+def run_scenario(
+    tree: BenchmarkTree,
+    scenario: str,
+    repeat: int,
+    warmup: int
+) -> Dict[str, float]:
+    """Run a scenario repeatedly and return timing percentiles in ms."""
+    command, cold = SCENARIOS[scenario]
+    env = dict(environ)
+    env['PYPE_CONFIG_FOLDER'] = tree.config_dir
+    env['PYTHONPATH'] = path.dirname(path.dirname(path.abspath(__file__)))
+    # Populate caches and completion files before measuring
+    subprocess.run(_pype('--help')(tree), env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    timings: List[float] = []
+    for run in range(warmup + repeat):
+        if cold:
+            tree.reset_caches()
+        start_ns = perf_counter_ns()
+        subprocess.run(command(tree), env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        if run >= warmup:
+            timings.append((perf_counter_ns() - start_ns) / 1e6)
+    return summarize(timings)
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Return min, mean and percentiles of the given timings."""
+    ordered = sorted(timings)
+    summary = {
+        'min': ordered[0],
+        'mean': sum(ordered) / len(ordered)
+    }
+    for percentile in PERCENTILES:
+        # Nearest-rank method
+        rank = max(1, -(-percentile * len(ordered) // 100))
+        summary[f'p{percentile}'] = ordered[rank - 1]
+    return {key: round(value, 3) for key, value in summary.items()}
+
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """Format results as table."""
+    columns = ['min', 'mean'] + [f'p{p}' for p in PERCENTILES]
+    return tabulate([
+        [key] + [summary[column] for column in columns]
+        for key, summary in results.items()
+    ], headers=['benchmark (ms)'] + columns, floatfmt='.1f')
+
+
+def compare_results(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float
+) -> Tuple[str, int]:
+    """Compare p50 timings with a baseline and count regressions."""
+    rows = []
+    regressions = 0
+    for key, summary in results.items():
+        if key not in baseline:
+            continue
+        change = summary['p50'] / baseline[key]['p50'] - 1
+        regressed = change > threshold
+        regressions += int(regressed)
+        rows.append([key, baseline[key]['p50'], summary['p50'],
+                     f'{change:+.1%}', 'REGRESSION' if regressed else ''])
+    return tabulate(rows, headers=[
+        'benchmark', 'baseline p50', 'p50', 'change', ''
+    ], floatfmt='.1f'), regressions
+
+
+def __split_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(',')]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Synthetic plugin trees to benchmark against."""
+
+from json import dump
+from os import mkdir, path, remove
+from typing import List
+
+# Number of filler functions making up a huge pype
+HUGE_PYPE_FUNCTIONS = 1000
+
+
+def small_pype(index: int) -> str:
+    """Source of a small pype with a few options."""
+    return f'''# -*- coding: utf-8 -*-
+"""Benchmark pype {index}."""
+
+import click
+
+
+@click.command(help=__doc__)
+@click.option('--name', '-n', type=click.Choice(['a', 'b']), help='Name.')
+@click.option('--verbose', '-v', is_flag=True, help='Verbose.')
+def main(name: str, verbose: bool) -> None:  # noqa: D103
+    print(name)
+'''
+
+
+def huge_pype_filler(index: int) -> str:
+    """Source of a filler function blowing up a pype's size."""
+    return f'''
+
+def function_{index}(value: int) -> int:
+    """Return the given value plus {index}."""
+    return value + {index}
+'''
+
+
+class BenchmarkTree:
+    """Plugin tree with a configuration folder of its own."""
+
+    def __init__(
+        self,
+        base_dir: str,
+        plugins: int,
+        pypes: int,
+        size: str,
+        aliases: int = 20
+    ) -> None:
+        """Create the tree below the given base directory."""
+        self.name = f'{plugins}x{pypes}-{size}'
+        self.config_dir = path.join(base_dir, self.name)
+        self.plugin_names = [f'plugin{i}' for i in range(plugins)]
+        self.pype_names = [f'pype{i}' for i in range(pypes)]
+        mkdir(self.config_dir)
+        plugin_dir = path.join(self.config_dir, 'plugins')
+        mkdir(plugin_dir)
+        for plugin_name in self.plugin_names:
+            self.__create_plugin(plugin_dir, plugin_name, size)
+        with open(path.join(self.config_dir, 'config.json'), 'w+') as config:
+            dump({
+                'plugins': [{
+                    'name': plugin_name, 'path': plugin_dir, 'users': []
+                } for plugin_name in self.plugin_names],
+                'aliases': [{
+                    'alias': f'alias{i}',
+                    'command': f'pype {self.plugin_names[0]} pype0'
+                } for i in range(aliases)],
+                'core_config': None
+            }, config, indent=4)
+        # Mark shell features as installed to get completion files
+        open(path.join(self.config_dir, 'initfile-bsh'), 'w+').close()
+
+    def reset_caches(self) -> None:
+        """Remove all caches pype writes to the configuration folder."""
+        for filename in ['manifest.json', 'config.cache']:
+            filepath = path.join(self.config_dir, filename)
+            if path.isfile(filepath):
+                remove(filepath)
+
+    def __create_plugin(
+        self,
+        plugin_dir: str,
+        plugin_name: str,
+        size: str
+    ) -> None:
+        plugin_path = path.join(plugin_dir, plugin_name)
+        mkdir(plugin_path)
+        with open(path.join(plugin_path, '__init__.py'), 'w+') as init:
+            init.write(f'"""Benchmark plugin {plugin_name}."""\n')
+        for index, pype_name in enumerate(self.pype_names):
+            source: List[str] = [small_pype(index)]
+            if size == 'huge':
+                source.extend([
+                    huge_pype_filler(filler)
+                    for filler in range(HUGE_PYPE_FUNCTIONS)
+                ])
+            with open(path.join(plugin_path, pype_name + '.py'), 'w+') as pype:
+                pype.write(''.join(source))
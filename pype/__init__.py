@@ -5,14 +5,65 @@
 :license: Apache 2.0, see LICENSE for more details.
 """
 
-from pype.config_handler import PypeConfigHandler as Config  # noqa: F401
-from pype.core import print_context_help  # noqa: F401
-from pype.util.cli import fname_to_name  # noqa: F401
-from pype.util.cli import print_error  # noqa: F401
-from pype.util.cli import print_success  # noqa: F401
-from pype.util.cli import print_warning  # noqa: F401
-from pype.util.iotools import open_with_default  # noqa: F401
-from pype.util.iotools import resolve_path  # noqa: F401
-from pype.util.iotools import run_and_get_output as sho  # noqa: F401
-from pype.util.iotools import run_interactive as sh  # noqa: F401
-from pype.util.multi_cmd import generate_dynamic_multicommand  # noqa: F401
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from pype.config_handler import get_config_handler as Config  # noqa
+    from pype.core import print_context_help  # noqa: F401
+    from pype.util.aiotools import \
+        run_and_get_output_async as sho_async  # noqa
+    from pype.util.aiotools import run_async  # noqa: F401
+    from pype.util.aiotools import run_interactive_async as sh_async  # noqa
+    from pype.util.cache import cached  # noqa: F401
+    from pype.util.cli import fname_to_name  # noqa: F401
+    from pype.util.cli import print_error  # noqa: F401
+    from pype.util.cli import print_success  # noqa: F401
+    from pype.util.cli import print_warning  # noqa: F401
+    from pype.util.iotools import open_with_default  # noqa: F401
+    from pype.util.iotools import resolve_path  # noqa: F401
+    from pype.util.iotools import run_and_get_output as sho  # noqa: F401
+    from pype.util.iotools import run_and_stream_output as sho_stream  # noqa
+    from pype.util.iotools import run_interactive as sh  # noqa: F401
+    from pype.util.iotools import run_many_and_get_output as sho_many  # noqa
+    from pype.util.iotools import run_many_interactive as sh_many  # noqa
+    from pype.util.multi_cmd import generate_dynamic_multicommand  # noqa
+
+# Public API resolved on first access to keep startup fast
+_LAZY_EXPORTS: Dict[str, Tuple[str, str]] = {
+    'Config': ('pype.config_handler', 'get_config_handler'),
+    'print_context_help': ('pype.core', 'print_context_help'),
+    'sho_async': ('pype.util.aiotools', 'run_and_get_output_async'),
+    'run_async': ('pype.util.aiotools', 'run_async'),
+    'sh_async': ('pype.util.aiotools', 'run_interactive_async'),
+    'cached': ('pype.util.cache', 'cached'),
+    'fname_to_name': ('pype.util.cli', 'fname_to_name'),
+    'print_error': ('pype.util.cli', 'print_error'),
+    'print_success': ('pype.util.cli', 'print_success'),
+    'print_warning': ('pype.util.cli', 'print_warning'),
+    'open_with_default': ('pype.util.iotools', 'open_with_default'),
+    'resolve_path': ('pype.util.iotools', 'resolve_path'),
+    'sho': ('pype.util.iotools', 'run_and_get_output'),
+    'sho_stream': ('pype.util.iotools', 'run_and_stream_output'),
+    'sh': ('pype.util.iotools', 'run_interactive'),
+    'sho_many': ('pype.util.iotools', 'run_many_and_get_output'),
+    'sh_many': ('pype.util.iotools', 'run_many_interactive'),
+    'generate_dynamic_multicommand': (
+        'pype.util.multi_cmd', 'generate_dynamic_multicommand'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public API members on first access."""
+    try:
+        module_name, attribute = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f'module \'pype\' has no attribute \'{name}\'')
+    value = getattr(import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List public API members including not yet imported ones."""
+    return sorted(list(globals().keys()) + list(_LAZY_EXPORTS.keys()))
@@ -2,9 +2,7 @@
 # -*- coding: utf-8 -*-
 """PYPE - A command-line tool for command-line tools."""
 
-from os import listdir, path
 from re import sub
-from sys import path as syspath
 from typing import Any, Callable, List
 
 import click
@@ -14,14 +12,37 @@ from colorama import init
 from pype.core import PypeCore, print_context_help
 from pype.exceptions import PypeException
 from pype.type_plugin import Plugin
-from pype.util.benchmark import Benchmark
-from pype.util.cli import fname_to_name, print_error
+from pype.util.cli import print_error
 from pype.util.iotools import open_with_default
+from pype.util.profiler import PROFILE_STARTUP_OPTION, count, span
 
-PYPE_CORE = PypeCore()
+try:
+    PYPE_CORE = PypeCore()
+except PypeException as pype_exception:
+    print_error(str(pype_exception))
+    exit(1)
+
+
+class PypeMainCLI(click.Group):
+    """Root command binding plugins only when they are requested."""
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """Return plugin names from metadata without importing them."""
+        return sorted([
+            plugin.name for plugin in _get_core(ctx).get_plugins()])
+
+    def get_command(self, ctx: click.Context, name: str) -> Any:
+        """Bind the requested plugin on first access."""
+        if name not in self.commands:
+            plugin = _get_core(ctx).get_plugin(name)
+            if not plugin:
+                return None
+            _bind_plugin(plugin.name, plugin)
+        return self.commands.get(name)
 
 
 @click.group(
+    cls=PypeMainCLI,
     invoke_without_command=True,
     context_settings=dict(help_option_names=['-h', '--help']),
     help=__doc__
@@ -30,6 +51,22 @@ PYPE_CORE = PypeCore()
     '--list-pypes', '-l', is_flag=True,
     help='Print all available pypes.'
 )
+@click.option(
+    '--filter', 'list_filter', metavar='PATTERN',
+    help='Only print pypes matching the glob pattern, e.g., "myplugin *".'
+)
+@click.option(
+    '--regex', is_flag=True,
+    help='Match pypes by the regular expression given with "--filter".'
+)
+@click.option(
+    '--json', 'list_json', is_flag=True,
+    help='Print pypes as JSON.'
+)
+@click.option(
+    '--tsv', 'list_tsv', is_flag=True,
+    help='Print pypes as tab-separated values.'
+)
 @click.option(
     '--aliases', '-a', is_flag=True,
     help='Print all available aliases.'
@@ -46,24 +83,52 @@ PYPE_CORE = PypeCore()
     '--open-config', '-o', is_flag=True,
     help='Open config file in default editor.'
 )
+@click.option(
+    '--server', is_flag=True,
+    help='Run resident server for fast calls via pype-client.'
+)
+@click.option(
+    PROFILE_STARTUP_OPTION, is_flag=True,
+    help='Print timings and counters of this call to stderr on exit.'
+)
 @click.pass_context
 def main(
     ctx: Any,
     list_pypes: bool,
+    list_filter: str,
+    regex: bool,
+    list_json: bool,
+    list_tsv: bool,
     aliases: bool,
     open_config: bool,
     alias_register: str,
-    alias_unregister: str
+    alias_unregister: str,
+    server: bool,
+    profile_startup: bool
 ) -> None:
     """Pype main entry point."""
+    # Profiling was already activated on import, see pype.util.profiler
+    if server:
+        _run_server(ctx)
+        return
     if not _process_alias_configuration(
             ctx, list_pypes, open_config, alias_register, alias_unregister):
         print_context_help(ctx, level=1)
         return
+    if not _process_listing_options(
+            list_pypes, list_filter, regex, list_json, list_tsv):
+        print_context_help(ctx, level=1)
+        return
     if open_config:
         PYPE_CORE.open_config_with_default()
     elif list_pypes:
-        PYPE_CORE.list_pypes()
+        output_format = ('json' if list_json
+                         else 'tsv' if list_tsv else 'text')
+        try:
+            PYPE_CORE.list_pypes(list_filter, regex, output_format)
+        except PypeException as pype_exception:
+            print_error(str(pype_exception))
+            exit(1)
         return
     elif aliases:
         PYPE_CORE.print_aliases()
@@ -71,11 +136,18 @@ def main(
     elif alias_unregister:
         PYPE_CORE.alias_unregister(alias_unregister)
         return
+    elif ctx.invoked_subcommand is None and profile_startup:
+        return
     elif ctx.invoked_subcommand is None:
         print_error('No pype selected.')
         print_context_help(ctx, level=1)
 
 
+def _get_core(ctx: click.Context) -> PypeCore:
+    # Shell completion passes a core holding freshly registered plugins
+    return ctx.find_object(PypeCore) or PYPE_CORE
+
+
 def _bind_plugin(
     plugin_name: str,
     plugin: Plugin
@@ -88,32 +160,24 @@ def _bind_plugin(
                 self,
                 invoke_without_command=True,
                 **attrs)
+            self.plugin = plugin
 
         def list_commands(self, ctx: Any) -> List:
-            Benchmark.print_info(f'Loading pypes from plugin {plugin_name}')
-            rv = []
-            for filename in listdir(plugin.abspath):
-                if filename.endswith('.py') and '__' not in filename:
-                    rv.append(fname_to_name(filename))
-            rv.sort()
-            return rv
+            # Pypes as found when scanning the plugin, see Plugin
+            return sorted(plugin.command_names)
 
         def get_command(self, ctx: click.Context, name: str) -> Any:
             name = sub('-', '_', name)
             full_name = plugin.name + '.' + name
             try:
-                with Benchmark(key=full_name):
-                    syspath.append(path.dirname(plugin.abspath))
+                with span('PypeCLI.get_command', pype=full_name):
+                    count('pypes imported')
                     mod = __import__(full_name, {}, {}, ['main'])
                     return mod.main
             except ImportError as import_error:
                 print_error(str(import_error))
                 exit(1)
 
-        @staticmethod
-        def get_pype_command_names(plugin: Plugin) -> List[str]:
-            return [sub('_', '-', pype.name) for pype in plugin.pypes]
-
     @click.option(
         '--create-pype', '-c', metavar='PYPE',
         help='Create new pype with given name.'
@@ -121,12 +185,12 @@ def _bind_plugin(
     @click.option(
         '--open-pype', '-o', metavar='PYPE',
         help='Open pype with given name in default editor.',
-        type=Choice(PypeCLI.get_pype_command_names(plugin))
+        type=Choice(plugin.command_names)
     )
     @click.option(
         '--delete-pype', '-d', metavar='PYPE',
         help='Delete pype with given name.',
-        type=Choice(PypeCLI.get_pype_command_names(plugin))
+        type=Choice(plugin.command_names)
     )
     @click.option(
         '--minimal', '-m', is_flag=True,
@@ -186,6 +250,15 @@ def _bind_plugin(
     return _plugin_bind_plugin_function
 
 
+def _run_server(ctx: Any) -> None:
+    from pype.server import PypeServer
+    try:
+        PypeServer(PYPE_CORE, ctx.command).serve_forever()
+    except PypeException as pype_exception:
+        print_error(str(pype_exception))
+        exit(1)
+
+
 def _process_alias_configuration(
         ctx: Any,
         list_pypes: bool,
@@ -208,12 +281,25 @@ def _process_alias_configuration(
     return True
 
 
+def _process_listing_options(
+        list_pypes: bool,
+        list_filter: str,
+        regex: bool,
+        list_json: bool,
+        list_tsv: bool
+) -> bool:
+    if (list_filter or regex or list_json or list_tsv) and not list_pypes:
+        print_error('Options --filter, --regex, --json and --tsv can only '
+                    + 'be used with -l option.')
+        return False
+    if regex and not list_filter:
+        print_error('Option --regex requires --filter.')
+        return False
+    if list_json and list_tsv:
+        print_error('Options --json and --tsv cannot be combined.')
+        return False
+    return True
+
+
 init(autoreset=True)  # Initialize colorama
-try:
-    [
-        _bind_plugin(plugin.name, plugin)
-        for plugin in PYPE_CORE.get_plugins()
-    ]
-except PypeException as pype_exception:
-    print_error(str(pype_exception))
-    exit(1)
+PYPE_CORE.refresh_shell_completion(main)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Precompiled bundles of plugins for fast loading from slow filesystems.
+
+A bundle is a zip archive holding the bytecode of all Python files of a
+plugin along with a manifest of the plugin's and pypes' docstrings. It is
+stored in the configuration folder and imported via zipimport. Since the
+bytecode is not checked against its source, the manifest records the
+modification time and size of every source file and folder, so that a
+bundle is only used as long as the plugin's sources are unchanged.
+"""
+
+from importlib.util import MAGIC_NUMBER
+from json import dumps, loads
+from os import makedirs, scandir, stat
+from os.path import basename, dirname, isdir, isfile, join, relpath
+from typing import Dict, List, Optional
+
+from pype.exceptions import PypeException
+from pype.type_pype import get_module_docstring, is_pype_filename
+from pype.util.iotools import atomic_write
+
+BUNDLE_FOLDER = 'bundles'
+BUNDLE_MANIFEST = 'pype-bundle.json'
+BUNDLE_VERSION = 1
+
+
+def get_bundle_path(config_dir: str, plugin_name: str) -> str:
+    """Get path to the bundle of a plugin inside the configuration folder."""
+    return join(config_dir, BUNDLE_FOLDER, plugin_name + '.pyz')
+
+
+def build_bundle(plugin_abspath: str, bundle_path: str) -> dict:
+    """Compile the plugin at the given path into a bundle.
+
+    Returns the manifest stored in the bundle.
+    """
+    import py_compile  # Only required for building
+    from tempfile import TemporaryDirectory
+    from zipfile import ZIP_STORED, ZipFile
+    if not isdir(plugin_abspath):
+        raise PypeException(f'No plugin found at {plugin_abspath}')
+    plugin_name = basename(plugin_abspath)
+    sources: Dict[str, List[Optional[int]]] = {}
+    python_files: List[str] = []
+    __scan_sources(plugin_abspath, plugin_abspath, sources, python_files)
+    pypes = {
+        filename: get_module_docstring(join(plugin_abspath, filename))
+        for filename in sorted(python_files)
+        if '/' not in filename and is_pype_filename(filename)
+    }
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'magic': MAGIC_NUMBER.hex(),
+        'plugin': plugin_name,
+        'doc': get_module_docstring(join(plugin_abspath, '__init__.py')),
+        'pypes': pypes,
+        'sources': sources
+    }
+    makedirs(dirname(bundle_path), exist_ok=True)
+    with atomic_write(bundle_path) as bundle_handle, TemporaryDirectory(
+    ) as tmp_dir, ZipFile(bundle_handle, 'w', ZIP_STORED) as bundle:
+        for filename in python_files:
+            source_file = join(plugin_abspath, filename)
+            compiled_file = join(tmp_dir, 'module.pyc')
+            try:
+                py_compile.compile(
+                    source_file, cfile=compiled_file, dfile=source_file,
+                    doraise=True, invalidation_mode=(
+                        py_compile.PycInvalidationMode.UNCHECKED_HASH))
+            except py_compile.PyCompileError as ex:
+                raise PypeException(f'Could not compile {ex.file}')
+            bundle.write(compiled_file, f'{plugin_name}/{filename}c')
+        bundle.writestr(BUNDLE_MANIFEST, dumps(manifest))
+    return manifest
+
+
+def load_bundle_manifest(
+    plugin_abspath: str,
+    bundle_path: str
+) -> Optional[dict]:
+    """Load the manifest of a bundle if it matches the plugin's sources.
+
+    Returns None if there is no usable bundle.
+    """
+    if not isfile(bundle_path):
+        return None
+    from zipfile import BadZipFile, ZipFile  # Only required for bundles
+    try:
+        with ZipFile(bundle_path) as bundle:
+            manifest = loads(bundle.read(BUNDLE_MANIFEST).decode('utf-8'))
+    except (OSError, KeyError, BadZipFile, ValueError):
+        return None
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get('version', None) != BUNDLE_VERSION
+        or manifest.get('magic', None) != MAGIC_NUMBER.hex()
+        or manifest.get('plugin', None) != basename(plugin_abspath)
+    ):
+        return None
+    for source, (mtime, size) in manifest['sources'].items():
+        try:
+            source_stat = stat(join(plugin_abspath, source))
+        except OSError:
+            return None
+        if source_stat.st_mtime_ns != mtime or (
+            size is not None and source_stat.st_size != size
+        ):
+            return None
+    return manifest
+
+
+def __scan_sources(
+    plugin_abspath: str,
+    folder: str,
+    sources: Dict[str, List[Optional[int]]],
+    python_files: List[str]
+) -> None:
+    folder_stat = stat(folder)
+    # Folders are recorded without size to detect added and removed files
+    sources[relpath(folder, plugin_abspath)] = [
+        folder_stat.st_mtime_ns, None]
+    with scandir(folder) as dir_entries:
+        for dir_entry in sorted(dir_entries, key=lambda entry: entry.name):
+            if dir_entry.name.startswith('.') or (
+                dir_entry.name == '__pycache__'
+            ):
+                continue
+            if dir_entry.is_dir():
+                __scan_sources(
+                    plugin_abspath, dir_entry.path, sources, python_files)
+            elif dir_entry.name.endswith('.py'):
+                entry_stat = dir_entry.stat()
+                filename = relpath(dir_entry.path, plugin_abspath)
+                sources[filename] = [
+                    entry_stat.st_mtime_ns, entry_stat.st_size]
+                python_files.append(filename)
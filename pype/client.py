@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Thin client forwarding a pype call to a resident pype server.
+
+Only the standard library is used here so that the client starts fast. If no
+server is listening, the call is executed in-process instead.
+"""
+
+import signal
+import socket
+import sys
+from array import array
+from json import dumps
+from os import environ, getcwd, kill, path
+from struct import pack
+from typing import Any, Optional
+
+from pype.constants import ENV_CONFIG_FOLDER, SERVER_SOCKET_FILENAME
+
+FORWARDED_SIGNALS = [signal.SIGINT, signal.SIGTERM, signal.SIGHUP]
+
+
+def main() -> None:
+    """Client's main entry point."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(get_server_socket_path())
+    except OSError:
+        client.close()
+        # No server running, so fall back to a regular in-process call
+        from pype.__main__ import main as pype_main
+        pype_main()
+        return
+    with client:
+        exit(forward_call(client))
+
+
+def get_server_socket_path() -> str:
+    """Get path to the server socket inside the configuration folder."""
+    config_folder = environ.get(
+        ENV_CONFIG_FOLDER, path.expanduser('~/.pype-cli'))
+    return path.join(path.abspath(config_folder), SERVER_SOCKET_FILENAME)
+
+
+def forward_call(client: socket.socket) -> int:
+    """Send argv, env, cwd and stdio to the server and wait for exit code."""
+    payload = dumps({
+        'argv': sys.argv,
+        'env': dict(environ),
+        'cwd': getcwd()
+    }).encode('utf-8')
+    # Transfer file descriptors of stdin, stdout and stderr along the header
+    client.sendmsg(
+        [pack('!I', len(payload))],
+        [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array('i', [0, 1, 2]))]
+    )
+    client.sendall(payload)
+    exit_code = 1
+    for line in client.makefile('rb'):
+        key, value = line.decode('utf-8').split(' ', 1)
+        if key == 'PID':
+            __forward_signals(int(value))
+        elif key == 'EXIT':
+            exit_code = int(value)
+    return exit_code
+
+
+def __forward_signals(pid: int) -> None:
+    def __handler(signum: int, frame: Optional[Any]) -> None:
+        try:
+            kill(pid, signum)
+        except ProcessLookupError:
+            pass
+    for signum in FORWARDED_SIGNALS:
+        signal.signal(signum, __handler)
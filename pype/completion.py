@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Static shell completion scripts."""
+
+from re import sub
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from pype.util.cli import print_warning
+
+# Maximum depth of nested commands below the root command
+MAX_DEPTH = 4
+
+PypeNodeCallback = Callable[[Any, Any, dict], None]
+
+
+def build_completion_tree(
+    command: click.Command,
+    on_pype_node: Optional[PypeNodeCallback] = None,
+    obj: Any = None,
+    cached_only: bool = False
+) -> dict:
+    """Collect the command, option and choice tree of a click command.
+
+    Multi commands carrying a ``plugin`` attribute are treated as pype
+    plugins. Their pypes are imported and ``on_pype_node`` is called with
+    plugin, pype and the new node so that it can be cached. If
+    ``cached_only`` is set, no pypes are imported. Instead, completion
+    nodes cached in the manifest are reused and options of other pypes
+    remain empty. ``obj`` is passed to the commands as context object.
+    """
+    ctx = click.Context(
+        command, info_name=command.name, obj=obj, **command.context_settings)
+    return __build_node(command, ctx, on_pype_node, cached_only, 0)
+
+
+def render_completion_script(
+    shell_command: str,
+    tree: dict,
+    shell: str
+) -> str:
+    """Render a static bash or zsh completion script for the given tree."""
+    function_name = '_' + sub(r'[^A-Za-z0-9_]', '_', shell_command) + '_cli'
+    nodes: List = []
+    __flatten_tree(tree, '', nodes)
+    value_patterns = []
+    choice_cases = []
+    path_cases = []
+    for cmd_path, node in nodes:
+        value_patterns.extend([
+            __quote(f'{cmd_path}:{opt}') for opt in node['value_options']
+        ])
+        for opts, choices in node['choices']:
+            pattern = '|'.join([__quote(f'{cmd_path}:{opt}') for opt in opts])
+            choice_cases.append(
+                f'            {pattern}) {__compgen(choices)} ;;\n')
+        words = sorted(node['commands'].keys()) + node['options']
+        path_cases.append(
+            f'        {__quote(cmd_path)}) {__compgen(words)} ;;\n')
+    value_case = (
+        f'                    {"|".join(value_patterns)}) skip=1 ;;\n'
+        if value_patterns else ''
+    )
+    zsh_init = ''
+    if shell == 'zsh':
+        zsh_init = """(( $+functions[compdef] )) || {
+    autoload -U +X compinit && compinit
+}
+autoload -U +X bashcompinit && bashcompinit
+"""
+    return f"""# PYPE-CLI COMPLETION-FILE: {shell}
+# Generated by pype-cli. Changes will be overwritten.
+{zsh_init}{function_name}() {{
+    local cur prev word cmd_path="" skip=0 i
+    cur="${{COMP_WORDS[COMP_CWORD]}}"
+    prev="${{COMP_WORDS[COMP_CWORD-1]}}"
+    for (( i=1; i<COMP_CWORD; i++ )); do
+        word="${{COMP_WORDS[i]}}"
+        if [ $skip -eq 1 ]; then
+            skip=0
+            continue
+        fi
+        case "$word" in
+            -*=*) continue ;;
+            -*)
+                case "$cmd_path:$word" in
+{value_case}                esac
+                continue ;;
+        esac
+        cmd_path="${{cmd_path:+$cmd_path }}$word"
+    done
+    if [ $skip -eq 1 ]; then
+        case "$cmd_path:$prev" in
+{''.join(choice_cases)}        esac
+        return 0
+    fi
+    case "$cmd_path" in
+{''.join(path_cases)}    esac
+}}
+complete -o default -F {function_name} {shell_command}
+"""
+
+
+def __build_node(
+    command: click.Command,
+    ctx: click.Context,
+    on_pype_node: Optional[PypeNodeCallback],
+    cached_only: bool,
+    depth: int
+) -> dict:
+    node = __create_node()
+    for param in command.get_params(ctx):
+        if not isinstance(param, click.Option) or param.hidden:
+            continue
+        # Sorted since click may collect help option names from a set
+        opts = sorted(param.opts + param.secondary_opts)
+        node['options'].extend(opts)
+        if param.is_flag or param.count:
+            continue
+        node['value_options'].extend(opts)
+        if isinstance(param.type, click.Choice):
+            node['choices'].append((opts, list(param.type.choices)))
+    if not isinstance(command, click.MultiCommand) or depth >= MAX_DEPTH:
+        return node
+    plugin = getattr(command, 'plugin', None)
+    for name in command.list_commands(ctx):
+        pype = plugin.get_pype(sub('-', '_', name)) if plugin else None
+        if pype and cached_only:
+            node['commands'][name] = (
+                pype.completion if pype.completion is not None
+                else __create_node())
+            continue
+        try:
+            sub_command = command.get_command(ctx, name)
+        except (Exception, SystemExit):  # noqa: B902
+            print_warning(f'Could not load "{name}" for shell completion.')
+            continue
+        if not sub_command:
+            continue
+        sub_ctx = click.Context(
+            sub_command, info_name=name, parent=ctx,
+            **sub_command.context_settings)
+        sub_node = __build_node(
+            sub_command, sub_ctx, on_pype_node, cached_only, depth + 1)
+        node['commands'][name] = sub_node
+        if pype:
+            pype.completion = sub_node
+            if on_pype_node:
+                on_pype_node(plugin, pype, sub_node)
+    return node
+
+
+def __create_node() -> Dict[str, Any]:
+    return {
+        'options': [],
+        'value_options': [],
+        'choices': [],
+        'commands': {}
+    }
+
+
+def __flatten_tree(node: dict, cmd_path: str, nodes: List) -> None:
+    nodes.append((cmd_path, node))
+    for name, sub_node in sorted(node['commands'].items()):
+        __flatten_tree(
+            sub_node, f'{cmd_path} {name}' if cmd_path else name, nodes)
+
+
+def __compgen(words: List[str]) -> str:
+    word_list = ' '.join(words)
+    return f'COMPREPLY=( $(compgen -W {__quote(word_list)} -- "$cur") )'
+
+
+def __quote(value: str) -> str:
+    escaped = sub(r'(["$`\\])', r'\\\1', value)
+    return f'"{escaped}"'
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Register aliases from a JSON or YAML file."""
+
+from typing import Any, List
+
+import click
+
+from pype.config_model import ConfigurationAlias
+from pype.core import PypeCore, validate_alias
+from pype.exceptions import PypeException
+from pype.util.cli import fname_to_name, print_error
+from pype.util.iotools import load_structured_file
+
+
+@click.command(name=fname_to_name(__file__), help=__doc__)
+@click.argument('file', metavar='FILE', nargs=1,
+                type=click.Path(exists=True, dir_okay=False))
+def main(file: str) -> None:
+    """Script's main entry point.
+
+    FILE holds a list of objects with an "alias" and a "command" each.
+    """
+    try:
+        aliases = __parse_aliases(load_structured_file(file))
+    except PypeException as ex:
+        print_error(str(ex))
+        exit(1)
+    core = PypeCore()
+    try:
+        core.alias_import(aliases)
+    except PypeException as ex:
+        print_error(str(ex))
+        exit(1)
+
+
+def __parse_aliases(entries: Any) -> List[ConfigurationAlias]:
+    if not isinstance(entries, list):
+        raise PypeException('Expected a list of aliases.')
+    aliases: List[ConfigurationAlias] = []
+    for index, entry in enumerate(entries):
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get('alias', None), str)
+            or not isinstance(entry.get('command', None), str)
+        ):
+            raise PypeException(
+                f'Entry {index} needs an "alias" and a "command" string.')
+        if entry['alias'] in [alias.alias for alias in aliases]:
+            raise PypeException(f'Alias {entry["alias"]} defined twice.')
+        alias = ConfigurationAlias(entry['alias'], entry['command'])
+        validate_alias(alias)
+        aliases.append(alias)
+    return aliases
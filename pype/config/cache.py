@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Inspect and purge cached results."""
+
+from datetime import datetime
+from typing import List, Optional
+
+import click
+from tabulate import tabulate
+
+from pype.util.cache import get_cache, get_cache_names
+from pype.util.cli import fname_to_name, print_success, print_warning
+
+# Maximum length of keys printed in the listing
+MAX_KEY_LENGTH = 60
+
+
+@click.group(name=fname_to_name(__file__), help=__doc__)
+def main() -> None:  # noqa: D103
+    pass
+
+
+@main.command(name='list', help='List cache entries')
+@click.argument('name', metavar='CACHE', nargs=1, required=False)
+def list_entries(name: Optional[str]) -> None:  # noqa: D103
+    rows = []
+    for cache_name in __select(name):
+        for entry in get_cache(cache_name).entries():
+            key = entry['key']
+            if len(key) > MAX_KEY_LENGTH:
+                key = key[:MAX_KEY_LENGTH - 3] + '...'
+            rows.append([
+                cache_name, key, entry['size'],
+                __format_time(entry['created']),
+                __format_time(entry['used']),
+                'expired' if entry['expired'] else __format_time(
+                    entry['expires'])
+            ])
+    if not rows:
+        print_warning('No cache entries found.')
+        return
+    print(tabulate(rows, headers=[
+        'CACHE', 'KEY', 'BYTES', 'CREATED', 'USED', 'EXPIRES']))
+
+
+@main.command(help='Remove expired cache entries')
+@click.argument('name', metavar='CACHE', nargs=1, required=False)
+def prune(name: Optional[str]) -> None:  # noqa: D103
+    removed = sum([get_cache(cache_name).prune()
+                   for cache_name in __select(name)])
+    print_success(f'Removed {removed} expired cache entries.')
+
+
+@main.command(help='Remove all cache entries')
+@click.argument('name', metavar='CACHE', nargs=1, required=False)
+def clear(name: Optional[str]) -> None:  # noqa: D103
+    removed = sum([get_cache(cache_name).clear()
+                   for cache_name in __select(name)])
+    print_success(f'Removed {removed} cache entries.')
+
+
+def __select(name: Optional[str]) -> List[str]:
+    return [name] if name else get_cache_names()
+
+
+def __format_time(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return 'never'
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
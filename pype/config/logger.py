@@ -6,7 +6,7 @@ from typing import Generator
 
 import click
 
-from pype.config_handler import PypeConfigHandler, get_supported_log_levels
+from pype.config_handler import get_config_handler, get_supported_log_levels
 from pype.config_model import ConfigurationCoreLogging
 from pype.util.cli import fname_to_name, print_error, print_success
 
@@ -14,7 +14,7 @@ from pype.util.cli import fname_to_name, print_error, print_success
 @contextlib.contextmanager
 def open_configuration() -> Generator[ConfigurationCoreLogging, None, None]:
     """Open configuration file context."""
-    cfg_handler = PypeConfigHandler()
+    cfg_handler = get_config_handler()
     log_cfg = cfg_handler.get_core_config_logging()
     yield log_cfg
     cfg_handler.set_core_config_logging(log_cfg)
@@ -71,5 +71,5 @@ def disable() -> None:  # noqa: D103
 
 @main.command(help='Print current configuration')
 def print_config() -> None:  # noqa: D103
-    log_cfg = PypeConfigHandler().get_core_config_logging()
+    log_cfg = get_config_handler().get_core_config_logging()
     print(log_cfg.asjson())
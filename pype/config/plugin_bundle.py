@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Precompile a registered plugin for fast loading."""
+
+from os import remove
+from typing import List
+
+import click
+
+from pype.bundle import build_bundle, get_bundle_path
+from pype.config_handler import get_config_handler
+from pype.config_model import ConfigurationPlugin
+from pype.exceptions import PypeException
+from pype.type_plugin import Plugin
+from pype.util.cli import (fname_to_name, print_error, print_success,
+                           print_warning)
+
+
+def __resolve_available_plugins() -> List[str]:
+    return [
+        plugin.name
+        for plugin in get_config_handler().get_config().plugins
+    ]
+
+
+@click.command(name=fname_to_name(__file__), help=__doc__)
+@click.option('--name', '-n', help='Plugin name.',
+              type=click.Choice(__resolve_available_plugins()),
+              metavar='NAME', required=True)
+@click.option('--remove', '-r', 'remove_bundle', is_flag=True,
+              help='Remove the bundle to load the plugin from source again.')
+def main(name: str, remove_bundle: bool) -> None:
+    """Script's main entry point.
+
+    The bytecode of the plugin is stored in the configuration folder and
+    used as long as the plugin's sources are unchanged. Run again after
+    changing the plugin to pick up the changes with a bundle.
+    """
+    config_handler = get_config_handler()
+    bundle_path = get_bundle_path(config_handler.get_dir_path(), name)
+    if remove_bundle:
+        try:
+            remove(bundle_path)
+        except FileNotFoundError:
+            print_warning(f'Plugin "{name}" is not bundled. Nothing to do.')
+            return
+        print_success(f'Removed bundle of plugin "{name}".')
+        return
+    config_plugin: ConfigurationPlugin = [
+        plugin for plugin in config_handler.get_config().plugins
+        if plugin.name == name
+    ][0]
+    try:
+        plugin = Plugin(config_plugin, config_handler.get_file_path())
+        if not plugin.active:
+            raise PypeException(
+                f'Plugin "{name}" is not active for current user.')
+        manifest = build_bundle(plugin.abspath, bundle_path)
+    except PypeException as ex:
+        print_error(str(ex))
+        exit(1)
+    print_success(f'Bundled plugin "{name}" with {len(manifest["pypes"])} '
+                  + f'pypes to {bundle_path}.')
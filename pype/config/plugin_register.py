@@ -5,57 +5,124 @@ import getpass
 from os import mkdir
 from os.path import dirname, isdir, isfile, join
 from re import IGNORECASE, sub
+from typing import List
 
 import click
 
-from pype.config_handler import PypeConfigHandler
-from pype.config_model import ConfigurationPlugin
+from pype.config_handler import get_config_handler
+from pype.config_model import Configuration, ConfigurationPlugin
 from pype.constants import NOT_DOCUMENTED_YET
-from pype.core import load_module
+from pype.core import PypeCore, load_module
 from pype.exceptions import PypeException
 from pype.util.cli import fname_to_name, print_error, print_success
-from pype.util.iotools import resolve_path
+from pype.util.iotools import load_structured_file, resolve_path
 
 
 @click.command(name=fname_to_name(__file__), help=__doc__)
-@click.option('--name', '-n', help='Plugin name.',
-              metavar='NAME', required=True)
-@click.option('--path', '-p', help='Host directory.',
-              metavar='PATH', required=True)
+@click.option('--name', '-n', help='Plugin name.', metavar='NAME')
+@click.option('--path', '-p', help='Host directory.', metavar='PATH')
 @click.option('--create', '-c', help='Create on the fly.', is_flag=True)
 @click.option('--user-only', '-u', help='Just for current user.', is_flag=True)
-def main(name: str, path: str, create: bool, user_only: bool) -> None:
+@click.option('--from', 'from_file', metavar='FILE',
+              type=click.Path(exists=True, dir_okay=False),
+              help='Register a JSON or YAML list of plugins.')
+@click.pass_context
+def main(
+    ctx: click.Context,
+    name: str,
+    path: str,
+    create: bool,
+    user_only: bool,
+    from_file: str
+) -> None:
     """Script's main entry point."""
-    if create:
-        __create_on_the_fly(name, path)
+    users = [getpass.getuser()] if user_only else []
+    if from_file:
+        if name or path or create:
+            print_error('Option --from cannot be combined with '
+                        + '--name, --path or --create.')
+            exit(1)
+        try:
+            plugins = __load_plugins(from_file, users)
+        except PypeException as ex:
+            print_error(str(ex))
+            exit(1)
+    else:
+        for param in ctx.command.params:
+            if param.name in ['name', 'path'] and not ctx.params[param.name]:
+                raise click.MissingParameter(ctx=ctx, param=param)
+        if create:
+            __create_on_the_fly(name, path)
+        plugins = [ConfigurationPlugin(name, path, users)]
+    # Append all plugins to global configuration with a single write
+    config_handler = get_config_handler()
+    try:
+        with config_handler.transaction() as config:
+            for plugin in plugins:
+                __register(config, config_handler.get_file_path(), plugin)
+    except PypeException as ex:
+        print_error(str(ex))
+        exit(1)
+    for plugin in plugins:
+        print_success(f'Plugin "{plugin.name}" successfully registered.')
+    # Add new plugins to shell completion
+    PypeCore().rebuild_shell_completion()
+
+
+def __register(
+    config: Configuration,
+    config_file: str,
+    plugin: ConfigurationPlugin
+) -> None:
     # Try to load the module to verify the configuration
     module = None
     try:
-        module = load_module(name, path)
+        module = load_module(plugin.name, plugin.path)
     except PypeException as ex:
-        print_error(f'Could not find a python module "{name}" at {path}: {ex}')
+        print_error(f'Could not find a python module "{plugin.name}" '
+                    + f'at {plugin.path}: {ex}')
         exit(1)
     # Check __init__.py
-    init_file = join(path, name, '__init__.py')
+    init_file = join(plugin.path, plugin.name, '__init__.py')
     if not isfile(init_file):
         print_error(f'Could not find __init__.py at {init_file}. '
                     + 'This plugin path seems invalid.')
         exit(1)
-    # Append plugin to global configuration
-    config_handler = PypeConfigHandler()
-    config = config_handler.get_config()
-    if any([plugin for plugin in config.plugins
-            if plugin.name == name]):
-        print_error(f'There is already a plugin named "{name}".')
+    if any([existing for existing in config.plugins
+            if existing.name == plugin.name]):
+        print_error(f'There is already a plugin named "{plugin.name}".')
         exit(1)
     path = __replace_parentfolder_if_relative_to_config(
-        path, config_handler.get_file_path())
+        plugin.path, config_file)
     path = __replace_homefolder_with_tilde(path)
-    users = [getpass.getuser()] if user_only else []
-    config.plugins.append(ConfigurationPlugin(module.__name__, path, users))
-    config_handler.set_config(config)
+    config.plugins.append(
+        ConfigurationPlugin(module.__name__, path, plugin.users))
+
 
-    print_success(f'Plugin "{name}" successfully registered.')
+def __load_plugins(
+    from_file: str,
+    users: List[str]
+) -> List[ConfigurationPlugin]:
+    entries = load_structured_file(from_file)
+    if not isinstance(entries, list):
+        raise PypeException('Expected a list of plugins.')
+    plugins = []
+    for index, entry in enumerate(entries):
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get('name', None), str)
+            or not isinstance(entry.get('path', None), str)
+        ):
+            raise PypeException(
+                f'Entry {index} needs a "name" and a "path" string.')
+        if not isinstance(entry.get('users', []), list) or not all([
+            isinstance(user, str) for user in entry.get('users', [])
+        ]):
+            raise PypeException(
+                f'Entry {index} needs a list of strings as "users".')
+        plugins.append(ConfigurationPlugin(
+            entry['name'], entry['path'], entry.get('users', users)))
+    return plugins
 
 
 def __replace_homefolder_with_tilde(plugin_path: str) -> str:
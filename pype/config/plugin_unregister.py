@@ -6,14 +6,15 @@ from typing import List
 
 import click
 
-from pype.config_handler import PypeConfigHandler
+from pype.config_handler import get_config_handler
+from pype.core import PypeCore
 from pype.util.cli import fname_to_name, print_success, print_warning
 
 
 def __resolve_available_plugins() -> List[str]:
     return [
         plugin.name
-        for plugin in PypeConfigHandler().get_config().plugins
+        for plugin in get_config_handler().get_config().plugins
     ]
 
 
@@ -24,15 +25,15 @@ def __resolve_available_plugins() -> List[str]:
 def main(name: str) -> None:
     """Script's main entry point."""
     # Try to load the module to verify the configuration
-    config_handler = PypeConfigHandler()
-    config = config_handler.get_config()
-    new_plugins = [
-        plugin for plugin in config.plugins
-        if plugin.name != name
-    ]
-    if config.plugins == new_plugins:
-        print_warning(f'Plugin "{name}" not found. Nothing to do.')
-        return
-    config.plugins = new_plugins
-    config_handler.set_config(config)
+    with get_config_handler().transaction() as config:
+        new_plugins = [
+            plugin for plugin in config.plugins
+            if plugin.name != name
+        ]
+        if config.plugins == new_plugins:
+            print_warning(f'Plugin "{name}" not found. Nothing to do.')
+            return
+        config.plugins = new_plugins
     print_success(f'Plugin "{name}" successfully unregistered.')
+    # Remove plugin from shell completion
+    PypeCore().rebuild_shell_completion()
@@ -10,7 +10,7 @@ import click
 import pkg_resources
 from tabulate import tabulate
 
-from pype.config_handler import PypeConfigHandler
+from pype.config_handler import get_config_handler
 from pype.constants import ENV_CONFIG_FOLDER
 from pype.core import get_pype_basepath, in_virtualenv
 from pype.util.cli import fname_to_name
@@ -41,7 +41,7 @@ def main() -> None:
         )
     # Effective configuration
     infos.append(
-        ['EFFECTIVE CONFIG FILE', PypeConfigHandler().filepath]
+        ['EFFECTIVE CONFIG FILE', get_config_handler().filepath]
     )
     infos.append(['IN VIRTUAL ENV', in_virtualenv()])
     # Version info
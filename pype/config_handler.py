@@ -1,21 +1,24 @@
 # -*- coding: utf-8 -*-
 """Pype configuration handler."""
 
-from json import JSONDecodeError, dump, load
-from os import environ, mkdir, path
+import contextlib
+import fcntl
+import pickle
+from functools import lru_cache
+from hashlib import sha256
+from json import JSONDecodeError, dump, dumps, load, loads
+from os import environ, mkdir, path, stat
 from sys import stderr
-from typing import List
-
-from colorama import Fore, Style
-from dacite import from_dict
-from jsonschema import ValidationError, validate
+from threading import RLock
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from pype import config_model
 from pype.config_model import (ConfigResolverSource, Configuration,
                                ConfigurationCore, ConfigurationCoreLogging)
 from pype.constants import ENV_CONFIG_FOLDER
 from pype.exceptions import PypeException
-from pype.util.iotools import resolve_path
+from pype.util.iotools import atomic_write, resolve_path
+from pype.util.profiler import count, span
 
 DEFAULT_CONFIG = config_model.Configuration(
     plugins=[],
@@ -27,7 +30,33 @@ DEFAULT_CONFIG_DICT: dict = DEFAULT_CONFIG.asdict()
 
 
 CONFIG_SCHEMA_PATH = path.join(path.dirname(__file__), 'config-schema.json')
-CONFIG_SCHEMA = load(open(CONFIG_SCHEMA_PATH))
+
+# Validated configurations by file path, see PypeConfigHandler.__load_config
+# Changes of schema and model are detected via get_config_schema_digest, so
+# the version only needs to be bumped if the format of entries changes.
+CONFIG_CACHE_VERSION = 2
+_VALIDATED_CONFIG_CACHE: Dict[str, dict] = {}
+
+# Shared handlers by resolution input, see get_config_handler
+_CONFIG_HANDLERS: Dict[Tuple[str, str, str], 'PypeConfigHandler'] = {}
+_CONFIG_HANDLERS_LOCK = RLock()
+
+
+@lru_cache(maxsize=None)
+def get_config_schema() -> dict:
+    """Load the configuration schema on first use."""
+    with open(CONFIG_SCHEMA_PATH) as schema_file:
+        return load(schema_file)
+
+
+@lru_cache(maxsize=None)
+def get_config_schema_digest() -> str:
+    """Hash schema and model a cached configuration was validated with."""
+    digest = sha256()
+    for filepath in [CONFIG_SCHEMA_PATH, config_model.__file__]:
+        with open(filepath, 'rb') as source_file:
+            digest.update(source_file.read())
+    return digest.hexdigest()
 
 
 class PypeConfigHandler:
@@ -39,6 +68,10 @@ class PypeConfigHandler:
         default_config_filename: str = 'config.json'
     ) -> None:
         """Construct a default configuaration handler."""
+        self.__lock = RLock()
+        self.__transaction_depth = 0
+        # Increased whenever the configuration is set or reloaded
+        self.generation = 0
         default_config_file = path.join(
             default_config_folder,
             default_config_filename
@@ -71,30 +104,73 @@ class PypeConfigHandler:
             self.config_source = (
                 ConfigResolverSource.FROM_SCRATCH_TO_DEFAULT_PATH
             )
-        try:
-            self.config_json = load(open(self.filepath, 'r'))
-        except JSONDecodeError:
-            raise PypeException('Provided configuration file not valid JSON.')
-        except FileNotFoundError:
-            # Priorty 4: File name provided but file does not exist
-            dump(DEFAULT_CONFIG_DICT, open(self.filepath, 'w+'), indent=4)
-            self.config_json = load(open(self.filepath, 'r'))
+        if not self.__reload():
             self.config_source = (
                 ConfigResolverSource.FROM_SCRATCH_TO_PROVIDED_PATH
             )
-        self.validate_config(self.config_json)
-        self.config = from_dict(Configuration, self.config_json)
+
+    def reload(self) -> None:
+        """Read configuration file again to pick up external changes."""
+        with self.__lock:
+            self.__reload()
 
     def get_config(self) -> Configuration:
         """Get pype configuration."""
         return self.config
 
     def set_config(self, config: Configuration) -> None:
-        """Validate, set and persist configuration."""
-        self.validate_config(config.asdict())
-        self.config_json = config.asdict()
-        # always update config file as well
-        dump(self.config_json, open(self.filepath, 'w+'), indent=4)
+        """Validate, set and persist configuration.
+
+        Within a transaction the configuration is persisted once the
+        outermost transaction completes.
+        """
+        with self.__lock:
+            try:
+                self.validate_config(config.asdict())
+            except PypeException:
+                if not self.__transaction_depth:
+                    self.__reload()  # Discard modifications of shared config
+                raise
+            self.config_json = config.asdict()
+            self.config = config
+            self.generation += 1
+            if self.__transaction_depth:
+                return
+            with self.__lock_file():
+                self.__write()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Generator[Configuration, None, None]:
+        """Batch configuration changes into a single locked write.
+
+        The configuration file is locked and re-read on entering, so changes
+        made by concurrent pype processes are not lost. Changes are written
+        atomically on leaving the outermost transaction and discarded if an
+        exception is raised. Nested transactions join the outer one.
+        """
+        with self.__lock:
+            if self.__transaction_depth:
+                self.__transaction_depth += 1
+                try:
+                    yield self.config
+                finally:
+                    self.__transaction_depth -= 1
+                return
+            with self.__lock_file():
+                self.__reload()
+                original_json = self.config_json
+                self.__transaction_depth = 1
+                try:
+                    yield self.config
+                    if self.config.asdict() != original_json:
+                        self.set_config(self.config)
+                except BaseException:  # noqa: B902
+                    self.__reload()
+                    raise
+                finally:
+                    self.__transaction_depth = 0
+                if self.config_json != original_json:
+                    self.__write()
 
     def get_file_path(self) -> str:
         """Get absolute filepath to configuration JSON file."""
@@ -122,17 +198,137 @@ class PypeConfigHandler:
         logging_config: ConfigurationCoreLogging
     ) -> None:
         """Set logging configuration."""
-        config = self.get_config()
-        if not config.core_config:
-            config.core_config = ConfigurationCore()
-        config.core_config.logging = logging_config
-        self.set_config(config)  # Setter takes care of validation
+        with self.__lock:
+            config = self.get_config()
+            if not config.core_config:
+                config.core_config = ConfigurationCore()
+            config.core_config.logging = logging_config
+            self.set_config(config)  # Setter takes care of validation
+
+    @contextlib.contextmanager
+    def __lock_file(self) -> Generator[None, None, None]:
+        """Hold an exclusive lock shared by all pype processes."""
+        with open(self.filepath + '.lock', 'a') as lock_handle:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def __write(self) -> None:
+        """Atomically replace the configuration file."""
+        raw_config = dumps(self.config_json, indent=4).encode('utf-8')
+        with atomic_write(self.filepath, durable=True) as file_handle:
+            file_handle.write(raw_config)
+        self.__store_cache_entry(
+            self.filepath, raw_config, self.config_json, self.config)
+
+    def __reload(self) -> bool:
+        """Load configuration file or create it if it does not exist.
+
+        Returns False if the file had to be created.
+        """
+        with span('PypeConfigHandler.__reload', config=self.filepath):
+            self.generation += 1
+            try:
+                self.config_json, self.config = self.__load_config(
+                    self.filepath)
+            except JSONDecodeError:
+                raise PypeException(
+                    'Provided configuration file not valid JSON.')
+            except FileNotFoundError:
+                # Priorty 4: File name provided but file does not exist
+                dump(DEFAULT_CONFIG_DICT, open(self.filepath, 'w+'), indent=4)
+                self.config_json, self.config = self.__load_config(
+                    self.filepath)
+                return False
+            return True
+
+    def __load_config(self, filepath: str) -> Tuple[dict, Configuration]:
+        """Load configuration, validating it only if it has changed.
+
+        Validated configurations are cached in-process and in a pickle file
+        next to the configuration file. A cache entry is valid if it was
+        created with the current schema and model and if modification time,
+        size and inode match or, as a fallback, if the content hash matches.
+        """
+        file_stat = stat(filepath)
+        stat_key = [file_stat.st_mtime_ns, file_stat.st_size,
+                    file_stat.st_ino]
+        entry = (_VALIDATED_CONFIG_CACHE.get(filepath, None)
+                 or self.__read_cache_file(filepath))
+        if entry and entry['stat'] == stat_key:
+            count('config cache hits')
+            return pickle.loads(entry['config'])
+        count('config reads')
+        with open(filepath, 'rb') as config_file:
+            raw_config = config_file.read()
+        if entry and entry['hash'] == sha256(raw_config).hexdigest():
+            count('config cache hits')
+            config_json, config = pickle.loads(entry['config'])
+        else:
+            config_json = loads(raw_config.decode('utf-8'))
+            count('config validations')
+            self.validate_config(config_json)
+            from dacite import from_dict
+            config = from_dict(Configuration, config_json)
+        self.__store_cache_entry(filepath, raw_config, config_json, config)
+        return config_json, config
+
+    @staticmethod
+    def __store_cache_entry(
+        filepath: str,
+        raw_config: bytes,
+        config_json: dict,
+        config: Configuration
+    ) -> None:
+        file_stat = stat(filepath)
+        entry = {
+            'version': CONFIG_CACHE_VERSION,
+            'schema': get_config_schema_digest(),
+            'stat': [file_stat.st_mtime_ns, file_stat.st_size,
+                     file_stat.st_ino],
+            'hash': sha256(raw_config).hexdigest(),
+            'config': pickle.dumps((config_json, config))
+        }
+        _VALIDATED_CONFIG_CACHE[filepath] = entry
+        cache_file = PypeConfigHandler.__get_cache_file_path(filepath)
+        try:
+            with atomic_write(cache_file) as file_handle:
+                pickle.dump(entry, file_handle)
+        except OSError:
+            pass  # The cache is optional, so ignore read-only folders
+
+    @staticmethod
+    def __read_cache_file(filepath: str) -> Optional[Dict[str, Any]]:
+        cache_file = PypeConfigHandler.__get_cache_file_path(filepath)
+        try:
+            with open(cache_file, 'rb') as cache_handle:
+                entry = pickle.load(cache_handle)
+        except (OSError, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError):
+            return None
+        if (
+            not isinstance(entry, dict)
+            or entry.get('version', None) != CONFIG_CACHE_VERSION
+            or entry.get('schema', None) != get_config_schema_digest()
+        ):
+            return None
+        _VALIDATED_CONFIG_CACHE[filepath] = entry
+        return entry
+
+    @staticmethod
+    def __get_cache_file_path(filepath: str) -> str:
+        return path.splitext(filepath)[0] + '.cache'
 
     @staticmethod
     def validate_config(config: dict) -> bool:
         """Validate given config file against schema definition."""
+        # Imported on first use as jsonschema is expensive to load
+        from colorama import Fore, Style
+        from jsonschema import ValidationError, validate
         try:
-            validate(instance=config, schema=CONFIG_SCHEMA)
+            validate(instance=config, schema=get_config_schema())
         except ValidationError as err:
             print(Fore.RED + str(err) + Style.RESET_ALL + '\n', file=stderr)
             raise PypeException(
@@ -141,8 +337,34 @@ class PypeConfigHandler:
         return True
 
 
+def get_config_handler(
+    default_config_folder: str = resolve_path('~/.pype-cli'),
+    default_config_filename: str = 'config.json'
+) -> PypeConfigHandler:
+    """Get the configuration handler shared within this process.
+
+    The configuration file is parsed once per resolved location. Use
+    PypeConfigHandler.reload to pick up changes made by other processes.
+    """
+    key = (environ.get(ENV_CONFIG_FOLDER, ''), default_config_folder,
+           default_config_filename)
+    with _CONFIG_HANDLERS_LOCK:
+        handler = _CONFIG_HANDLERS.get(key, None)
+        if not handler:
+            handler = PypeConfigHandler(
+                default_config_folder, default_config_filename)
+            _CONFIG_HANDLERS[key] = handler
+        return handler
+
+
+def invalidate_config_handlers() -> None:
+    """Drop all shared configuration handlers."""
+    with _CONFIG_HANDLERS_LOCK:
+        _CONFIG_HANDLERS.clear()
+
+
 def get_supported_log_levels() -> List[str]:
     """Return supported log levels to be used with pype."""
-    return (sorted(CONFIG_SCHEMA
+    return (sorted(get_config_schema()
                    ['properties']['core_config']['properties']['logging']
                    ['properties']['level']['enum']))
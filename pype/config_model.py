@@ -61,6 +61,8 @@ class ConfigurationCore(BaseDataClass):
     """Core Configuration type."""
 
     logging: Optional[ConfigurationCoreLogging] = None
+    # Number of threads scanning plugins on startup, 1 scans serially
+    scan_workers: int = 1
 
 
 @dataclass
@@ -5,3 +5,5 @@
 ENV_CONFIG_FOLDER = 'PYPE_CONFIG_FOLDER'
 
 NOT_DOCUMENTED_YET = 'Not documented yet.'
+
+SERVER_SOCKET_FILENAME = 'server.sock'
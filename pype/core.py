@@ -3,25 +3,29 @@
 
 import logging
 import sys
-from importlib import import_module
+from importlib import import_module, reload
 from os import environ, path, remove
-from re import sub
+from re import fullmatch, search, sub
 from shutil import copyfile
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-from click import Context
+from click import Command, Context, get_current_context
 from colorama import Fore, Style
-from tabulate import tabulate
 
-from pype.config_handler import PypeConfigHandler
+from pype.completion import build_completion_tree, render_completion_script
+from pype.config_handler import PypeConfigHandler, get_config_handler
 from pype.config_model import (Configuration, ConfigurationAlias,
                                ConfigurationPlugin)
 from pype.constants import ENV_CONFIG_FOLDER
 from pype.exceptions import PypeException
+from pype.listing import write_listing
+from pype.manifest import PluginManifest
+from pype.plugin_finder import register_plugin
 from pype.type_plugin import Plugin
-from pype.util.benchmark import Benchmark
+from pype.type_pype import Pype
 from pype.util.cli import print_error, print_success, print_warning
-from pype.util.iotools import open_with_default, resolve_path
+from pype.util.iotools import open_with_default, resolve_path, write_if_changed
+from pype.util.profiler import span
 
 
 class PypeCore:
@@ -33,8 +37,12 @@ class PypeCore:
 
     def __init__(self) -> None:
         """Public constructor."""
+        with span('PypeCore.__init__'):
+            self.__init_internal()
+
+    def __init_internal(self) -> None:
         self.__set_environment_variables()
-        self.__config = PypeConfigHandler()
+        self.__config = get_config_handler()
         self.__setup_logging(self.__config)
         self.__rc_files = [
             resolve_path('~/.bashrc'),
@@ -46,58 +54,61 @@ class PypeCore:
             self.__rc_files = [
                 resolve_path('./.venv/bin/activate')
             ]
-        Benchmark.print_info('Loading plugin information')
-        self.plugins = [
-            Plugin(plugin, self.__config.get_file_path())
-            for plugin in self.__config.get_config().plugins
-        ]
+        self.__manifest = PluginManifest(self.__config.get_dir_path())
+        self.plugins = self.__scan_plugins(self.__config.get_config())
         # filter plugins not valid for current environment
         self.plugins = [plugin for plugin in self.plugins if plugin.active]
         # append internal plugins
         self.plugins.append(Plugin(
             ConfigurationPlugin('config', '%INTERNAL%'),
-            self.__config.get_file_path())
+            self.__config.get_file_path(), self.__manifest)
         )
-        Benchmark.print_info('Plugins loaded')
+        self.__plugins_by_name: Dict[str, Plugin] = {}
+        for plugin in self.plugins:
+            self.__plugins_by_name.setdefault(plugin.name, plugin)
+        # Aliases by name, rebuilt if the list of aliases changed
+        self.__alias_index: Dict[str, ConfigurationAlias] = {}
+        self.__alias_index_source: Optional[List[ConfigurationAlias]] = None
+        self.__alias_index_generation = -1
+        self.__manifest_changed = self.__manifest.save()
 
     def get_plugins(self) -> List[Plugin]:
         """Get list of configured plugins."""
         return self.plugins
 
+    def get_plugin(self, name: str) -> Optional[Plugin]:
+        """Get configured plugin with the given name."""
+        return self.__plugins_by_name.get(name, None)
+
+    def get_config_file_path(self) -> str:
+        """Get absolute filepath to configuration JSON file."""
+        return self.__config.get_file_path()
+
     def open_config_with_default(self) -> None:
         """Get absolute filepath to configuration JSON file."""
         return open_with_default(self.__config.get_file_path())
 
-    def list_pypes(self) -> None:
-        """Print list of pypes to console."""
-        for plugin in self.plugins:
-            built_in = 'Built-in' if plugin.internal else plugin.abspath
-            print(f'{Style.BRIGHT}{Fore.BLUE}'
-                  f'PLUGIN: {plugin.name.upper()}{Fore.LIGHTBLACK_EX}\n'
-                  f'{plugin.doc}\n@ {built_in}'
-                  )
-            print(f'{Style.BRIGHT}{Fore.BLUE}– PYPES:')
-            for pype in plugin.pypes:
-                pype_name = sub('_', '-', pype.name)
-                print(
-                    f'  {Style.BRIGHT}{Fore.BLUE}{pype_name}'
-                    f'{Style.RESET_ALL} – {pype.doc}'
-                )
-            print()
+    def list_pypes(
+        self,
+        pattern: Optional[str] = None,
+        regex: bool = False,
+        output_format: str = 'text'
+    ) -> None:
+        """Print list of pypes matching the optional pattern to console."""
+        write_listing(self.plugins, pattern, regex, output_format)
 
     def get_aliases(self) -> List[str]:
         """Return available aliases."""
-        aliases = self.__config.get_config().aliases
-        return sorted([alias.alias for alias in aliases])
+        return sorted(self.__get_alias_index(self.__config.get_config()))
 
     def print_aliases(self) -> None:
         """Print list of aliases to console."""
-        aliases = self.__config.get_config().aliases
-        sorted_alias_keys = sorted([alias.alias for alias in aliases])
+        from tabulate import tabulate  # Only required for printing
+        alias_index = self.__get_alias_index(self.__config.get_config())
         alias_table = []
 
-        for alias in sorted_alias_keys:
-            find_alias = self.__find_alias(aliases, alias)
+        for alias in sorted(alias_index):
+            find_alias = alias_index[alias]
             alias_table.append([
                 f'{Style.BRIGHT}{Fore.BLUE}{alias}',
                 Style.RESET_ALL + '=',
@@ -105,37 +116,62 @@ class PypeCore:
             ])
         print(tabulate(alias_table, tablefmt='plain'))
 
-    def install_to_shell(self) -> None:
-        """Install shell features."""
-        # Clean up first
-        self.uninstall_from_shell()
-        print_success('Successfully cleaned up existing configurations')
+    def install_to_shell(
+        self,
+        root_command: Optional[Command] = None
+    ) -> None:
+        """Install shell features.
+
+        Only files whose content changed are rewritten, so rc files are left
+        untouched if they already link to the init-files.
+        """
         aliases = self.__config.get_config().aliases
+        self.__write_completion_files(root_command)
         self.__write_init_file('bsh', aliases)
         self.__write_init_file('zsh', aliases)
         print('Add link to init-file in rc-files if present')
+        init_file = path.join(
+            self.__config.get_dir_path(), self.SHELL_INIT_PREFIX)
+        config_path = resolve_path(self.__config.get_dir_path())
         for file in self.__rc_files:
             if not path.isfile(file):
                 continue
-            print(f' - "{file}"')
-            # Append link to init-file and set config file
-            file_handle = open(file, 'a+')
-            init_file = path.join(
-                self.__config.get_dir_path(), self.SHELL_INIT_PREFIX)
-            init_file = (init_file + 'zsh' if 'zshrc' in file
-                         else init_file + 'bsh')
-            config_path = resolve_path(self.__config.get_dir_path())
-            file_handle.write(
+            # Link to init-file and set config file
+            rc_lines = [
                 f'export {ENV_CONFIG_FOLDER}="{config_path}" '
+                f'{self.SHELL_RC_HINT}\n',
+                f'. {init_file}{"zsh" if "zshrc" in file else "bsh"} '
                 f'{self.SHELL_RC_HINT}\n'
-            )
-            file_handle.write(f'. {init_file} {self.SHELL_RC_HINT}\n')
-            file_handle.close()
+            ]
+            if self.__link_rc_file(file, rc_lines):
+                print(f' - "{file}"')
             if in_virtualenv():
                 print('Running in .venv. Skipping system rc files.')
                 break
         print_success('Successfully written init-files')
 
+    def refresh_shell_completion(self, root_command: Command) -> None:
+        """Update installed completion files if plugins or pypes changed.
+
+        Plugins and pypes are taken from their metadata and options from
+        completion nodes cached in the manifest, so no pypes are imported.
+        Options of new pypes are added by ``rebuild_shell_completion``.
+        """
+        if not self.__manifest_changed or not self.__shell_installed():
+            return
+        self.__write_completion_files(
+            root_command, verbose=False, cached_only=True)
+        self.__manifest_changed = False
+
+    def rebuild_shell_completion(
+        self,
+        root_command: Optional[Command] = None
+    ) -> None:
+        """Regenerate installed completion files importing all pypes."""
+        if not self.__shell_installed():
+            return
+        self.__write_completion_files(root_command, verbose=False)
+
     def uninstall_from_shell(self) -> None:
         """Uninstall shell features."""
         # Remove init files
@@ -185,69 +221,162 @@ class PypeCore:
         if not alias:
             return
         alias_cmd = f'{alias}="{cmd_line.strip()}"'
-        # store to internal config
-        config = self.__config.get_config()
-        if self.__alias_present(config, alias):
-            print_warning('Alias already registered.')
-            return
-        config.aliases.append(ConfigurationAlias(alias, cmd_line))
-        print_success(f'Configured alias: {alias_cmd}')
-        self.__config.set_config(config)
-        # update install script
-        self.install_to_shell()
+        try:
+            validate_alias(ConfigurationAlias(alias, cmd_line))
+        except PypeException as ex:
+            print_error(str(ex))
+            exit(1)
+        # store to internal config and update install script in one go
+        with self.__config.transaction() as config:
+            if self.__alias_present(config, alias):
+                print_warning('Alias already registered.')
+                return
+            config.aliases.append(ConfigurationAlias(alias, cmd_line))
+            print_success(f'Configured alias: {alias_cmd}')
+            self.install_to_shell()
 
     def alias_unregister(self, alias: str) -> None:
         """Unregister the provided alias."""
         if not alias:
             return
-        # store to internal config
-        config = self.__config.get_config()
-        if not config.aliases:
-            print_warning('No aliases registered.')
-            exit(1)
-        if not self.__alias_present(config, alias):
-            print_warning('Alias not registered.')
-            exit(1)
-        for obj in enumerate(config.aliases):
-            if obj[1].alias != alias:
-                continue
-            del config.aliases[obj[0]]
-        self.__config.set_config(config)
-        # update install script
-        print_success(f'Unregistered alias: {alias}')
-        self.install_to_shell()
+        # store to internal config and update install script in one go
+        with self.__config.transaction() as config:
+            if not config.aliases:
+                print_warning('No aliases registered.')
+                exit(1)
+            if not self.__alias_present(config, alias):
+                print_warning('Alias not registered.')
+                exit(1)
+            config.aliases = [
+                obj for obj in config.aliases if obj.alias != alias]
+            print_success(f'Unregistered alias: {alias}')
+            self.install_to_shell()
+
+    def alias_import(self, aliases: List[ConfigurationAlias]) -> None:
+        """Register multiple aliases with a single shell installation."""
+        with self.__config.transaction() as config:
+            new_aliases = []
+            for alias in aliases:
+                if self.__alias_present(config, alias.alias):
+                    print_warning(
+                        f'Alias {alias.alias} already registered. Skipped.')
+                    continue
+                new_aliases.append(alias)
+            if not new_aliases:
+                print_warning('No new aliases to register.')
+                return
+            config.aliases.extend(new_aliases)
+            self.__config.set_config(config)  # Validate before installing
+            for alias in new_aliases:
+                print_success(
+                    f'Configured alias: {alias.alias}="{alias.command}"')
+            self.install_to_shell()
+
+    def __scan_plugins(self, config: Configuration) -> List[Plugin]:
+        workers = config.core_config.scan_workers if config.core_config else 1
+        config_file = self.__config.get_file_path()
+        if workers <= 1 or len(config.plugins) <= 1:
+            return [Plugin(plugin, config_file, self.__manifest)
+                    for plugin in config.plugins]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(config.plugins))
+        ) as executor:
+            # Keeps order and raises the first failure in order of plugins
+            return list(executor.map(
+                lambda plugin: Plugin(plugin, config_file, self.__manifest),
+                config.plugins))
+
+    def __write_completion_files(
+        self,
+        root_command: Optional[Command],
+        verbose: bool = True,
+        cached_only: bool = False
+    ) -> None:
+        if not root_command:
+            root_command = self.__get_root_command()
+        if not cached_only:
+            # Imported pypes may hold choices of an outdated configuration
+            for plugin in self.plugins:
+                for pype in plugin.pypes:
+                    module = sys.modules.get(f'{plugin.name}.{pype.name}')
+                    if not module:
+                        continue
+                    try:
+                        reload(module)
+                    except (Exception, SystemExit):  # noqa: B902
+                        pass  # Reported when building the completion tree
+        tree = build_completion_tree(
+            root_command, self.__store_pype_completion, self, cached_only)
+        self.__manifest.save()
+        shell_command = path.basename(sys.argv[0])
+        cfg_dir = self.__config.get_dir_path()
+        for shell in ['bsh', 'zsh']:
+            complete_file = resolve_path(
+                path.join(cfg_dir, self.SHELL_COMPLETE_PREFIX + shell))
+            changed = write_if_changed(complete_file, render_completion_script(
+                shell_command, tree, shell))
+            if verbose and changed:
+                print('Writing completion-file ' + complete_file)
+
+    def __shell_installed(self) -> bool:
+        cfg_dir = self.__config.get_dir_path()
+        return any([
+            path.isfile(path.join(cfg_dir, self.SHELL_INIT_PREFIX + shell))
+            for shell in ['bsh', 'zsh']
+        ])
+
+    def __store_pype_completion(
+        self,
+        plugin: Plugin,
+        pype: Pype,
+        node: dict
+    ) -> None:
+        self.__manifest.set_pype_value(
+            plugin.abspath, pype.filename, 'completion', node)
 
     def __write_init_file(self, init_file: str, aliases: List) -> None:
-        shell_command = path.basename(sys.argv[0])
         cfg_dir = self.__config.get_dir_path()
-        source_cmd = 'source_zsh' if init_file == 'zsh' else 'source'
         target_file = resolve_path(
             path.join(cfg_dir, self.SHELL_INIT_PREFIX + init_file)
         )
         complete_file = resolve_path(
             path.join(cfg_dir, self.SHELL_COMPLETE_PREFIX + init_file)
         )
-        target_handle = open(resolve_path(target_file), 'w+')
-        print('Writing init-file ' + target_file)
         alias_definition = ''.join([
-            f'\talias {alias.alias}="{alias.command}"\n'
+            f'\talias {alias.alias}='
+            f'"{self.__escape_command(alias.command)}"\n'
             for alias in aliases
         ])
+        shell_command = path.basename(sys.argv[0])
         console_script = path.dirname(sys.argv[0])
-        shell_upper = shell_command.upper()
-        target_handle.write(f"""# PYPE-CLI INIT-FILE: {init_file}
+        if write_if_changed(target_file, f"""# PYPE-CLI INIT-FILE: {init_file}
 export PATH=$PATH:{console_script}
 if [ ! -z "$( command -v {shell_command} )" ] # Only if installed
 then
-    if [ ! -f {complete_file} ]
+    if [ -f {complete_file} ]
     then
-        _{shell_upper}_COMPLETE={source_cmd} {shell_command} > {complete_file}
+        . {complete_file}
     fi
-    . {complete_file}
 
 {alias_definition}
 fi
-""")
+"""):
+            print('Writing init-file ' + target_file)
+
+    def __link_rc_file(self, rc_file: str, rc_lines: List[str]) -> bool:
+        with open(rc_file, 'r') as file_handle:
+            content = file_handle.readlines()
+        if [line for line in content if self.SHELL_RC_HINT in line] == (
+            rc_lines
+        ):
+            return False  # Already linked to the init-file
+        content = [line for line in content if self.SHELL_RC_HINT not in line]
+        if content and not content[-1].endswith('\n'):
+            content[-1] += '\n'
+        with open(rc_file, 'w') as file_handle:
+            file_handle.writelines(content + rc_lines)
+        return True
 
     @staticmethod
     def create_pype_or_exit(
@@ -292,10 +421,21 @@ fi
     @staticmethod
     def get_abspath_to_pype(plugin: Plugin, name: str) -> Optional[str]:
         """Get absoulte path to pype Python script."""
-        for pype in plugin.pypes:
-            if name == pype.name:
-                return pype.abspath
-        return None
+        pype = plugin.get_pype(name)
+        return pype.abspath if pype else None
+
+    @staticmethod
+    def __get_root_command() -> Command:
+        ctx = get_current_context(silent=True)
+        if ctx:
+            return ctx.find_root().command
+        from pype.__main__ import main
+        return main
+
+    @staticmethod
+    def __escape_command(command: str) -> str:
+        # Keep the command literal within double quotes
+        return sub(r'(["$`\\])', r'\\\1', command)
 
     @staticmethod
     def __remove_file_silently(target_file: str) -> None:
@@ -311,23 +451,25 @@ fi
         environ['LC_ALL'] = 'C.UTF-8'
         environ['LANG'] = 'C.UTF-8'
 
-    @staticmethod
-    def __find_alias(
-        aliases: List[ConfigurationAlias],
-        key: str
-    ) -> Optional[ConfigurationAlias]:
-        for alias in aliases:
-            if key == alias.alias:
-                return alias
-        return None
-
-    @staticmethod
-    def __alias_present(config: Configuration, alias: str) -> bool:
-        return any([
-            existing_alias
-            for existing_alias in config.aliases
-            if existing_alias.alias == alias
-        ])
+    def __get_alias_index(
+        self,
+        config: Configuration
+    ) -> Dict[str, ConfigurationAlias]:
+        # Rebuilt whenever the configuration handler set or reloaded the
+        # configuration, which covers all changes made via its API
+        if (
+            config.aliases is not self.__alias_index_source
+            or self.__config.generation != self.__alias_index_generation
+        ):
+            self.__alias_index = {}
+            for alias in config.aliases:
+                self.__alias_index.setdefault(alias.alias, alias)
+            self.__alias_index_source = config.aliases
+            self.__alias_index_generation = self.__config.generation
+        return self.__alias_index
+
+    def __alias_present(self, config: Configuration, alias: str) -> bool:
+        return alias in self.__get_alias_index(config)
 
     @staticmethod
     def __setup_logging(config: PypeConfigHandler) -> None:
@@ -344,7 +486,7 @@ fi
 
 def load_module(name: str, module_path: str) -> Any:
     """Try to import the module at the provided path using classloader."""
-    sys.path.append(path.abspath(module_path))
+    register_plugin(name, path.join(path.abspath(module_path), name))
     try:
         return import_module(name)
     # This used to be a ModuleNotFoundException but it's only Python >= 3.6
@@ -352,6 +494,21 @@ def load_module(name: str, module_path: str) -> Any:
         raise PypeException(e)
 
 
+def validate_alias(alias: ConfigurationAlias) -> None:
+    """Check that an alias can be written to the shell init-files.
+
+    Names are limited to characters all POSIX shells accept for aliases.
+    Commands are escaped when written but must not span multiple lines.
+    """
+    if not fullmatch(r'[A-Za-z0-9_][A-Za-z0-9_-]*', alias.alias):
+        raise PypeException(
+            f'Invalid alias name "{alias.alias}". Use letters, digits, '
+            + 'underscores and dashes only.')
+    if search(r'[\n\r\0]', alias.command):
+        raise PypeException(
+            f'Command of alias {alias.alias} must be a single line.')
+
+
 def get_pype_basepath() -> str:
     """Get directory filename of this pype installation."""
     return path.dirname(path.dirname(__file__))
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Listing of plugins and their pypes."""
+
+import re
+import sys
+from fnmatch import fnmatchcase
+from json import dumps
+from typing import IO, Callable, Iterable, List, Optional, Tuple
+
+from colorama import Fore, Style
+
+from pype.exceptions import PypeException
+from pype.type_plugin import Plugin
+from pype.type_pype import Pype
+
+OUTPUT_FORMATS = ['text', 'json', 'tsv']
+
+PypeMatcher = Callable[[str, str], bool]
+
+
+def create_matcher(pattern: Optional[str], regex: bool) -> PypeMatcher:
+    """Create a matcher for pypes by plugin and pype command name.
+
+    A glob pattern has to match either the pype name or both names joined
+    by a space, e.g., ``basics hello*`` or ``basics *``. A regular
+    expression only needs to be found within the joined names.
+    """
+    if not pattern:
+        return lambda plugin_name, pype_name: True
+    if regex:
+        try:
+            compiled = re.compile(pattern)
+        except re.error as ex:
+            raise PypeException(f'Invalid regular expression: {ex}')
+        return lambda plugin_name, pype_name: bool(
+            compiled.search(f'{plugin_name} {pype_name}'))
+    return lambda plugin_name, pype_name: (
+        fnmatchcase(pype_name, pattern)
+        or fnmatchcase(f'{plugin_name} {pype_name}', pattern))
+
+
+def write_listing(
+    plugins: Iterable[Plugin],
+    pattern: Optional[str] = None,
+    regex: bool = False,
+    output_format: str = 'text',
+    target: Optional[IO[str]] = None
+) -> None:
+    """Write matching pypes plugin by plugin as soon as each is rendered.
+
+    Only plugin metadata is used, so plugin modules are not imported. If a
+    pattern is given, plugins without matching pypes are omitted.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise PypeException(f'Unsupported output format {output_format}')
+    matcher = create_matcher(pattern, regex)
+    target = target or sys.stdout
+    first = True
+    if output_format == 'json':
+        target.write('[')
+    for plugin in plugins:
+        pypes = __get_matching_pypes(plugin, matcher)
+        if not pypes and pattern:
+            continue
+        if output_format == 'json':
+            chunk = __render_json(plugin, pypes, first)
+        elif output_format == 'tsv':
+            chunk = __render_tsv(plugin, pypes)
+        else:
+            chunk = __render_text(plugin, pypes)
+        target.write(chunk)
+        target.flush()
+        first = first and not pypes
+    if output_format == 'json':
+        target.write('\n]\n' if not first else ']\n')
+    target.flush()
+
+
+def __get_matching_pypes(
+    plugin: Plugin,
+    matcher: PypeMatcher
+) -> List[Tuple[Pype, str]]:
+    return [
+        (pype, pype_name)
+        for pype, pype_name in zip(plugin.pypes, plugin.command_names)
+        if matcher(plugin.name, pype_name)
+    ]
+
+
+def __render_text(plugin: Plugin, pypes: List[Tuple[Pype, str]]) -> str:
+    built_in = 'Built-in' if plugin.internal else plugin.abspath
+    lines = [
+        f'{Style.BRIGHT}{Fore.BLUE}'
+        f'PLUGIN: {plugin.name.upper()}{Fore.LIGHTBLACK_EX}\n'
+        f'{plugin.doc}\n@ {built_in}',
+        f'{Style.BRIGHT}{Fore.BLUE}– PYPES:'
+    ]
+    lines.extend([
+        f'  {Style.BRIGHT}{Fore.BLUE}{pype_name}'
+        f'{Style.RESET_ALL} – {pype.doc}'
+        for pype, pype_name in pypes
+    ])
+    return '\n'.join(lines) + '\n\n'
+
+
+def __render_json(
+    plugin: Plugin,
+    pypes: List[Tuple[Pype, str]],
+    first: bool
+) -> str:
+    chunks = []
+    for pype, pype_name in pypes:
+        chunks.append(('\n' if first else ',\n') + dumps({
+            'plugin': plugin.name,
+            'pype': pype_name,
+            'doc': pype.doc,
+            'path': pype.abspath,
+            'internal': plugin.internal
+        }))
+        first = False
+    return ''.join(chunks)
+
+
+def __render_tsv(plugin: Plugin, pypes: List[Tuple[Pype, str]]) -> str:
+    return ''.join([
+        '\t'.join([plugin.name, pype_name, __tsv_escape(pype.doc),
+                   pype.abspath]) + '\n'
+        for pype, pype_name in pypes
+    ])
+
+
+def __tsv_escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n'))
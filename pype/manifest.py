@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of plugin and pype metadata."""
+
+from json import JSONDecodeError, dump, load
+from os import path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from pype.util.iotools import atomic_write
+
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+class PluginManifest:
+    """On-disk cache of scanned plugin directories.
+
+    Entries are keyed by a plugin's absolute path and hold the directory's
+    modification time along with modification time, size and docstring of
+    every pype, so that unchanged pypes don't need to be read again. Access
+    is thread-safe, so that plugins can be scanned concurrently.
+    """
+
+    def __init__(self, config_dir: str) -> None:
+        """Load manifest from the given configuration directory."""
+        self.filepath = path.join(config_dir, MANIFEST_FILENAME)
+        self.__plugins: Dict[str, dict] = self.__load(self.filepath)
+        self.__touched: set = set()
+        self.__dirty = False
+        self.__lock = Lock()
+
+    def get_plugin(self, abspath: str) -> Optional[dict]:
+        """Get cached entry for the plugin at the given path."""
+        with self.__lock:
+            self.__touched.add(abspath)
+            return self.__plugins.get(abspath, None)
+
+    def set_plugin(self, abspath: str, entry: dict) -> None:
+        """Update cached entry for the plugin at the given path."""
+        with self.__lock:
+            self.__touched.add(abspath)
+            if self.__plugins.get(abspath, None) == entry:
+                return
+            self.__plugins[abspath] = entry
+            self.__dirty = True
+
+    def set_pype_value(
+        self,
+        abspath: str,
+        filename: str,
+        key: str,
+        value: Any
+    ) -> None:
+        """Store an additional value for a pype of the given plugin."""
+        with self.__lock:
+            entry = self.__plugins.get(abspath, {}).get(
+                'files', {}).get(filename)
+            if entry is None or entry.get(key, None) == value:
+                return
+            entry[key] = value
+            self.__dirty = True
+
+    def save(self) -> bool:
+        """Persist manifest if any entry changed since loading.
+
+        Returns True if the manifest was written.
+        """
+        with self.__lock:
+            return self.__save()
+
+    def __save(self) -> bool:
+        stale = set(self.__plugins.keys()) - self.__touched
+        for abspath in stale:
+            del self.__plugins[abspath]
+        if not self.__dirty and not stale:
+            return False
+        try:
+            with atomic_write(self.filepath, 'w') as file_handle:
+                dump({
+                    'version': MANIFEST_VERSION,
+                    'plugins': self.__plugins
+                }, file_handle)
+        except OSError:
+            return False  # The manifest is a pure cache, so this is not fatal
+        self.__dirty = False
+        return True
+
+    @staticmethod
+    def __load(filepath: str) -> Dict[str, dict]:
+        try:
+            with open(filepath, 'r') as file_handle:
+                manifest = load(file_handle)
+        except (OSError, JSONDecodeError):
+            return {}
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get('version', None) != MANIFEST_VERSION
+        ):
+            return {}
+        return manifest.get('plugins', {})
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Import plugins directly from their folders without searching sys.path."""
+
+import sys
+from importlib.machinery import ModuleSpec, PathFinder
+from importlib.util import spec_from_file_location, spec_from_loader
+from os import path
+from typing import Any, Dict, Optional, Sequence, Tuple
+from zipimport import zipimporter
+
+
+class PluginFinder:
+    """Meta path finder mapping plugin names to their package folders.
+
+    Only top-level plugin packages are resolved here. Their submodules,
+    i.e., pypes and shared code, are found within the package's folder, so
+    importing a plugin never scans sys.path. A plugin may be mapped to a
+    bundle created by ``pype.config plugin-bundle`` instead of its folder.
+    Implements the finder protocol of importlib.abc.MetaPathFinder without
+    subclassing it to keep importlib.abc out of pype's startup.
+    """
+
+    def __init__(self) -> None:
+        """Create a finder without any plugins."""
+        # Package folder and optional bundle by plugin name
+        self.plugins: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def register(
+        self,
+        name: str,
+        abspath: str,
+        bundle: Optional[str] = None
+    ) -> None:
+        """Map a plugin name to its package folder or bundle."""
+        self.plugins[name] = (abspath, bundle)
+
+    def find_spec(
+        self,
+        fullname: str,
+        target_path: Optional[Sequence[str]] = None,
+        target: Any = None
+    ) -> Optional[ModuleSpec]:
+        """Find the spec of a registered plugin package."""
+        entry = self.plugins.get(fullname, None)
+        if not entry:
+            return None
+        abspath, bundle = entry
+        if bundle:
+            importer = zipimporter(bundle)
+            if hasattr(importer, 'find_spec'):
+                return importer.find_spec(fullname)
+            # Python < 3.10 only offers the legacy loader protocol
+            return spec_from_loader(fullname, importer, is_package=True)
+        init_file = path.join(abspath, '__init__.py')
+        if not path.isfile(init_file):
+            return None
+        return spec_from_file_location(
+            fullname, init_file, submodule_search_locations=[abspath])
+
+
+def install_plugin_finder() -> PluginFinder:
+    """Install the plugin finder once, right before the sys.path finder.
+
+    Built-in and frozen modules still take precedence over plugins.
+    """
+    for finder in sys.meta_path:
+        if isinstance(finder, PluginFinder):
+            return finder
+    index = len(sys.meta_path)
+    for position, finder in enumerate(sys.meta_path):
+        if finder is PathFinder:
+            index = position
+            break
+    sys.meta_path.insert(index, PLUGIN_FINDER)
+    return PLUGIN_FINDER
+
+
+def register_plugin(
+    name: str,
+    abspath: str,
+    bundle: Optional[str] = None
+) -> None:
+    """Make a plugin importable by name from its package folder or bundle."""
+    install_plugin_finder().register(name, abspath, bundle)
+
+
+PLUGIN_FINDER = PluginFinder()
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Resident pype server that forks a fresh worker per client call."""
+
+import importlib
+import signal
+import socket
+import sys
+import traceback
+from array import array
+from json import loads
+from os import (_exit, chdir, close, dup2, environ, execv, fork, getpid,
+                getuid, isatty, remove, setsid, stat, umask)
+from struct import calcsize, unpack
+from subprocess import Popen
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+import colorama
+
+from pype.client import get_server_socket_path
+from pype.core import PypeCore
+from pype.exceptions import PypeException
+from pype.util.cli import print_success, print_warning
+
+# Python code to run pype in a fresh interpreter with argv as given
+FRESH_PROCESS_CODE = ('import sys; sys.argv = sys.argv[1:]; '
+                      'from pype.__main__ import main; main()')
+
+
+class PypeServer:
+    """Resident pype server listening on a Unix domain socket.
+
+    Plugins and pypes are imported once on startup. Every client call is
+    handled in a forked worker that takes over the client's stdio, working
+    directory and environment, so pypes still run in a process of their own.
+    """
+
+    def __init__(self, core: PypeCore, root_command: click.Command) -> None:
+        """Warm up plugin modules of the given core."""
+        self.socket_path = get_server_socket_path()
+        self.__core = core
+        self.__root_command = root_command
+        self.__fingerprint = self.__get_fingerprint()
+        self.__modules = self.__warm_up()
+
+    def serve_forever(self) -> None:
+        """Accept client calls until interrupted."""
+        self.__check_not_running()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = umask(0o177)  # Socket is only accessible by the owner
+        try:
+            server.bind(self.socket_path)
+        finally:
+            umask(old_umask)
+        server.listen(128)
+        # Let the kernel reap finished workers
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, self.__terminate)
+        print_success(f'Pype server listening on {self.socket_path}')
+        try:
+            while True:
+                connection, _ = server.accept()
+                stale = self.__get_fingerprint() != self.__fingerprint
+                if fork() == 0:
+                    # Never return into the server's loop from a worker
+                    exit_code = 1
+                    try:
+                        server.close()
+                        exit_code = self.__handle(connection, stale)
+                    except BaseException:  # noqa: B902
+                        exit_code = 1
+                    finally:
+                        _exit(exit_code)
+                connection.close()
+                if stale:
+                    # Restart to pick up new configuration and plugins
+                    server.close()
+                    self.__remove_socket()
+                    print_warning('Configuration changed. Restarting.')
+                    execv(sys.executable, [
+                        sys.executable, '-c', FRESH_PROCESS_CODE,
+                        sys.argv[0], '--server'
+                    ])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            self.__remove_socket()
+
+    def __handle(self, connection: socket.socket, stale: bool) -> int:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            self.__check_peer(connection)
+            request, fds = self.__receive(connection)
+        except (OSError, ValueError, PypeException) as ex:
+            print_warning(f'Rejected client call: {ex}')
+            return 1
+        # Detach from the server's session and take over the client's stdio
+        setsid()
+        colorama.deinit()
+        for target_fd, fd in enumerate(fds):
+            dup2(fd, target_fd)
+            close(fd)
+        self.__reopen_stdio()
+        colorama.init(autoreset=True)
+        connection.sendall(f'PID {getpid()}\n'.encode('utf-8'))
+        try:
+            chdir(request['cwd'])
+            environ.clear()
+            environ.update(request['env'])
+        except (OSError, ValueError) as ex:
+            print(f'Could not take over client environment: {ex}',
+                  file=sys.stderr)
+            exit_code = 1
+        else:
+            argv = request['argv']
+            exit_code = (self.__run_fresh(argv) if stale
+                         else self.__run_warm(argv))
+        sys.stdout.flush()
+        sys.stderr.flush()
+        connection.sendall(f'EXIT {exit_code}\n'.encode('utf-8'))
+        connection.close()
+        return exit_code
+
+    def __run_warm(self, argv: List[str]) -> int:
+        self.__unload_changed_modules()
+        sys.argv = argv
+        try:
+            self.__root_command.main(
+                args=argv[1:], prog_name=argv[0].split('/')[-1])
+        except SystemExit as system_exit:
+            return self.__to_exit_code(system_exit.code)
+        except Exception:  # noqa: B902
+            traceback.print_exc()
+            return 1
+        return 0
+
+    @staticmethod
+    def __run_fresh(argv: List[str]) -> int:
+        process = Popen([sys.executable, '-c', FRESH_PROCESS_CODE] + argv)
+        while True:
+            try:
+                return process.wait()
+            except KeyboardInterrupt:
+                process.send_signal(signal.SIGINT)
+
+    def __warm_up(self) -> Dict[str, Tuple[str, Optional[int]]]:
+        for plugin in self.__core.get_plugins():
+            try:
+                plugin.module
+            except PypeException as ex:
+                print_warning(str(ex))
+                continue
+            for pype in plugin.pypes:
+                try:
+                    importlib.import_module(f'{plugin.name}.{pype.name}')
+                except (Exception, SystemExit):  # noqa: B902
+                    print_warning(f'Could not preload {pype.abspath}')
+        # Remember source files to detect changed pypes later on
+        prefixes = tuple([
+            plugin.name + '.' for plugin in self.__core.get_plugins()])
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, '__file__', None)
+            if not module_file or not name.startswith(prefixes):
+                continue
+            modules[name] = (module_file, self.__get_mtime(module_file))
+        return modules
+
+    def __unload_changed_modules(self) -> None:
+        for name, (module_file, mtime) in self.__modules.items():
+            if self.__get_mtime(module_file) != mtime:
+                sys.modules.pop(name, None)
+
+    def __get_fingerprint(self) -> List[Optional[int]]:
+        return [
+            self.__get_mtime(filepath)
+            for filepath in [self.__core.get_config_file_path()] + [
+                plugin.abspath for plugin in self.__core.get_plugins()
+            ]
+        ]
+
+    def __check_not_running(self) -> None:
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            self.__remove_socket()  # Stale socket from a crashed server
+            return
+        finally:
+            probe.close()
+        raise PypeException(
+            f'A pype server is already listening on {self.socket_path}')
+
+    def __remove_socket(self) -> None:
+        try:
+            remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def __terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt()
+
+    @staticmethod
+    def __check_peer(connection: socket.socket) -> None:
+        if not hasattr(socket, 'SO_PEERCRED'):
+            return  # Rely on socket file permissions only
+        credentials = connection.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, calcsize('3i'))
+        _, uid, _ = unpack('3i', credentials)
+        if uid != getuid():
+            raise PypeException(f'Client of foreign user {uid}')
+
+    @staticmethod
+    def __receive(connection: socket.socket) -> Tuple[Any, List[int]]:
+        fd_size = array('i').itemsize
+        header, ancdata, _, _ = connection.recvmsg(
+            4, socket.CMSG_SPACE(3 * fd_size))
+        fds = array('i')
+        for level, kind, data in ancdata:
+            if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                fds.frombytes(data[:len(data) - (len(data) % fd_size)])
+        if len(header) != 4 or len(fds) != 3:
+            for fd in fds:
+                close(fd)
+            raise ValueError('Invalid request header')
+        try:
+            payload = b''
+            payload_size = unpack('!I', header)[0]
+            while len(payload) < payload_size:
+                chunk = connection.recv(payload_size - len(payload))
+                if not chunk:
+                    raise ValueError('Incomplete request')
+                payload += chunk
+            request = loads(payload.decode('utf-8'))
+            PypeServer.__validate_request(request)
+        except (OSError, ValueError):
+            for fd in fds:
+                close(fd)
+            raise
+        return request, list(fds)
+
+    @staticmethod
+    def __validate_request(request: Any) -> None:
+        if not isinstance(request, dict):
+            raise ValueError('Request is not an object')
+        argv = request.get('argv', None)
+        if not isinstance(argv, list) or not argv or not all([
+            isinstance(arg, str) for arg in argv
+        ]):
+            raise ValueError('Invalid argv in request')
+        env = request.get('env', None)
+        if not isinstance(env, dict) or not all([
+            isinstance(key, str) and isinstance(value, str)
+            for key, value in env.items()
+        ]):
+            raise ValueError('Invalid env in request')
+        if not isinstance(request.get('cwd', None), str):
+            raise ValueError('Invalid cwd in request')
+
+    @staticmethod
+    def __reopen_stdio() -> None:
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(
+            1, 'w', buffering=1 if isatty(1) else -1, closefd=False)
+        sys.stderr = open(2, 'w', buffering=1, closefd=False)
+
+    @staticmethod
+    def __get_mtime(filepath: str) -> Optional[int]:
+        try:
+            return stat(filepath).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def __to_exit_code(code: Any) -> int:
+        if code is None:
+            return 0
+        if isinstance(code, int):
+            return code
+        print(code, file=sys.stderr)
+        return 1
@@ -3,17 +3,19 @@
 
 import getpass
 import importlib
-from glob import glob
-from os import path
-from sys import path as syspath
-from typing import Any
+from os import path, scandir, stat, stat_result
+from re import sub
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
 
+from pype.bundle import get_bundle_path, load_bundle_manifest
 from pype.config_model import ConfigurationPlugin
-from pype.constants import NOT_DOCUMENTED_YET
 from pype.exceptions import PypeException
-from pype.type_pype import Pype
-from pype.util.benchmark import Benchmark
+from pype.manifest import PluginManifest
+from pype.plugin_finder import register_plugin
+from pype.type_pype import Pype, get_module_docstring, is_pype_filename
 from pype.util.iotools import resolve_path
+from pype.util.profiler import count, span
 
 
 class Plugin:
@@ -22,20 +24,24 @@ class Plugin:
     def __init__(
         self,
         plugin: ConfigurationPlugin,
-        config_path: str
+        config_path: str,
+        manifest: Optional[PluginManifest] = None
     ) -> None:
         """Activate plugins for the provided configuration."""
-        with Benchmark(plugin.name):
-            self.__init_internal(plugin, config_path)
+        with span('Plugin.__init_internal', plugin=plugin.name):
+            self.__init_internal(plugin, config_path, manifest)
 
     def __init_internal(
         self,
         plugin: ConfigurationPlugin,
-        config_path: str
+        config_path: str,
+        manifest: Optional[PluginManifest]
     ) -> None:
         self.active = False
         if not self.__valid_for_user(plugin):
             return
+        self.bundle: Optional[dict] = None
+        self.bundle_path: Optional[str] = None
         if plugin.path != '%INTERNAL%':
             # plugin pype
             self.name = plugin.name
@@ -45,33 +51,144 @@ class Plugin:
                     plugin.path,
                     config_path
                 )))
-            syspath.append(python_abspath)
             self.abspath = path.join(python_abspath, plugin.name)
+            self.bundle = self.__load_bundle(config_path)
+            register_plugin(self.name, self.abspath, self.bundle_path)
         else:
             # internal pype
             self.name = 'pype.' + plugin.name
             self.internal = True
             self.abspath = path.join(path.dirname(
                 __file__), plugin.name)
-        try:
-            self.module = importlib.import_module(self.name)
-        # This used to be a ModuleNotFoundException but it's only Python >= 3.6
-        except Exception:  # noqa: F821
-            raise PypeException(
-                f'No plugin named "{self.name}" found at {self.abspath}')
-        self.doc = self.__get_docu_or_default(self.module)
-        subfiles = [
-            path.basename(file)
-            for file in glob(self.abspath + '/*.py')
-        ]
-        subfiles = [file for file in subfiles
-                    if not file.startswith('__')]
-        self.pypes = [
-            Pype(path.join(self.abspath, subfile), subfile, self.name)
-            for subfile in subfiles
-        ]
+        # Importing the plugin module is deferred until it is dispatched
+        self.__module: Optional[ModuleType] = None
+        if self.bundle:
+            self.doc, self.pypes = self.__load_bundle_metadata(manifest)
+        else:
+            self.doc, self.pypes = self.__load_metadata(manifest)
+        self.__pypes_by_name: Dict[str, Pype] = {
+            pype.name: pype for pype in self.pypes}
+        # Names of pypes as used on the command line
+        self.command_names = [sub('_', '-', pype.name) for pype in self.pypes]
         self.active = True
 
+    def get_pype(self, name: str) -> Optional[Pype]:
+        """Get pype with the given name."""
+        return self.__pypes_by_name.get(name, None)
+
+    @property
+    def module(self) -> ModuleType:
+        """Plugin module, imported on first access."""
+        if not self.__module:
+            try:
+                self.__module = importlib.import_module(self.name)
+            # This used to be a ModuleNotFoundException but it's only
+            # Python >= 3.6
+            except Exception:  # noqa: F821
+                raise PypeException(self.__not_found_message())
+        return self.__module
+
+    def __load_bundle(self, config_path: str) -> Optional[dict]:
+        bundle_path = get_bundle_path(path.dirname(config_path), self.name)
+        bundle = load_bundle_manifest(self.abspath, bundle_path)
+        self.bundle_path = bundle_path if bundle else None
+        return bundle
+
+    def __load_bundle_metadata(
+        self,
+        manifest: Optional[PluginManifest]
+    ) -> Tuple[str, List[Pype]]:
+        bundle: dict = self.bundle  # type: ignore
+        # Completion nodes are still cached in the manifest
+        cached = manifest.get_plugin(self.abspath) if manifest else None
+        cached_files = cached.get('files', {}) if cached else {}
+        return bundle['doc'], [
+            Pype(path.join(self.abspath, filename), filename, self.name, doc,
+                 cached_files.get(filename, {}).get('completion', None))
+            for filename, doc in sorted(bundle['pypes'].items())
+        ]
+
+    def __not_found_message(self) -> str:
+        return f'No plugin named "{self.name}" found at {self.abspath}'
+
+    def __load_metadata(
+        self,
+        manifest: Optional[PluginManifest]
+    ) -> Tuple[str, List[Pype]]:
+        cached = manifest.get_plugin(self.abspath) if manifest else None
+        try:
+            dir_mtime = stat(self.abspath).st_mtime_ns
+            init_file = path.join(self.abspath, '__init__.py')
+            init_entry = self.__read_docstring(
+                init_file, cached.get('doc', None) if cached else None)
+        except (FileNotFoundError, NotADirectoryError):
+            raise PypeException(self.__not_found_message())
+        cached_files = cached['files'] if cached else {}
+        subfiles: Dict[str, Optional[stat_result]]
+        if cached and cached['mtime'] == dir_mtime:
+            # Directory content unchanged, skip scanning
+            subfiles = {subfile: None for subfile in cached_files.keys()}
+        else:
+            subfiles = self.__scan_directory()
+        pypes = []
+        files = {}
+        for subfile in sorted(subfiles.keys()):
+            abspath = path.join(self.abspath, subfile)
+            try:
+                entry = self.__read_docstring(
+                    abspath, cached_files.get(subfile, None),
+                    subfiles[subfile])
+            except FileNotFoundError:
+                continue
+            files[subfile] = entry
+            pypes.append(Pype(
+                abspath, subfile, self.name,
+                entry['doc'], entry.get('completion', None)))
+        if manifest:
+            manifest.set_plugin(self.abspath, {
+                'mtime': dir_mtime,
+                'doc': init_entry,
+                'files': files
+            })
+        return init_entry['doc'], pypes
+
+    def __scan_directory(self) -> Dict[str, Optional[stat_result]]:
+        count('plugin directories scanned')
+        subfiles: Dict[str, Optional[stat_result]] = {}
+        with scandir(self.abspath) as dir_entries:
+            for dir_entry in dir_entries:
+                if not is_pype_filename(dir_entry.name):
+                    continue
+                try:
+                    if dir_entry.is_file():
+                        subfiles[dir_entry.name] = dir_entry.stat()
+                except OSError:
+                    continue  # Removed concurrently
+        return subfiles
+
+    @staticmethod
+    def __read_docstring(
+        filepath: str,
+        cached_entry: Optional[dict],
+        file_stat: Optional[stat_result] = None
+    ) -> dict:
+        count('files scanned')
+        if file_stat is None:
+            file_stat = stat(filepath)
+        entry: dict = {
+            'mtime': file_stat.st_mtime_ns,
+            'size': file_stat.st_size
+        }
+        if (
+            cached_entry
+            and cached_entry['mtime'] == entry['mtime']
+            and cached_entry['size'] == entry['size']
+        ):
+            return cached_entry
+        count('docstrings read')
+        entry['doc'] = get_module_docstring(filepath)
+        return entry
+
     @staticmethod
     def __handle_relative_path(plugin_path: str, config_path: str) -> str:
         if not plugin_path.startswith('.'):
@@ -81,12 +198,6 @@ class Plugin:
             plugin_path
         ))
 
-    @staticmethod
-    def __get_docu_or_default(module: Any) -> str:
-        return (
-            module.__doc__ if module.__doc__ else NOT_DOCUMENTED_YET
-        )
-
     @staticmethod
     def __valid_for_user(plugin: ConfigurationPlugin) -> bool:
         if not plugin.users or len(plugin.users) == 0:
@@ -1,24 +1,79 @@
 # -*- coding: utf-8 -*-
 """Data structure defining a pype."""
 
+import tokenize
+from ast import literal_eval
 from re import sub
+from typing import Callable, List, Optional
 
 from pype.constants import NOT_DOCUMENTED_YET
+from pype.util.profiler import span
 
 
 class Pype:
     """Data structure defining a pype."""
 
-    def __init__(self, abspath: str, filename: str, plugin_name: str):
+    def __init__(
+        self,
+        abspath: str,
+        filename: str,
+        plugin_name: str,
+        doc: Optional[str] = None,
+        completion: Optional[dict] = None
+    ):
         """Activate pypes for the provided configuration."""
-        self.name = sub(r'\.py$', '', filename)
-        self.doc = self.__get_module_docstring(abspath)
-        self.abspath = abspath
-        self.plugin_name = plugin_name
-
-    @staticmethod
-    def __get_module_docstring(filepath: str) -> str:
-        co = compile(open(filepath).read(), filepath, 'exec')
-        if co.co_consts and isinstance(co.co_consts[0], str):
-            return co.co_consts[0]
+        with span('Pype.__init__', pype=filename):
+            self.name = sub(r'\.py$', '', filename)
+            self.filename = filename
+            self.doc = (doc if doc is not None
+                        else get_module_docstring(abspath))
+            self.abspath = abspath
+            self.plugin_name = plugin_name
+            # Options and subcommands for shell completion if already known
+            self.completion = completion
+
+
+def is_pype_filename(filename: str) -> bool:
+    """Check if a file inside a plugin's folder is a pype.
+
+    Pypes are top-level Python scripts not starting with two underscores,
+    which are reserved for shared code like ``__commons__.py``.
+    """
+    return filename.endswith('.py') and not filename.startswith('__')
+
+
+def get_module_docstring(filepath: str) -> str:
+    """Read the docstring of a Python module without importing it.
+
+    The file is tokenized line by line and reading stops at the first token
+    that is not part of the leading docstring, so the cost does not depend
+    on the length of the module.
+    """
+    try:
+        with open(filepath, 'rb') as file_handle:
+            literals = __read_docstring_literals(file_handle.readline)
+            docstring = literal_eval(' '.join(literals)) if literals else None
+    except (tokenize.TokenError, SyntaxError, ValueError):
+        return NOT_DOCUMENTED_YET
+    if not isinstance(docstring, str):
         return NOT_DOCUMENTED_YET
+    return docstring
+
+
+def __read_docstring_literals(readline: Callable[[], bytes]) -> List[str]:
+    skipped = (tokenize.ENCODING, tokenize.COMMENT, tokenize.NL)
+    literals: List[str] = []
+    for token in tokenize.tokenize(readline):
+        if token.type in skipped and not literals:
+            continue
+        if token.type == tokenize.STRING:
+            literals.append(token.string)
+            continue
+        # A docstring is a statement made up of string literals only
+        if literals and (
+            token.type in (tokenize.NEWLINE, tokenize.ENDMARKER)
+            or token.exact_type == tokenize.SEMI
+        ):
+            return literals
+        return []
+    return []
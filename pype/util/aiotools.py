@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Asynchronous I/O utilities."""
+
+import asyncio
+from asyncio.subprocess import PIPE, Process
+from functools import wraps
+from inspect import iscoroutinefunction
+from os import killpg
+from signal import SIGTERM
+from typing import Any, Optional, Tuple
+
+from pype.util.iotools import Cmdline, resolve_cmdline
+
+
+async def run_interactive_async(
+    cmdline: Cmdline,
+    dry_run: bool = False,
+    verbose: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    **kwargs: Any
+) -> int:
+    """Call an interactive shell without blocking the event loop.
+
+    If a semaphore is given, the shell is only started once it is acquired,
+    so that the number of concurrent shells can be limited. The shell stays
+    in the terminal's foreground process group, so Ctrl-C reaches it
+    directly. On cancellation the shell is terminated. Like ``pype.sh``,
+    argument lists are executed without an intermediate shell.
+    """
+    if dry_run or verbose:
+        print(f'$: {cmdline}')
+    if dry_run:
+        return 0
+    async with semaphore or __NoLimit():
+        process = await __create_shell(cmdline, **kwargs)
+        await __wait_or_terminate(process)
+        return process.returncode  # type: ignore
+
+
+async def run_and_get_output_async(
+    cmdline: Cmdline,
+    dry_run: bool = False,
+    verbose: bool = False,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    **kwargs: Any
+) -> Tuple[str, str]:
+    """Call a non-interactive shell and return stdout and stderr.
+
+    If a semaphore is given, the shell is only started once it is acquired,
+    so that the number of concurrent shells can be limited.
+    """
+    if dry_run or verbose:
+        print(f'$: {cmdline}')
+    if dry_run:
+        return '', ''
+    async with semaphore or __NoLimit():
+        # Own process group to stop children of the shell on cancellation
+        process = await __create_shell(
+            cmdline, stdout=PIPE, stderr=PIPE, start_new_session=True,
+            **kwargs)
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            await __terminate(process, group=True)
+            raise
+        return stdout.decode('utf-8'), stderr.decode('utf-8')
+
+
+def run_async(main: Any) -> Any:
+    """Run a coroutine to completion in a new event loop.
+
+    Can also be used as a decorator for ``async def`` functions, e.g., a
+    click command's main function. Like ``pype.sh``, a keyboard interrupt
+    is not treated as an error: pending shells are terminated and None is
+    returned.
+    """
+    if iscoroutinefunction(main):
+        @wraps(main)
+        def __wrapper(*args: Any, **kwargs: Any) -> Any:
+            return run_async(main(*args, **kwargs))
+        return __wrapper
+    try:
+        return asyncio.run(main)
+    except KeyboardInterrupt:
+        return None
+
+
+class __NoLimit:
+    """Stand-in for a semaphore that never blocks."""
+
+    async def __aenter__(self) -> None:  # noqa: D105
+        pass
+
+    async def __aexit__(self, *args: Any) -> None:  # noqa: D105
+        pass
+
+
+async def __create_shell(cmdline: Cmdline, **kwargs: Any) -> Process:
+    popen_args, popen_kwargs = resolve_cmdline(
+        cmdline, kwargs.pop('shell', None))
+    if not popen_kwargs.pop('shell'):
+        return await asyncio.create_subprocess_exec(
+            *popen_args, **{**popen_kwargs, **kwargs})
+    # Same semantics as subprocess with shell=True
+    if isinstance(popen_args, str):
+        popen_args = [popen_args]
+    return await asyncio.create_subprocess_exec(
+        '/bin/sh', '-c', *popen_args, **kwargs)
+
+
+async def __wait_or_terminate(process: Process) -> None:
+    try:
+        await process.wait()
+    except asyncio.CancelledError:
+        await __terminate(process)
+        raise
+
+
+async def __terminate(process: Process, group: bool = False) -> None:
+    if process.returncode is not None:
+        return
+    try:
+        if group:
+            killpg(process.pid, SIGTERM)
+        else:
+            process.terminate()
+    except ProcessLookupError:
+        return
+    # Shield to reap the child even if cancelled again
+    await asyncio.shield(process.wait())
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""Size-bounded on-disk cache and result caching for pypes."""
+
+import pickle
+import sys
+from functools import wraps
+from hashlib import sha256
+from os import environ, makedirs, path, remove, scandir, utime
+from time import time
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+from pype.util.iotools import atomic_write
+
+# Name of the cache folder inside the configuration folder
+CACHE_FOLDER = 'cache'
+CACHE_ENTRY_VERSION = 1
+CACHE_ENTRY_SUFFIX = '.entry'
+
+
+class DiskCache:
+    """Size-bounded LRU store of pickled values in a folder.
+
+    Every entry is a file named after the hash of its key. Reading an entry
+    updates its modification time, so that the least recently used entries
+    are evicted first once ``max_bytes`` or ``max_entries`` is exceeded.
+    Unreadable entries are treated as missing.
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 1000
+    ) -> None:
+        """Create a cache in the given folder which is created on demand."""
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the value stored for key or None if missing or expired."""
+        entry = self.__read(self.__get_entry_path(key))
+        if not entry or entry['key'] != key:
+            return None
+        if self.__is_expired(entry):
+            self.delete(key)
+            return None
+        try:
+            utime(self.__get_entry_path(key))
+        except OSError:
+            pass
+        return entry['value']
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value for key, expiring after ttl seconds if given."""
+        created = time()
+        entry = {
+            'version': CACHE_ENTRY_VERSION,
+            'key': key,
+            'created': created,
+            'expires': created + ttl if ttl is not None else None,
+            'value': value
+        }
+        try:
+            makedirs(self.folder, exist_ok=True)
+            with atomic_write(self.__get_entry_path(key)) as file_handle:
+                pickle.dump(entry, file_handle)
+        except OSError:
+            return  # The cache is optional, so ignore read-only folders
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for key if it exists."""
+        self.__remove(self.__get_entry_path(key))
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """List entries, most recently used first, without their values."""
+        entries = []
+        for entry_path, size, mtime in self.__scan():
+            entry = self.__read(entry_path)
+            if not entry:
+                continue
+            entries.append({
+                'key': entry['key'],
+                'created': entry['created'],
+                'expires': entry['expires'],
+                'expired': self.__is_expired(entry),
+                'used': mtime,
+                'size': size
+            })
+        return sorted(entries, key=lambda entry: -entry['used'])
+
+    def evict(self) -> int:
+        """Remove least recently used entries exceeding the size bounds."""
+        files = sorted(self.__scan(), key=lambda file: file[2])
+        total_size = sum([size for _, size, _ in files])
+        evicted = 0
+        while files and (
+            total_size > self.max_bytes or len(files) > self.max_entries
+        ):
+            entry_path, size, _ = files.pop(0)
+            self.__remove(entry_path)
+            total_size -= size
+            evicted += 1
+        return evicted
+
+    def prune(self) -> int:
+        """Remove expired entries."""
+        pruned = 0
+        for entry_path, _, _ in self.__scan():
+            entry = self.__read(entry_path)
+            if not entry or self.__is_expired(entry):
+                self.__remove(entry_path)
+                pruned += 1
+        return pruned
+
+    def clear(self) -> int:
+        """Remove all entries."""
+        files = self.__scan()
+        for entry_path, _, _ in files:
+            self.__remove(entry_path)
+        return len(files)
+
+    def __get_entry_path(self, key: str) -> str:
+        digest = sha256(key.encode('utf-8')).hexdigest()
+        return path.join(self.folder, digest + CACHE_ENTRY_SUFFIX)
+
+    def __scan(self) -> List[Tuple[str, int, float]]:
+        try:
+            with scandir(self.folder) as dir_entries:
+                files = []
+                for dir_entry in dir_entries:
+                    if not dir_entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                        continue
+                    try:
+                        entry_stat = dir_entry.stat()
+                    except OSError:
+                        continue  # Removed concurrently
+                    files.append((dir_entry.path, entry_stat.st_size,
+                                  entry_stat.st_mtime))
+                return files
+        except OSError:
+            return []
+
+    @staticmethod
+    def __read(entry_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(entry_path, 'rb') as entry_handle:
+                entry = pickle.load(entry_handle)
+        except (OSError, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError):
+            return None
+        if (
+            not isinstance(entry, dict)
+            or entry.get('version', None) != CACHE_ENTRY_VERSION
+        ):
+            return None
+        return entry
+
+    @staticmethod
+    def __is_expired(entry: Dict[str, Any]) -> bool:
+        return entry['expires'] is not None and entry['expires'] <= time()
+
+    @staticmethod
+    def __remove(entry_path: str) -> None:
+        try:
+            remove(entry_path)
+        except OSError:
+            pass
+
+
+def get_cache(name: str, **kwargs: Any) -> DiskCache:
+    """Get a named cache inside the pype configuration folder."""
+    return DiskCache(path.join(get_cache_dir_path(), name), **kwargs)
+
+
+def get_cache_names() -> List[str]:
+    """List names of existing caches inside the configuration folder."""
+    try:
+        with scandir(get_cache_dir_path()) as dir_entries:
+            return sorted([dir_entry.name for dir_entry in dir_entries
+                           if dir_entry.is_dir()])
+    except OSError:
+        return []
+
+
+def get_cache_dir_path() -> str:
+    """Get absolute path to the folder holding all caches."""
+    from pype.config_handler import get_config_handler
+    return path.join(get_config_handler().get_dir_path(), CACHE_FOLDER)
+
+
+class _TeeOutput:
+    """Text stream writing through to a target while recording bytes."""
+
+    def __init__(self, target: IO[str]) -> None:  # noqa: D107
+        self.target = target
+        self.recorded: List[bytes] = []
+
+    def write(self, text: Any) -> int:  # noqa: D102
+        # Click may hand over bytes it already encoded
+        self.recorded.append(
+            text if isinstance(text, bytes) else text.encode('utf-8'))
+        return self.target.write(text)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: D105
+        return getattr(self.target, name)
+
+
+def cached(
+    ttl: Optional[float] = None,
+    key: Optional[Callable[..., Any]] = None,
+    env: Optional[List[str]] = None,
+    cache_failures: bool = False,
+    max_bytes: int = 64 * 1024 * 1024,
+    max_entries: int = 1000
+) -> Callable[[click.Command], click.Command]:
+    """Cache the output of a click command.
+
+    Place the decorator above ``@click.command``. The text a command writes
+    to ``sys.stdout`` and its exit code are stored for ``ttl`` seconds (or
+    until evicted) keyed by the command path, its parameters, the values of
+    the environment variables listed in ``env`` and, if given, the result
+    of ``key`` called with the command's parameters. Output of child
+    processes writing to the terminal directly is not captured. Only runs
+    with exit code 0 are stored unless ``cache_failures`` is set. The options
+    ``--no-cache`` and ``--refresh`` are added to bypass or renew the entry.
+    """
+    def __decorator(command: click.Command) -> click.Command:
+        callback = command.callback
+        if callback is None:
+            return command
+
+        @wraps(callback)
+        def __cached_callback(*args: Any, **kwargs: Any) -> Any:
+            no_cache = kwargs.pop('no_cache', False)
+            refresh = kwargs.pop('refresh', False)
+            if no_cache:
+                return callback(*args, **kwargs)
+            cache = get_cache('commands', max_bytes=max_bytes,
+                              max_entries=max_entries)
+            cache_key = repr((
+                click.get_current_context().command_path,
+                sorted(kwargs.items()),
+                [(name, environ.get(name, None)) for name in env or []],
+                key(**kwargs) if key else None
+            ))
+            if not refresh:
+                hit = cache.get(cache_key)
+                if hit is not None:
+                    sys.stdout.write(hit['stdout'].decode('utf-8'))
+                    sys.stdout.flush()
+                    if hit['exit_code'] != 0:
+                        sys.exit(hit['exit_code'])
+                    return None
+            tee = _TeeOutput(sys.stdout)
+            sys.stdout = tee
+            # Stays None for exceptions other than exits, which aren't cached
+            exit_code: Optional[int] = None
+            try:
+                result = callback(*args, **kwargs)
+                exit_code = 0
+                return result
+            except SystemExit as system_exit:
+                exit_code = __get_exit_code(system_exit.code)
+                raise
+            except click.exceptions.Exit as exit_exception:
+                exit_code = exit_exception.exit_code
+                raise
+            finally:
+                sys.stdout = tee.target
+                if exit_code == 0 or (
+                    exit_code is not None and cache_failures
+                ):
+                    cache.put(cache_key, {
+                        'stdout': b''.join(tee.recorded),
+                        'exit_code': exit_code
+                    }, ttl)
+
+        command.callback = __cached_callback
+        command.params.extend([
+            click.Option(['--no-cache'], is_flag=True,
+                         help='Bypass the result cache.'),
+            click.Option(['--refresh'], is_flag=True,
+                         help='Ignore and renew the cached result.')
+        ])
+        return command
+    return __decorator
+
+
+def __get_exit_code(code: Any) -> int:
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else 1
@@ -15,7 +15,7 @@ def fname_to_name(fname: str) -> str:
     This function just makes sure of that so you don't have to press shift to
     resolve it during execution.
     """
-    return sub('_', '-', fname[:-3].split(sep)[-1])
+    return sub('_', '-', sub(r'\.pyc?$', '', fname.split(sep)[-1]))
 
 
 def print_success(message: str) -> None:
@@ -1,47 +1,527 @@
 # -*- coding: utf-8 -*-
 """I/O utilities."""
 
-from os import environ, path
-from subprocess import PIPE, call, run
-from typing import List, Tuple
+import sys
+from codecs import getincrementaldecoder
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import sha256
+from json import JSONDecodeError, loads
+from os import (chmod, environ, fsync, getcwd, killpg, path, remove, replace,
+                stat)
+from shlex import quote
+from shutil import which
+from signal import SIGKILL, SIGTERM
+from subprocess import DEVNULL, PIPE, Popen, TimeoutExpired, call, run
+from threading import Lock, Thread
+from time import perf_counter, time
+from typing import (IO, Any, Callable, Deque, Dict, Iterator, List, Optional,
+                    Set, Tuple, Union)
 
+from pype.exceptions import PypeException
 from pype.util.cli import print_error
+from pype.util.profiler import count
+
+# A shell command line as string or an argument vector as list
+Cmdline = Union[str, List[str]]
+
+# In-process tier of memoized outputs, see run_and_get_output
+OUTPUT_CACHE_SIZE = 256
+_OUTPUT_CACHE: 'OrderedDict[str, Tuple[float, Tuple[str, str]]]' = (
+    OrderedDict())
+_OUTPUT_CACHE_LOCK = Lock()
+OUTPUT_CACHE_STATS: Dict[str, int] = {
+    'hits': 0, 'disk hits': 0, 'misses': 0}
+
+
+def resolve_cmdline(
+    cmdline: Cmdline,
+    shell: Optional[bool] = None
+) -> Tuple[Cmdline, Dict[str, Any]]:
+    """Choose between shell and exec mode for a command line.
+
+    Returns the arguments and keyword arguments for subprocess.Popen. If
+    ``shell`` is not given, strings and single-item lists are run by the
+    shell. Longer lists are executed directly without an intermediate shell
+    and with inherited file descriptors, so that subprocess can use
+    posix_spawn or vfork. If the executable cannot be found, the command is
+    handed to the shell to fail the same way as in shell mode.
+    """
+    if shell is None:
+        shell = isinstance(cmdline, str) or len(cmdline) == 1
+    if shell:
+        if isinstance(cmdline, list) and len(cmdline) == 1:
+            return cmdline[0], {'shell': True}
+        return cmdline, {'shell': True}
+    argv = [cmdline] if isinstance(cmdline, str) else list(cmdline)
+    executable = __which(argv[0], environ.get('PATH', None))
+    if not executable:
+        return ' '.join([quote(arg) for arg in argv]), {'shell': True}
+    return [executable] + argv[1:], {'shell': False, 'close_fds': False}
 
 
 def run_interactive(
-        cmdline: List[str],
+        cmdline: Cmdline,
         dry_run: bool = False,
         verbose: bool = False,
         *args: str,
-        **kwargs: int
+        shell: Optional[bool] = None,
+        **kwargs: Any
 ) -> int:
-    """Call an interactive shell."""
+    """Call an interactive shell or, for argument lists, a program."""
     if dry_run or verbose:
         print(f'$: {cmdline}')
     if dry_run:
         return 0
+    popen_args, popen_kwargs = resolve_cmdline(cmdline, shell)
     try:
-        return call(cmdline, shell=True,  # type: ignore  # noqa
-            *args, **kwargs)  # type: ignore  # noqa
+        return call(popen_args, *args,  # type: ignore
+                    **{**popen_kwargs, **kwargs})
     except KeyboardInterrupt:
         return 0
 
 
 def run_and_get_output(
-    cmdline: List[str],
+    cmdline: Cmdline,
     dry_run: bool = False,
     verbose: bool = False,
     *args: str,
-    **kwargs: int
+    shell: Optional[bool] = None,
+    cache_ttl: Optional[float] = None,
+    cache_env: Optional[List[str]] = None,
+    cache_disk: bool = False,
+    **kwargs: Any
 ) -> Tuple[str, str]:
-    """Call a non-interactive shell and return stdout and stderr."""
+    """Call a non-interactive shell or program and return stdout and stderr.
+
+    Like ``run_interactive``, argument lists are executed without a shell.
+    For side-effect-free commands, set ``cache_ttl`` to reuse the output of
+    successful calls for that many seconds. Outputs are memoized per command
+    line, working directory, further arguments and the values of the
+    environment variables listed in ``cache_env``. With ``cache_disk`` they
+    are also stored in the configuration folder to be reused across runs.
+    """
     if dry_run or verbose:
         print(f'$: {cmdline}')
     if dry_run:
         return '', ''
-    proc = run(cmdline, shell=True, stdout=PIPE,  # type: ignore  # noqa
-               stderr=PIPE, *args, **kwargs)
-    return proc.stdout.decode('utf-8'), proc.stderr.decode('utf-8')
+    cache_key = None
+    if cache_ttl is not None:
+        cache_key = repr((
+            cmdline, shell, kwargs.get('cwd', None) or getcwd(), args,
+            sorted([(key, value) for key, value in kwargs.items()
+                    if key != 'cwd']),
+            [(name, environ.get(name, None)) for name in cache_env or []]
+        ))
+        output = __get_cached_output(cache_key, cache_disk)
+        if output is not None:
+            return output
+    popen_args, popen_kwargs = resolve_cmdline(cmdline, shell)
+    proc = run(popen_args, *args, stdout=PIPE, stderr=PIPE,  # type: ignore
+               **{**popen_kwargs, **kwargs})
+    output = proc.stdout.decode('utf-8'), proc.stderr.decode('utf-8')
+    if cache_key is not None and proc.returncode == 0:
+        __put_cached_output(
+            cache_key, output, cache_ttl, cache_disk)  # type: ignore
+    return output
+
+
+def get_output_cache_stats() -> Dict[str, int]:
+    """Get hit and miss counters of memoized run_and_get_output calls."""
+    with _OUTPUT_CACHE_LOCK:
+        return dict(OUTPUT_CACHE_STATS, entries=len(_OUTPUT_CACHE))
+
+
+def clear_output_cache(disk: bool = False) -> None:
+    """Forget memoized outputs of run_and_get_output."""
+    with _OUTPUT_CACHE_LOCK:
+        _OUTPUT_CACHE.clear()
+    if disk:
+        from pype.util.cache import get_cache
+        get_cache('sho').clear()
+
+
+class OutputStream:
+    """Lazily decoded stdout of a running child process.
+
+    Iterating yields stdout line by line (including line breaks) while the
+    child is still running. Only one chunk of stdout is held in memory at a
+    time, lines longer than ``max_line_length`` are yielded in parts. The
+    last ``stderr_lines`` lines of stderr are kept in ``stderr``. Use as a
+    context manager to make sure the child is terminated and reaped.
+    """
+
+    def __init__(
+        self,
+        process: Optional[Popen],
+        tee: bool = False,
+        chunk_size: int = 65536,
+        max_line_length: int = 1048576,
+        stderr_lines: int = 1000,
+        encoding: str = 'utf-8',
+        errors: str = 'replace'
+    ) -> None:
+        """Start consuming the given process' output."""
+        self.process = process
+        self.tee = tee
+        self.chunk_size = chunk_size
+        self.max_line_length = max_line_length
+        self.encoding = encoding
+        self.errors = errors
+        self.stderr: Deque[str] = deque(maxlen=stderr_lines)
+        self.__stderr_thread: Optional[Thread] = None
+        if process and process.stderr:
+            self.__stderr_thread = Thread(
+                target=self.__consume_stderr, args=(process.stderr,),
+                daemon=True)
+            self.__stderr_thread.start()
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield stdout line by line."""
+        pending = ''
+        for chunk in self.chunks():
+            *lines, pending = (pending + chunk).split('\n')
+            for line in lines:
+                yield line + '\n'
+            while len(pending) > self.max_line_length:
+                yield pending[:self.max_line_length]
+                pending = pending[self.max_line_length:]
+        if pending:
+            yield pending
+
+    def __enter__(self) -> 'OutputStream':  # noqa: D105
+        return self
+
+    def __exit__(self, *args: Any) -> None:  # noqa: D105
+        self.close()
+
+    def chunks(self) -> Iterator[str]:
+        """Yield stdout in decoded chunks as soon as they are available."""
+        if (
+            not self.process
+            or not self.process.stdout
+            or self.process.stdout.closed
+        ):
+            return
+        decoder = getincrementaldecoder(self.encoding)(self.errors)
+        stdout = self.process.stdout
+        while True:
+            data = stdout.read1(self.chunk_size)  # type: ignore
+            text = decoder.decode(data, final=not data)
+            if text:
+                if self.tee:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                yield text
+            if not data:
+                break
+
+    def wait(self) -> int:
+        """Consume remaining stdout and return the child's exit code."""
+        if not self.process:
+            return 0
+        for _ in self.chunks():
+            pass
+        returncode = self.process.wait()
+        if self.__stderr_thread:
+            self.__stderr_thread.join()
+        return returncode
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """Exit code of the child or None if it is still running."""
+        return self.process.poll() if self.process else 0
+
+    def close(self) -> None:
+        """Terminate the child if it is still running and release pipes."""
+        if not self.process:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+        if self.process.stdout:
+            self.process.stdout.close()
+        self.wait()
+
+    def __consume_stderr(self, stderr: IO[bytes]) -> None:
+        decoder = getincrementaldecoder(self.encoding)(self.errors)
+        pending = ''
+        for data in iter(lambda: stderr.read1(  # type: ignore
+                self.chunk_size), b''):
+            text = decoder.decode(data)
+            if self.tee:
+                sys.stderr.write(text)
+                sys.stderr.flush()
+            *lines, pending = (pending + text).split('\n')
+            self.stderr.extend([line + '\n' for line in lines])
+            pending = pending[-self.max_line_length:]
+        pending += decoder.decode(b'', final=True)
+        if pending:
+            self.stderr.append(pending)
+        stderr.close()
+
+
+def run_and_stream_output(
+    cmdline: Cmdline,
+    dry_run: bool = False,
+    verbose: bool = False,
+    tee: bool = False,
+    *args: str,
+    shell: Optional[bool] = None,
+    **kwargs: Any
+) -> OutputStream:
+    """Call a non-interactive shell and stream its output.
+
+    Returns an OutputStream to iterate over stdout while the command runs.
+    Keyword arguments of OutputStream are used to configure the stream, all
+    others are passed on to subprocess.Popen.
+    """
+    if dry_run or verbose:
+        print(f'$: {cmdline}')
+    stream_options = {
+        key: kwargs.pop(key) for key in list(kwargs.keys())
+        if key in ['chunk_size', 'max_line_length', 'stderr_lines',
+                   'encoding', 'errors']
+    }
+    if dry_run:
+        return OutputStream(None, tee, **stream_options)
+    popen_args, popen_kwargs = resolve_cmdline(cmdline, shell)
+    process = Popen(popen_args, *args, stdout=PIPE,  # type: ignore
+                    stderr=PIPE, **{**popen_kwargs, **kwargs})
+    return OutputStream(process, tee, **stream_options)
+
+
+@dataclass
+class CommandResult:
+    """Result of a single command run by run_many_*."""
+
+    cmdline: Cmdline
+    returncode: int
+    stdout: str = ''
+    stderr: str = ''
+    duration: float = 0.0
+    timed_out: bool = False
+
+
+class CommandResults(List[CommandResult]):
+    """Results of several commands in the order they were given."""
+
+    @property
+    def failed(self) -> List[CommandResult]:
+        """Results of commands with a non-zero exit code."""
+        return [result for result in self if result.returncode != 0]
+
+    @property
+    def returncode(self) -> int:
+        """First non-zero exit code or 0 if all commands succeeded."""
+        return self.failed[0].returncode if self.failed else 0
+
+    def summary(self) -> str:
+        """Summarize exit codes in a single line."""
+        timed_out = len([result for result in self if result.timed_out])
+        return (f'{len(self) - len(self.failed)}/{len(self)} commands '
+                + f'succeeded, {len(self.failed)} failed'
+                + (f' ({timed_out} timed out)' if timed_out else '') + '.')
+
+
+def run_many_interactive(
+    cmdlines: List[Cmdline],
+    dry_run: bool = False,
+    verbose: bool = False,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    labels: Optional[List[str]] = None
+) -> CommandResults:
+    """Call several shells in parallel and multiplex their output.
+
+    Output is written line by line, prefixed with the command's label which
+    defaults to its command line. Commands don't read from stdin. A command
+    exceeding ``timeout`` seconds is killed.
+    """
+    if labels is None:
+        labels = [__get_label(cmdline) for cmdline in cmdlines]
+    width = max([len(label) for label in labels], default=0)
+    prefixes = [f'[{label:<{width}}] ' for label in labels]
+    output_lock = Lock()
+
+    def __forward(pipe: IO[bytes], target: IO[str], prefix: str) -> None:
+        for line in iter(pipe.readline, b''):
+            with output_lock:
+                target.write(prefix + line.decode('utf-8', 'replace')
+                             .rstrip('\n') + '\n')
+                target.flush()
+        pipe.close()
+
+    def __run(process: Popen, index: int) -> Tuple[str, str, bool]:
+        forwarders = [
+            Thread(target=__forward, args=(pipe, target, prefixes[index]))
+            for pipe, target in [(process.stdout, sys.stdout),
+                                 (process.stderr, sys.stderr)]
+        ]
+        for forwarder in forwarders:
+            forwarder.start()
+        timed_out = __wait_or_kill(process, timeout)
+        for forwarder in forwarders:
+            forwarder.join()
+        return '', '', timed_out
+    return __run_many(cmdlines, dry_run, verbose, max_workers, timeout, __run)
+
+
+def run_many_and_get_output(
+    cmdlines: List[Cmdline],
+    dry_run: bool = False,
+    verbose: bool = False,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> CommandResults:
+    """Call several non-interactive shells in parallel and collect output.
+
+    A command exceeding ``timeout`` seconds is killed and the output it
+    produced so far is returned.
+    """
+    def __run(process: Popen, index: int) -> Tuple[str, str, bool]:
+        timed_out = False
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except TimeoutExpired:
+            __kill_group(process, SIGKILL)
+            stdout, stderr = process.communicate()
+            timed_out = True
+        return stdout.decode('utf-8'), stderr.decode('utf-8'), timed_out
+    return __run_many(cmdlines, dry_run, verbose, max_workers, timeout, __run)
+
+
+def __run_many(
+    cmdlines: List[Cmdline],
+    dry_run: bool,
+    verbose: bool,
+    max_workers: Optional[int],
+    timeout: Optional[float],
+    run_process: Callable[[Popen, int], Tuple[str, str, bool]]
+) -> CommandResults:
+    if dry_run or verbose:
+        for cmdline in cmdlines:
+            print(f'$: {cmdline}')
+    if dry_run:
+        return CommandResults([
+            CommandResult(cmdline, 0) for cmdline in cmdlines])
+    processes: Set[Popen] = set()
+    processes_lock = Lock()
+
+    def __run(index: int) -> CommandResult:
+        start = perf_counter()
+        # Own process group to stop children of the shell as well
+        popen_args, popen_kwargs = resolve_cmdline(cmdlines[index])
+        process = Popen(popen_args, stdin=DEVNULL, stdout=PIPE, stderr=PIPE,
+                        start_new_session=True, **popen_kwargs)
+        with processes_lock:
+            processes.add(process)
+        try:
+            stdout, stderr, timed_out = run_process(process, index)
+        finally:
+            with processes_lock:
+                processes.discard(process)
+        return CommandResult(
+            cmdlines[index], process.returncode, stdout, stderr,
+            perf_counter() - start, timed_out)
+
+    from concurrent.futures import ThreadPoolExecutor  # Only used here
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(__run, index)
+                   for index in range(len(cmdlines))]
+        try:
+            return CommandResults([future.result() for future in futures])
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            with processes_lock:
+                for process in processes:
+                    __kill_group(process, SIGTERM)
+            raise
+
+
+def __wait_or_kill(process: Popen, timeout: Optional[float]) -> bool:
+    try:
+        process.wait(timeout=timeout)
+    except TimeoutExpired:
+        __kill_group(process, SIGKILL)
+        process.wait()
+        return True
+    return False
+
+
+def __kill_group(process: Popen, signum: int) -> None:
+    try:
+        killpg(process.pid, signum)
+    except ProcessLookupError:
+        pass  # Already gone
+
+
+def __get_cached_output(
+    cache_key: str,
+    disk: bool
+) -> Optional[Tuple[str, str]]:
+    with _OUTPUT_CACHE_LOCK:
+        entry = _OUTPUT_CACHE.get(cache_key, None)
+        if entry and entry[0] > time():
+            _OUTPUT_CACHE.move_to_end(cache_key)
+            OUTPUT_CACHE_STATS['hits'] += 1
+            count('sho cache hits')
+            return entry[1]
+        _OUTPUT_CACHE.pop(cache_key, None)
+    if disk:
+        from pype.util.cache import get_cache
+        disk_entry = get_cache('sho').get(cache_key)
+        if disk_entry is not None:
+            expires, output = disk_entry
+            with _OUTPUT_CACHE_LOCK:
+                OUTPUT_CACHE_STATS['disk hits'] += 1
+                __put_in_memory(cache_key, expires, output)
+            count('sho cache disk hits')
+            return output
+    with _OUTPUT_CACHE_LOCK:
+        OUTPUT_CACHE_STATS['misses'] += 1
+    count('sho cache misses')
+    return None
+
+
+def __put_cached_output(
+    cache_key: str,
+    output: Tuple[str, str],
+    ttl: float,
+    disk: bool
+) -> None:
+    expires = time() + ttl
+    with _OUTPUT_CACHE_LOCK:
+        __put_in_memory(cache_key, expires, output)
+    if disk:
+        from pype.util.cache import get_cache
+        get_cache('sho').put(cache_key, (expires, output), ttl)
+
+
+def __put_in_memory(
+    cache_key: str,
+    expires: float,
+    output: Tuple[str, str]
+) -> None:
+    _OUTPUT_CACHE[cache_key] = (expires, output)
+    _OUTPUT_CACHE.move_to_end(cache_key)
+    while len(_OUTPUT_CACHE) > OUTPUT_CACHE_SIZE:
+        _OUTPUT_CACHE.popitem(last=False)
+
+
+@lru_cache(maxsize=256)
+def __which(command: str, search_path: Optional[str]) -> Optional[str]:
+    if '/' in command:
+        return command  # Relative to the working directory of the child
+    return which(command, path=search_path)
+
+
+def __get_label(cmdline: Cmdline, max_length: int = 30) -> str:
+    label = cmdline if isinstance(cmdline, str) else ' '.join(cmdline)
+    return label if len(label) <= max_length else (
+        label[:max_length - 3] + '...')
 
 
 def open_with_default(filepath: str) -> None:
@@ -64,3 +544,81 @@ def open_with_default(filepath: str) -> None:
 def resolve_path(relative_path: str) -> str:
     """Resolve path including home folder expanding."""
     return path.abspath(path.expanduser(relative_path))
+
+
+@contextmanager
+def atomic_write(
+    filepath: str,
+    mode: str = 'wb',
+    durable: bool = False
+) -> Iterator[IO[Any]]:
+    """Write a file via a temporary file replacing it on success.
+
+    The temporary file is created next to the target, so that readers see
+    either the old or the complete new content. The mode of an existing
+    file is kept. If ``durable`` is set, the content is synced to disk
+    before replacing the file. On errors the temporary file is removed.
+    """
+    from tempfile import NamedTemporaryFile  # Only required for writing
+    tmp_handle = NamedTemporaryFile(
+        mode, dir=path.dirname(filepath),
+        prefix='.' + path.basename(filepath), delete=False)
+    try:
+        with tmp_handle:
+            yield tmp_handle
+            if durable:
+                tmp_handle.flush()
+                fsync(tmp_handle.fileno())
+        try:
+            chmod(tmp_handle.name, stat(filepath).st_mode)
+        except FileNotFoundError:
+            pass
+        replace(tmp_handle.name, filepath)
+    except BaseException:  # noqa: B902
+        try:
+            remove(tmp_handle.name)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(filepath: str, content: str) -> bool:
+    """Write a text file unless it already has the given content.
+
+    Contents are compared by hash, so unchanged files keep their
+    modification time. Returns True if the file was written.
+    """
+    encoded = content.encode('utf-8')
+    try:
+        with open(filepath, 'rb') as file_handle:
+            if sha256(file_handle.read()).digest() == sha256(
+                    encoded).digest():
+                return False
+    except FileNotFoundError:
+        pass
+    with atomic_write(filepath) as file_handle:
+        file_handle.write(encoded)
+    return True
+
+
+def load_structured_file(filepath: str) -> Any:
+    """Load a JSON file or, if PyYAML is installed, a YAML file."""
+    try:
+        with open(filepath, 'r') as file_handle:
+            content = file_handle.read()
+    except OSError as ex:
+        raise PypeException(f'Could not read {filepath}: {ex}')
+    if path.splitext(filepath)[1].lower() in ['.yml', '.yaml']:
+        try:
+            import yaml
+        except ImportError:
+            raise PypeException(
+                f'Could not read {filepath}: Install PyYAML for YAML support.')
+        try:
+            return yaml.safe_load(content)
+        except yaml.YAMLError as ex:
+            raise PypeException(f'Invalid YAML file {filepath}: {ex}')
+    try:
+        return loads(content)
+    except JSONDecodeError as ex:
+        raise PypeException(f'Invalid JSON file {filepath}: {ex}')
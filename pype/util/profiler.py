@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Internal profiler to instrument pype's startup.
+
+The profiler is activated on import if pype is called with
+``--profile-startup`` or ``PYPE_BENCHMARK_INIT=1``, in which case an
+aggregated span tree is printed to stderr on exit. If ``PYPE_PROFILE_OUTPUT``
+is set, all spans and counters are written to that file in Chrome's trace
+event format, which can be opened with chrome://tracing or Perfetto.
+"""
+
+import atexit
+import sys
+from os import environ, getpid
+from threading import Lock, get_ident, local
+from time import perf_counter_ns
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+ENV_BENCHMARK_INIT = 'PYPE_BENCHMARK_INIT'
+ENV_PROFILE_OUTPUT = 'PYPE_PROFILE_OUTPUT'
+PROFILE_STARTUP_OPTION = '--profile-startup'
+# Options of pype's root command taking a value, see startup_profile_requested
+ROOT_VALUE_OPTIONS = [
+    '--filter', '--alias-register', '-r', '--alias-unregister', '-u']
+
+SpanPath = Tuple[str, ...]
+
+
+class _NoSpan:
+    """Span used while the profiler is inactive."""
+
+    def __enter__(self) -> None:  # noqa: D105
+        pass
+
+    def __exit__(self, *args: Any) -> None:  # noqa: D105
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class _Span:
+    """Span measuring the time spent in a with-block."""
+
+    def __init__(
+        self,
+        profiler: 'Profiler',
+        name: str,
+        args: Dict[str, Any]
+    ) -> None:  # noqa: D107
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> None:  # noqa: D105
+        self.profiler._enter(self.name, self.args)
+
+    def __exit__(self, *args: Any) -> None:  # noqa: D105
+        self.profiler._exit()
+
+
+class Profiler:
+    """Collector of nested timing spans and counters."""
+
+    def __init__(self) -> None:
+        """Create an inactive profiler."""
+        self.active = False
+        self.counters: Dict[str, int] = {}
+        # Spans as [path, start_ns, end_ns, args, thread] in order of entering
+        self.spans: List[list] = []
+        # Stacks of open spans are kept per thread
+        self.__local = local()
+        self.__lock = Lock()
+        self.__start_ns = 0
+        self.__start_modules = 0
+        self.__print_report = False
+        self.__trace_file: Optional[str] = None
+
+    def activate(
+        self,
+        print_report: bool = False,
+        trace_file: Optional[str] = None
+    ) -> None:
+        """Start collecting and report on interpreter exit."""
+        if not self.active:
+            self.__start_ns = perf_counter_ns()
+            self.__start_modules = len(sys.modules)
+            atexit.register(self.finish)
+        self.active = True
+        self.__print_report = self.__print_report or print_report
+        self.__trace_file = trace_file or self.__trace_file
+
+    def span(self, name: str, **args: Any) -> ContextManager[None]:
+        """Measure the time spent in a with-block."""
+        if not self.active:
+            return NO_SPAN
+        return _Span(self, name, args)
+
+    def count(self, key: str, value: int = 1) -> None:
+        """Increase the given counter."""
+        if not self.active:
+            return
+        with self.__lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def aggregate(self) -> Dict[SpanPath, List[int]]:
+        """Sum up calls, total and self time of spans with the same path."""
+        stats: Dict[SpanPath, List[int]] = {}
+        for span_path, start_ns, end_ns, _, _ in self.spans:
+            if end_ns is None:
+                continue  # Still open
+            stat = stats.setdefault(span_path, [0, 0, 0])
+            stat[0] += 1
+            stat[1] += end_ns - start_ns
+            stat[2] += end_ns - start_ns
+            if len(span_path) > 1 and span_path[:-1] in stats:
+                stats[span_path[:-1]][2] -= end_ns - start_ns
+        return stats
+
+    def format_report(self) -> str:
+        """Format spans as an aggregated tree along with all counters."""
+        stats = self.aggregate()
+        children: Dict[SpanPath, List[SpanPath]] = {}
+        for span_path in stats.keys():
+            children.setdefault(span_path[:-1], []).append(span_path)
+        total_ms = (perf_counter_ns() - self.__start_ns) / 1e6
+        lines = [
+            f'PYPE STARTUP PROFILE ({total_ms:.3f} ms in total)',
+            f'{"TOTAL MS":>10} {"SELF MS":>10} {"CALLS":>6}  SPAN'
+        ]
+
+        def __add_lines(span_path: SpanPath) -> None:
+            calls, total_ns, self_ns = stats[span_path]
+            indent = '  ' * (len(span_path) - 1)
+            lines.append(f'{total_ns / 1e6:>10.3f} {self_ns / 1e6:>10.3f} '
+                         + f'{calls:>6}  {indent}{span_path[-1]}')
+            for child in children.get(span_path, []):
+                __add_lines(child)
+        for root in children.get((), []):
+            __add_lines(root)
+        lines.append(f'{"VALUE":>10} {"":>10} {"":>6}  COUNTER')
+        for key, value in sorted(self.__get_counters().items()):
+            lines.append(f'{value:>10} {"":>10} {"":>6}  {key}')
+        return '\n'.join(lines)
+
+    def write_trace(self, filepath: str) -> None:
+        """Write spans and counters in Chrome's trace event format."""
+        from json import dump
+        pid = getpid()
+        events: List[Dict[str, Any]] = [{
+            'name': span_path[-1],
+            'cat': 'pype',
+            'ph': 'X',
+            'ts': (start_ns - self.__start_ns) / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': pid,
+            'tid': tid,
+            'args': args
+        } for span_path, start_ns, end_ns, args, tid in self.spans
+            if end_ns is not None]
+        end_ts = (perf_counter_ns() - self.__start_ns) / 1000
+        events.extend([{
+            'name': key,
+            'cat': 'pype',
+            'ph': 'C',
+            'ts': end_ts,
+            'pid': pid,
+            'args': {'value': value}
+        } for key, value in sorted(self.__get_counters().items())])
+        with open(filepath, 'w+') as trace_file:
+            dump({
+                'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'counters': self.__get_counters()}
+            }, trace_file)
+
+    def finish(self) -> None:
+        """Print report and write trace file if requested."""
+        if not self.active:
+            return
+        if self.__print_report:
+            print(self.format_report(), file=sys.stderr)
+        if self.__trace_file:
+            try:
+                self.write_trace(self.__trace_file)
+            except OSError as ex:
+                print(f'Could not write profile: {ex}', file=sys.stderr)
+        self.active = False
+
+    def _enter(self, name: str, args: Dict[str, Any]) -> None:
+        stack = self.__get_stack()
+        parent_path = stack[-1][0] if stack else ()
+        record = [parent_path + (name,), perf_counter_ns(), None, args,
+                  get_ident()]
+        with self.__lock:
+            self.spans.append(record)
+        stack.append(record)
+
+    def _exit(self) -> None:
+        self.__get_stack().pop()[2] = perf_counter_ns()
+
+    def __get_stack(self) -> List[list]:
+        stack = getattr(self.__local, 'stack', None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    def __get_counters(self) -> Dict[str, int]:
+        counters = dict(self.counters)
+        counters['modules imported'] = len(sys.modules) - self.__start_modules
+        return counters
+
+
+def span(name: str, **args: Any) -> ContextManager[None]:
+    """Measure the time spent in a with-block with the global profiler."""
+    return PROFILER.span(name, **args)
+
+
+def count(key: str, value: int = 1) -> None:
+    """Increase a counter of the global profiler."""
+    PROFILER.count(key, value)
+
+
+def startup_profile_requested(argv: List[str]) -> bool:
+    """Check if the startup profile option precedes the first command.
+
+    Runs before the command line is parsed, so values of the root command's
+    options are skipped based on ``ROOT_VALUE_OPTIONS``.
+    """
+    skip_value = False
+    for arg in argv[1:]:
+        if skip_value:
+            skip_value = False
+            continue
+        if arg == PROFILE_STARTUP_OPTION:
+            return True
+        if not arg.startswith('-'):
+            return False
+        if arg.startswith('--'):
+            skip_value = arg in ROOT_VALUE_OPTIONS
+            continue
+        # Group of short options, the last one taking a value may be joined
+        for index, short_option in enumerate(arg[1:]):
+            if '-' + short_option in ROOT_VALUE_OPTIONS:
+                skip_value = index == len(arg) - 2
+                break
+    return False
+
+
+PROFILER = Profiler()
+
+__print_report = (startup_profile_requested(sys.argv)
+                  or environ.get(ENV_BENCHMARK_INIT, '0') == '1')
+if __print_report or environ.get(ENV_PROFILE_OUTPUT, None):
+    PROFILER.activate(__print_report, environ.get(ENV_PROFILE_OUTPUT, None))
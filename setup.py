@@ -14,7 +14,10 @@ with open(path.join(path.abspath(path.dirname(__file__)), 'README.md'),
 # Configure shell command
 custom_shell_command = environ.get('PYPE_CUSTOM_SHELL_COMMAND', None)
 shell_command = custom_shell_command if custom_shell_command else 'pype'
-console_scripts = [f'{shell_command}=pype.__main__:main']
+console_scripts = [
+    f'{shell_command}=pype.__main__:main',
+    f'{shell_command}-client=pype.client:main'
+]
 
 setup(
     # Basic project information
@@ -40,7 +43,7 @@ setup(
         'Programming Language :: Python :: 3.9'
     ],
     # Package configuration
-    packages=find_packages(exclude=('tests',)),
+    packages=find_packages(exclude=('tests', 'benchmarks')),
     include_package_data=True,
     python_requires='>=3.7',
     install_requires=[
@@ -4,6 +4,8 @@
 import contextlib
 import importlib
 import shutil
+import subprocess
+import sys
 from collections import namedtuple
 from dataclasses import asdict
 from datetime import datetime
@@ -13,7 +15,7 @@ from os import environ, mkdir, path
 from random import choice
 from re import sub
 from string import ascii_lowercase
-from typing import Generator, Optional, Union, cast
+from typing import Any, Dict, Generator, List, Optional, Union, cast
 
 from click.core import BaseCommand
 from click.testing import CliRunner
@@ -33,6 +35,10 @@ VALID_CONFIG = config_model.Configuration(
     )]
 )
 
+# Python code to run pype in a subprocess, see run_pype_subprocess
+PYPE_MAIN_CODE = ('import sys; sys.argv[0] = "pype"; '
+                  'from pype.__main__ import main; main()')
+
 RunnerEnvironment = namedtuple(
     'RunnerEnvironment',
     'result runner reload_and_get_main test_env'
@@ -157,3 +163,41 @@ def create_runner(
 def reload_config(test_run: RunnerEnvironment) -> dict:
     """Load configuration of test as JSON-object."""
     return load(open(test_run.test_env.config_file, 'r'))
+
+
+def create_plugin(
+    test_env: TestEnvironment,
+    name: str,
+    pypes: Dict[str, str]
+) -> str:
+    """Create a plugin with the given pype sources and register it."""
+    plugin_dir = path.join(test_env.config_dir, name)
+    mkdir(plugin_dir)
+    with open(path.join(plugin_dir, '__init__.py'), 'w+') as init:
+        init.write(f'"""Plugin {name}."""\n')
+    for pype_name, source in pypes.items():
+        with open(path.join(plugin_dir, pype_name + '.py'), 'w+') as pype:
+            pype.write(source)
+    config = load(open(test_env.config_file, 'r'))
+    config['plugins'].append(asdict(config_model.ConfigurationPlugin(
+        name=name, path=test_env.config_dir)))
+    dump(config, open(test_env.config_file, 'w'))
+    return plugin_dir
+
+
+def run_pype_subprocess(
+    test_env: TestEnvironment,
+    arguments: List[str],
+    code: str = PYPE_MAIN_CODE,
+    python_options: Optional[List[str]] = None,
+    **kwargs: Any
+) -> subprocess.CompletedProcess:
+    """Run pype in a fresh interpreter with the test configuration."""
+    env = dict(environ)
+    env.update(kwargs.pop('env', {}))
+    env[ENV_CONFIG_FOLDER] = test_env.config_dir
+    env['PYTHONPATH'] = path.dirname(path.dirname(path.abspath(__file__)))
+    return subprocess.run(
+        [sys.executable] + (python_options or []) + ['-c', code] + arguments,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        timeout=60, **kwargs)
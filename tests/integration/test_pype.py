@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """$ pype."""
 
+from json import loads
+
 from pype.config import __doc__ as config_doc
 from tests import invoke_runner
 
@@ -18,6 +20,30 @@ class TestCLIPype:  # noqa: D101
             assert test_run.result.exit_code == 0
             assert config_doc in test_run.result.output
 
+    def test_list_pypes_filtered(self) -> None:  # noqa: D102
+        test_run = invoke_runner(
+            '%MAIN%', ['-l', '--filter', 'pype.config shell-*', '--tsv'])
+        assert test_run.result.exit_code == 0
+        lines = test_run.result.output.strip().split('\n')
+        assert [line.split('\t')[:2] for line in lines] == [
+            ['pype.config', 'shell-install'],
+            ['pype.config', 'shell-uninstall']]
+        test_run = invoke_runner(
+            '%MAIN%', ['-l', '--filter', '^pype.config (cache|logger)$',
+                       '--regex', '--json'])
+        assert test_run.result.exit_code == 0
+        assert [entry['pype'] for entry in loads(test_run.result.output)] == [
+            'cache', 'logger']
+        test_run = invoke_runner('%MAIN%', ['-l', '--filter', 'nothing*'])
+        assert test_run.result.exit_code == 0
+        assert not test_run.result.output.strip()
+
+    def test_list_pypes_invalid_options(self) -> None:  # noqa: D102
+        for args in [['--json'], ['-l', '--json', '--tsv'], ['-l', '--regex'],
+                     ['-l', '--filter', '(', '--regex']]:
+            test_run = invoke_runner('%MAIN%', args)
+            assert 'PLUGIN:' not in test_run.result.output
+
     def test_help_page(self) -> None:  # noqa: D102
         for opt in ['-h', '--help']:
             test_run = invoke_runner('%MAIN%', [opt])
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """$ pype --aliases."""
 
+from json import dump
+from os import path
+
+from pype.config import alias_import
 from tests import create_runner, create_test_env, invoke_runner, reload_config
 
 
@@ -39,3 +43,30 @@ class TestCLIPypeAliases:  # noqa: D101
             assert 'Unregistered alias: myalias' in result.output
             result_configuration = reload_config(test_run)
             assert len(result_configuration['aliases']) == 0
+
+    def test_print_many_aliases(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = path.join(test_env.config_dir, 'aliases.json')
+            dump([{'alias': f'a{i:04d}', 'command': f'pype p x{i}'}
+                  for i in range(2000)], open(alias_file, 'w+'))
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 0
+            result = test_run.runner.invoke(
+                test_run.reload_and_get_main, ['--aliases'])
+            assert result.exit_code == 0
+            lines = result.output.strip().split('\n')
+            assert len(lines) == 2000
+            assert 'a0000' in lines[0] and 'x0\'' in lines[0]
+            assert 'a1999' in lines[-1]
+
+    def test_register_invalid_alias_name(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            test_run = create_runner(
+                test_env,
+                '%MAIN%',
+                ['--alias-register', 'my$alias', 'pype.config',
+                 'plugin-register'])
+            assert test_run.result.exit_code == 1
+            assert 'Invalid alias name' in test_run.result.output
+            assert reload_config(test_run)['aliases'] == []
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""$ pype <plugin> <pype> import footprint."""
+
+from os import mkdir, path, utime
+from re import escape, match
+from typing import Set
+
+from tests import create_plugin, create_test_env, run_pype_subprocess
+
+# Modules that must not be imported when dispatching a pype
+HEAVY_MODULES = ['tabulate', 'jsonschema', 'dacite', 'concurrent']
+
+PYPE_SOURCE = '''"""Import test pype."""
+import click
+
+
+@click.command()
+def main() -> None:
+    print('dispatched')
+'''
+
+
+SIDE_EFFECT_SOURCE = '''"""Side effect pype."""
+print('SIDE EFFECT other imported')
+'''
+
+
+def _imported_modules(importtime_output: str) -> Set[str]:
+    modules = set()
+    for line in importtime_output.split('\n'):
+        import_line = match(r'import time:[^|]+\|[^|]+\|\s*(\S+)', line)
+        if import_line:
+            modules.add(import_line.group(1))
+    return modules
+
+
+def _read_completion(config_dir: str, case: str) -> str:
+    """Get the words offered for a case of the bash completion script."""
+    with open(path.join(config_dir, 'complete-bsh')) as complete_file:
+        for line in complete_file:
+            words = match(
+                r'\s*"' + escape(case) + r'"[|)].*-W "([^"]*)"',
+                line)
+            if words:
+                return words.group(1)
+    return ''
+
+
+class TestCLIPypeImports:  # noqa: D101
+
+    def test_dispatch_skips_heavy_modules(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            create_plugin(test_env, 'impplugin', {'probe': PYPE_SOURCE})
+            # First call fills caches, second one is the regular case
+            for _ in range(2):
+                result = run_pype_subprocess(
+                    test_env, ['impplugin', 'probe'],
+                    python_options=['-X', 'importtime'])
+                assert result.returncode == 0
+                assert result.stdout.decode('utf-8') == 'dispatched\n'
+            modules = _imported_modules(result.stderr.decode('utf-8'))
+            assert 'pype.__main__' in modules
+            assert not [
+                module for module in modules
+                if module.split('.')[0] in HEAVY_MODULES
+            ]
+
+    def test_dispatch_skips_completion(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            home_dir = path.join(test_env.config_dir, 'home')
+            mkdir(home_dir)
+            env = {'HOME': home_dir}
+            plugin_dir = create_plugin(test_env, 'complplugin', {
+                'probe': PYPE_SOURCE,
+                'other': SIDE_EFFECT_SOURCE,
+                'broken': 'raise ValueError()\n'
+            })
+            result = run_pype_subprocess(
+                test_env, ['pype.config', 'shell-install'], env=env)
+            assert result.returncode == 0
+            other_file = path.join(plugin_dir, 'other.py')
+            utime(other_file, ns=(1, 1))
+            result = run_pype_subprocess(
+                test_env, ['complplugin', 'probe'], env=env)
+            assert result.returncode == 0
+            assert result.stdout.decode('utf-8') == 'dispatched\n'
+            assert 'SIDE EFFECT' not in result.stderr.decode('utf-8')
+            # New pypes are added to completion without being imported
+            with open(path.join(plugin_dir, 'new_pype.py'), 'w') as new_pype:
+                new_pype.write(SIDE_EFFECT_SOURCE)
+            result = run_pype_subprocess(
+                test_env, ['complplugin', 'probe'], env=env)
+            assert result.stdout.decode('utf-8') == 'dispatched\n'
+            assert _read_completion(
+                test_env.config_dir, 'complplugin'
+            ).startswith('broken new-pype other probe -')
+
+    def test_plugin_register_refreshes_completion(  # noqa: D102
+        self
+    ) -> None:
+        with create_test_env() as test_env:
+            home_dir = path.join(test_env.config_dir, 'home')
+            mkdir(home_dir)
+            env = {'HOME': home_dir}
+            result = run_pype_subprocess(
+                test_env, ['pype.config', 'shell-install'], env=env)
+            assert result.returncode == 0
+            result = run_pype_subprocess(test_env, [
+                'pype.config', 'plugin-register', '--name', 'newplugin',
+                '--path', test_env.config_dir, '--create'], env=env)
+            assert result.returncode == 0
+            assert _read_completion(
+                test_env.config_dir, 'pype.config plugin-unregister:--name'
+            ) == 'newplugin'
+            result = run_pype_subprocess(
+                test_env, ['pype.config', 'shell-install'], env=env)
+            assert result.returncode == 0
+            assert _read_completion(
+                test_env.config_dir, 'pype.config plugin-bundle:--name'
+            ) == 'newplugin'
+            result = run_pype_subprocess(test_env, [
+                'pype.config', 'plugin-unregister', '--name', 'newplugin'],
+                env=env)
+            assert result.returncode == 0
+            assert _read_completion(
+                test_env.config_dir, 'pype.config plugin-unregister:--name'
+            ) == ''
+            assert _read_completion(test_env.config_dir, '').startswith(
+                'pype.config -')
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""$ pype --profile-startup."""
+
+from json import load
+from os import path
+
+from tests import create_test_env, run_pype_subprocess
+
+
+class TestCLIPypeProfile:  # noqa: D101
+
+    def test_profile_startup(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            result = run_pype_subprocess(
+                test_env,
+                ['--profile-startup', 'pype.config', 'logger', 'print-config'])
+            assert result.returncode == 0
+            report = result.stderr.decode('utf-8')
+            assert 'PYPE STARTUP PROFILE' in report
+            for span in [
+                'PypeCore.__init__', 'PypeConfigHandler.__reload',
+                'Plugin.__init_internal', 'Pype.__init__',
+                'PypeCLI.get_command'
+            ]:
+                assert span in report
+            for counter in ['files scanned', 'modules imported',
+                            'config reads']:
+                assert counter in report
+
+    def test_profile_startup_after_option_value(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            result = run_pype_subprocess(
+                test_env, ['-l', '--filter', 'pype.config *',
+                           '--profile-startup'])
+            assert result.returncode == 0
+            assert 'PYPE STARTUP PROFILE' in result.stderr.decode('utf-8')
+
+    def test_profile_output(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            trace_file = path.join(test_env.config_dir, 'trace.json')
+            result = run_pype_subprocess(
+                test_env, ['pype.config', 'logger', 'print-config'],
+                env={'PYPE_PROFILE_OUTPUT': trace_file})
+            assert result.returncode == 0
+            assert not result.stderr
+            names = [event['name']
+                     for event in load(open(trace_file))['traceEvents']]
+            assert 'PypeCore.__init__' in names
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""$ pype --server / pype-client."""
+
+import socket
+import subprocess
+import sys
+import time
+from array import array
+from json import dumps
+from os import environ, path
+from struct import pack
+from typing import Generator
+
+import pytest
+
+from pype.constants import ENV_CONFIG_FOLDER, SERVER_SOCKET_FILENAME
+from tests import PYPE_MAIN_CODE
+from tests import TestEnvironment as Env
+from tests import create_plugin, create_test_env, run_pype_subprocess
+
+PYPE_CLIENT_CODE = ('import sys; sys.argv[0] = "pype"; '
+                    'from pype.client import main; main()')
+PYPE_SOURCE = '''"""Server test pype."""
+import os
+import click
+
+
+@click.command()
+def main() -> None:
+    print(os.getcwd())
+    print(os.environ.get('SERVER_TEST_VAR'))
+    exit(3)
+'''
+
+
+class TestCLIPypeServer:  # noqa: D101
+
+    @pytest.fixture()
+    def server_env(self) -> Generator[Env, None, None]:  # noqa: D102
+        with create_test_env() as test_env:
+            create_plugin(test_env, 'srvplugin', {'probe': PYPE_SOURCE})
+            env = dict(environ)
+            env[ENV_CONFIG_FOLDER] = test_env.config_dir
+            env['PYTHONPATH'] = path.dirname(path.dirname(path.dirname(
+                path.abspath(__file__))))
+            server = subprocess.Popen(
+                [sys.executable, '-c', PYPE_MAIN_CODE, '--server'], env=env)
+            socket_path = path.join(
+                test_env.config_dir, SERVER_SOCKET_FILENAME)
+            for _ in range(100):
+                if path.exists(socket_path):
+                    break
+                time.sleep(0.1)
+            try:
+                yield test_env
+            finally:
+                server.terminate()
+                server.wait()
+            assert not path.exists(socket_path)
+
+    def test_forward_call(self, server_env: Env) -> None:  # noqa: D102
+        result = run_pype_subprocess(
+            server_env, ['srvplugin', 'probe'], code=PYPE_CLIENT_CODE,
+            cwd=server_env.config_dir, env={'SERVER_TEST_VAR': 'forwarded'})
+        assert result.returncode == 3
+        assert result.stdout.decode('utf-8').split('\n')[:2] == [
+            server_env.config_dir, 'forwarded']
+
+    def test_usage_error(self, server_env: Env) -> None:  # noqa: D102
+        result = run_pype_subprocess(
+            server_env, ['--alias-unregister', 'x'], code=PYPE_CLIENT_CODE)
+        assert result.returncode == 2
+        assert b'Usage: pype' in result.stderr
+
+    def test_invalid_request(self, server_env: Env) -> None:  # noqa: D102
+        socket_path = path.join(server_env.config_dir, SERVER_SOCKET_FILENAME)
+        for request, expected in [({'argv': ['pype']}, ''), ({
+            'argv': ['pype'], 'env': {}, 'cwd': '/not/there'
+        }, 'EXIT 1\n')]:
+            payload = dumps(request).encode('utf-8')
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(socket_path)
+            client.sendmsg([pack('!I', len(payload))], [(
+                socket.SOL_SOCKET, socket.SCM_RIGHTS, array('i', [0, 1, 2])
+            )])
+            client.sendall(payload)
+            response = client.makefile('rb').read().decode('utf-8')
+            client.close()
+            assert response.endswith(expected)
+        # Server is still reachable
+        result = run_pype_subprocess(
+            server_env, ['srvplugin', 'probe'], code=PYPE_CLIENT_CODE,
+            env={'SERVER_TEST_VAR': 'forwarded'})
+        assert result.returncode == 3
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""$ pype pype.config alias-import."""
+
+import subprocess
+from json import dump
+from os import path
+
+from pype.config import alias_import
+from tests import create_runner, create_test_env, reload_config
+
+
+def _write_aliases(config_dir: str, aliases: list) -> str:
+    alias_file = path.join(config_dir, 'aliases.json')
+    dump(aliases, open(alias_file, 'w+'))
+    return alias_file
+
+
+class TestCLIPypeAliasImport:  # noqa: D101
+
+    def test_import_installs_once(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': f'a{i}', 'command': f'pype p{i} x'}
+                for i in range(20)
+            ])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 0
+            output = test_run.result.output
+            assert output.count('Successfully written init-files') == 1
+            assert output.count('Configured alias') == 20
+            aliases = reload_config(test_run)['aliases']
+            assert [alias['alias'] for alias in aliases] == [
+                f'a{i}' for i in range(20)]
+            init_file = open(path.join(
+                test_env.config_dir, 'initfile-bsh'), 'r').read()
+            assert 'alias a19="pype p19 x"' in init_file
+
+    def test_import_skips_registered_aliases(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': 'a1', 'command': 'pype p x'}])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 0
+            result = test_run.runner.invoke(alias_import.main, [alias_file])
+            assert result.exit_code == 0
+            assert 'already registered' in result.output
+            assert 'init-files' not in result.output
+            assert len(reload_config(test_run)['aliases']) == 1
+
+    def test_invalid_import_changes_nothing(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': 'a1', 'command': 'pype p x'},
+                {'alias': 'a2'}
+            ])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 1
+            assert 'Entry 1 needs' in test_run.result.output
+            assert reload_config(test_run)['aliases'] == []
+
+    def test_invalid_alias_name_is_rejected(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': 'bad alias', 'command': 'pype p x'}])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 1
+            assert 'Invalid alias name' in test_run.result.output
+            assert reload_config(test_run)['aliases'] == []
+
+    def test_command_is_escaped(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            command = 'echo "$HOME" `id` \\'
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': 'a1', 'command': command}])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 0
+            alias_line = [
+                line for line in open(path.join(
+                    test_env.config_dir, 'initfile-bsh'), 'r')
+                if 'alias a1=' in line][0]
+            result = subprocess.run(
+                ['bash', '-c', alias_line + '\nalias a1'],
+                stdout=subprocess.PIPE)
+            assert result.stdout.decode('utf-8') == (
+                "alias a1='" + command + "'\n")
+
+    def test_multiline_command_is_rejected(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            alias_file = _write_aliases(test_env.config_dir, [
+                {'alias': 'a1', 'command': 'pype p x\nrm -rf ~'}])
+            test_run = create_runner(
+                test_env, alias_import.main, [alias_file])
+            assert test_run.result.exit_code == 1
+            assert 'single line' in test_run.result.output
+            assert reload_config(test_run)['aliases'] == []
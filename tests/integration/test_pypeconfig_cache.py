@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""$ pype pype.config cache."""
+
+from pype.config import cache
+from pype.util.cache import get_cache
+from tests import create_runner, create_test_env
+
+
+class TestCLIPypeCache:  # noqa: D101
+
+    def test_list_prune_clear(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            test_run = create_runner(test_env, cache.main, ['list'])
+            assert 'No cache entries found' in test_run.result.output
+            get_cache('commands').put('some-key', 1)
+            get_cache('commands').put('old-key', 2, ttl=0)
+            get_cache('other').put('other-key', 3)
+            result = test_run.runner.invoke(cache.main, ['list'])
+            assert result.exit_code == 0
+            assert 'some-key' in result.output
+            assert 'expired' in result.output
+            result = test_run.runner.invoke(cache.main, ['prune'])
+            assert 'Removed 1 expired' in result.output
+            result = test_run.runner.invoke(cache.main, ['clear', 'other'])
+            assert 'Removed 1 cache entries' in result.output
+            result = test_run.runner.invoke(cache.main, ['list'])
+            assert 'some-key' in result.output
+            assert 'other-key' not in result.output
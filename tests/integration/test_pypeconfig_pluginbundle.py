@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""$ pype pype.config plugin-bundle."""
+
+import importlib
+import sys
+from os import path, utime
+
+from pype.config import plugin_bundle
+from pype.config_model import ConfigurationPlugin
+from pype.type_plugin import Plugin
+from pype.util.cli import fname_to_name
+from tests import create_plugin, create_runner, create_test_env
+
+PYPE_SOURCE = '''"""Bundled pype."""
+import click
+from pype import fname_to_name
+from bundled_test_plugin.__commons__ import GREETING
+
+
+@click.command(name=fname_to_name(__file__), help=__doc__)
+def main() -> None:
+    print(GREETING)
+'''
+
+
+class TestCLIPypePluginBundle:  # noqa: D101
+
+    def test_bundle_used_until_sources_change(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            name = 'bundled_test_plugin'
+            plugin_dir = create_plugin(test_env, name, {
+                'bundled_pype': PYPE_SOURCE,
+                '__commons__': 'GREETING = "hello"\n'
+            })
+            config_plugin = ConfigurationPlugin(name, test_env.config_dir)
+            test_run = create_runner(test_env, plugin_bundle.main, ['-h'])
+            # Reload to activate current test_env
+            importlib.reload(plugin_bundle)
+            result = test_run.runner.invoke(
+                plugin_bundle.main, ['--name', name])
+            assert result.exit_code == 0
+            assert 'with 1 pypes' in result.output
+            bundle_path = path.join(
+                test_env.config_dir, 'bundles', name + '.pyz')
+            plugin = Plugin(config_plugin, test_env.config_file)
+            assert plugin.bundle
+            assert plugin.doc == f'Plugin {name}.'
+            assert plugin.command_names == ['bundled-pype']
+            pype = plugin.get_pype('bundled_pype')
+            assert pype and pype.doc == 'Bundled pype.'
+            assert pype.abspath == path.join(plugin_dir, 'bundled_pype.py')
+            try:
+                module = __import__(f'{name}.bundled_pype', {}, {}, ['main'])
+                assert str(module.__file__).startswith(bundle_path)
+                assert module.main.name == 'bundled-pype'
+            finally:
+                for module_name in list(sys.modules.keys()):
+                    if module_name.startswith(name):
+                        del sys.modules[module_name]
+            # Changed sources are loaded from source again
+            utime(path.join(plugin_dir, '__commons__.py'), (0, 0))
+            assert not Plugin(config_plugin, test_env.config_file).bundle
+            result = test_run.runner.invoke(
+                plugin_bundle.main, ['--name', name, '--remove'])
+            assert 'Removed bundle' in result.output
+            assert not path.isfile(bundle_path)
+
+    def test_fname_to_name_for_bytecode(self) -> None:  # noqa: D102
+        assert fname_to_name('/a.pyz/plugin/my_pype.pyc') == 'my-pype'
+        assert fname_to_name('/plugin/my_pype.py') == 'my-pype'
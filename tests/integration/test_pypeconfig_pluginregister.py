@@ -2,6 +2,8 @@
 """$ pype pype-config plugin-register/plugin-unregister."""
 
 import importlib
+from json import dump
+from os import mkdir, path
 
 from pype.config import plugin_register, plugin_unregister
 from tests import create_runner, create_test_env, invoke_runner, reload_config
@@ -87,3 +89,52 @@ class TestCLIPypePluginRegister:  # noqa: D101
             result_configuration = reload_config(test_run)
             assert len(result_configuration['plugins']) == 1
             assert result_configuration['plugins'][0]['name'] == 'plug'
+
+    def test_register_from_file(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            plugins = []
+            for name in ['plug1', 'plug2']:
+                mkdir(path.join(test_env.config_dir, name))
+                open(path.join(
+                    test_env.config_dir, name, '__init__.py'), 'w+').close()
+                plugins.append({'name': name, 'path': test_env.config_dir})
+            plugin_file = path.join(test_env.config_dir, 'plugins.json')
+            dump(plugins, open(plugin_file, 'w+'))
+            test_run = create_runner(
+                test_env, plugin_register.main, ['--from', plugin_file])
+            assert test_run.result.exit_code == 0
+            assert [
+                plugin['name'] for plugin in
+                reload_config(test_run)['plugins']
+            ] == ['plug1', 'plug2']
+
+    def test_register_from_file_is_all_or_nothing(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            mkdir(path.join(test_env.config_dir, 'plug1'))
+            open(path.join(
+                test_env.config_dir, 'plug1', '__init__.py'), 'w+').close()
+            plugin_file = path.join(test_env.config_dir, 'plugins.json')
+            dump([
+                {'name': 'plug1', 'path': test_env.config_dir},
+                {'name': 'missing', 'path': test_env.config_dir}
+            ], open(plugin_file, 'w+'))
+            test_run = create_runner(
+                test_env, plugin_register.main, ['--from', plugin_file])
+            assert test_run.result.exit_code == 1
+            assert 'Could not find a python module' in test_run.result.output
+            assert reload_config(test_run)['plugins'] == []
+
+    def test_register_from_file_validates_users(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            mkdir(path.join(test_env.config_dir, 'plug1'))
+            open(path.join(
+                test_env.config_dir, 'plug1', '__init__.py'), 'w+').close()
+            plugin_file = path.join(test_env.config_dir, 'plugins.json')
+            dump([
+                {'name': 'plug1', 'path': test_env.config_dir, 'users': 'bob'}
+            ], open(plugin_file, 'w+'))
+            test_run = create_runner(
+                test_env, plugin_register.main, ['--from', plugin_file])
+            assert test_run.result.exit_code == 1
+            assert 'list of strings as "users"' in test_run.result.output
+            assert reload_config(test_run)['plugins'] == []
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""pype.util.aiotools."""
+
+import asyncio
+from time import time
+from typing import Any, List, Tuple
+
+import pytest
+
+from pype.util.aiotools import (run_and_get_output_async, run_async,
+                                run_interactive_async)
+
+
+class TestAioTools:  # noqa: D101
+
+    def test_output_and_exit_code(self, capfd: Any) -> None:  # noqa: D102
+        async def __main() -> Tuple[Tuple[str, str], int]:
+            return (
+                await run_and_get_output_async(['echo out; echo err >&2']),
+                await run_interactive_async(['echo hi; exit 4'])
+            )
+        assert run_async(__main()) == (('out\n', 'err\n'), 4)
+        assert capfd.readouterr().out == 'hi\n'
+
+    def test_semaphore_limits_concurrency(self) -> None:  # noqa: D102
+        @run_async
+        async def __main(count: int) -> List[Tuple[str, str]]:
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*[
+                run_and_get_output_async(
+                    [f'sleep 0.3; echo {i}'], semaphore=semaphore)
+                for i in range(count)
+            ])
+        start = time()
+        results = __main(4)
+        assert 0.6 <= time() - start < 3
+        assert [stdout for stdout, _ in results] == [
+            f'{i}\n' for i in range(4)]
+
+    def test_cancellation_stops_shells(self) -> None:  # noqa: D102
+        async def __main() -> None:
+            await asyncio.wait_for(asyncio.gather(
+                run_and_get_output_async(['sleep 10; echo late']),
+                run_interactive_async(['exec sleep 10'])
+            ), timeout=0.5)
+        start = time()
+        with pytest.raises(asyncio.TimeoutError):
+            run_async(__main())
+        assert time() - start < 5
+
+    def test_dry_run(self, capfd: Any) -> None:  # noqa: D102
+        async def __main() -> Tuple[Tuple[str, str], int]:
+            return (
+                await run_and_get_output_async(['exit 1'], dry_run=True),
+                await run_interactive_async(['exit 1'], dry_run=True)
+            )
+        assert run_async(__main()) == (('', ''), 0)
+        assert capfd.readouterr().out == "$: ['exit 1']\n$: ['exit 1']\n"
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""benchmarks."""
+
+from json import load
+from os import path
+from tempfile import TemporaryDirectory
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import compare_results, main, summarize
+
+
+class TestBenchmarks:  # noqa: D101
+
+    def test_summarize(self) -> None:  # noqa: D102
+        summary = summarize([float(value) for value in range(100, 0, -1)])
+        assert summary == {
+            'min': 1.0, 'mean': 50.5, 'p50': 50.0, 'p90': 90.0, 'p99': 99.0
+        }
+        assert summarize([3.0])['p99'] == 3.0
+
+    def test_compare_results(self) -> None:  # noqa: D102
+        baseline = {'a': {'p50': 100.0}, 'b': {'p50': 100.0}}
+        _, regressions = compare_results({
+            'a': {'p50': 110.0}, 'b': {'p50': 130.0}, 'c': {'p50': 1.0}
+        }, baseline, 0.2)
+        assert regressions == 1
+
+    def test_run_and_compare(self) -> None:  # noqa: D102
+        with TemporaryDirectory() as tmp_dir:
+            baseline_file = path.join(tmp_dir, 'baseline.json')
+            arguments = ['-p', '1', '-y', '2', '-s', 'small', '-r', '1',
+                         '-w', '0', '-c', 'dispatch', '-c', 'completion']
+            result = CliRunner().invoke(
+                main, arguments + ['--save', baseline_file])
+            assert result.exit_code == 0
+            results = load(open(baseline_file, 'r'))['results']
+            assert sorted(results.keys()) == [
+                '1x2-small/completion', '1x2-small/dispatch']
+            result = CliRunner().invoke(
+                main, arguments + ['--compare', baseline_file, '-t', '100'])
+            assert result.exit_code == 0
+            assert 'baseline p50' in result.output
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""pype.util.cache."""
+
+from os import listdir, path
+from time import sleep
+from typing import Any, List
+
+import click
+
+from pype.util.cache import DiskCache, cached
+from tests import create_runner, create_test_env
+
+
+class TestDiskCache:  # noqa: D101
+
+    def test_get_put_and_expiry(self, tmp_path: Any) -> None:  # noqa: D102
+        cache = DiskCache(str(tmp_path / 'cache'))
+        assert cache.get('key') is None
+        cache.put('key', {'value': 1})
+        cache.put('short', 'lived', ttl=0.1)
+        assert cache.get('key') == {'value': 1}
+        assert cache.get('short') == 'lived'
+        sleep(0.2)
+        assert cache.get('short') is None
+        assert [entry['key'] for entry in cache.entries()] == ['key']
+
+    def test_lru_eviction(self, tmp_path: Any) -> None:  # noqa: D102
+        cache = DiskCache(str(tmp_path), max_entries=2)
+        cache.put('a', 1)
+        sleep(0.05)
+        cache.put('b', 2)
+        sleep(0.05)
+        assert cache.get('a') == 1  # Now more recently used than b
+        sleep(0.05)
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        cache = DiskCache(str(tmp_path), max_bytes=1)
+        cache.put('d', 4)
+        assert len(listdir(str(tmp_path))) == 0
+
+    def test_prune_and_clear(self, tmp_path: Any) -> None:  # noqa: D102
+        cache = DiskCache(str(tmp_path))
+        cache.put('a', 1, ttl=0)
+        cache.put('b', 2)
+        with open(path.join(str(tmp_path), 'x.entry'), 'w+') as broken:
+            broken.write('broken')
+        assert cache.prune() == 2
+        assert cache.get('b') == 2
+        assert cache.clear() == 1
+        assert cache.entries() == []
+
+
+class TestCached:  # noqa: D101
+
+    def test_output_and_exit_code_replayed(self) -> None:  # noqa: D102
+        calls: List[str] = []
+
+        @cached(ttl=60, env=['PYPE_TEST_CACHE'])
+        @click.command()
+        @click.option('--name', default='a')
+        @click.option('--fail', is_flag=True)
+        def main(name: str, fail: bool) -> None:
+            calls.append(name)
+            click.echo(f'echo {name}')
+            print(f'print {name}')
+            if fail:
+                exit(3)
+
+        with create_test_env() as test_env:
+            result = create_runner(test_env, main, []).result
+            assert result.output == 'echo a\nprint a\n'
+            runner = create_runner(test_env, main, []).runner
+            assert runner.invoke(main, []).output == 'echo a\nprint a\n'
+            assert calls == ['a']
+            runner.invoke(main, ['--name', 'b'])
+            runner.invoke(main, [], env={'PYPE_TEST_CACHE': '1'})
+            runner.invoke(main, ['--refresh'])
+            runner.invoke(main, ['--no-cache'])
+            assert calls == ['a', 'b', 'a', 'a', 'a']
+            assert runner.invoke(main, []).output == 'echo a\nprint a\n'
+            assert calls == ['a', 'b', 'a', 'a', 'a']
+            # Failures are not cached by default
+            assert runner.invoke(main, ['--fail']).exit_code == 3
+            assert runner.invoke(main, ['--fail']).exit_code == 3
+            assert calls[-2:] == ['a', 'a']
+            assert listdir(path.join(test_env.config_dir, 'cache'))
+
+    def test_exceptions_not_cached(self) -> None:  # noqa: D102
+        calls: List[int] = []
+
+        @cached(cache_failures=True)
+        @click.command()
+        def main() -> None:
+            calls.append(1)
+            raise ValueError('boom')
+
+        with create_test_env() as test_env:
+            runner = create_runner(test_env, main, []).runner
+            assert isinstance(runner.invoke(main, []).exception, ValueError)
+            assert len(calls) == 2
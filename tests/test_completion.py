@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""pype.completion."""
+
+import shutil
+import subprocess
+from os import path
+from typing import List
+
+import click
+import pytest
+
+from pype.completion import build_completion_tree, render_completion_script
+from tests import create_test_env
+
+
+@click.group(context_settings=dict(help_option_names=['-h', '--help']))
+@click.option('--verbose', '-v', is_flag=True)
+@click.option('--level', type=click.Choice(['low', 'high']))
+def root(verbose: bool, level: str) -> None:  # noqa: D103
+    pass
+
+
+@root.command(name='sub-cmd')
+@click.option('--name', '-n')
+def sub_cmd(name: str) -> None:  # noqa: D103
+    pass
+
+
+def _complete(script_file: str, words: List[str]) -> List[str]:
+    script = (
+        f'. {script_file}\n'
+        'COMP_WORDS=("$@"); COMP_CWORD=$((${#COMP_WORDS[@]}-1))\n'
+        '_mycmd_cli; echo "${COMPREPLY[*]}"\n'
+    )
+    result = subprocess.run(
+        ['bash', '-c', script, 'bash'] + words,
+        stdout=subprocess.PIPE, check=True)
+    return result.stdout.decode('utf-8').split()
+
+
+class TestCompletion:  # noqa: D101
+
+    def test_build_tree(self) -> None:  # noqa: D102
+        tree = build_completion_tree(root)
+        assert tree['options'] == [
+            '--verbose', '-v', '--level', '--help', '-h']
+        assert tree['value_options'] == ['--level']
+        assert tree['choices'] == [(['--level'], ['low', 'high'])]
+        assert tree['commands']['sub-cmd']['value_options'] == [
+            '--name', '-n']
+
+    @pytest.mark.skipif(not shutil.which('bash'), reason='requires bash')
+    def test_bash_script(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            script_file = path.join(test_env.config_dir, 'complete-bsh')
+            with open(script_file, 'w+') as script_handle:
+                script_handle.write(render_completion_script(
+                    'mycmd', build_completion_tree(root), 'bsh'))
+            assert _complete(script_file, ['mycmd', 's']) == ['sub-cmd']
+            assert _complete(
+                script_file, ['mycmd', '--level', '']) == ['low', 'high']
+            assert _complete(
+                script_file, ['mycmd', '--level', 'low', 'sub-cmd', '--n']
+            ) == ['--name']
+            assert _complete(
+                script_file, ['mycmd', 'sub-cmd', '-n', 'x', '-']
+            ) == ['--name', '-n', '--help', '-h']
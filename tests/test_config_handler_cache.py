@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""pype.config_handler validated configuration cache."""
+
+from json import dump, load
+from os import path, utime
+from shutil import copyfile
+from typing import Any, List
+
+import pytest
+
+from pype import config_handler
+from pype.config_handler import PypeConfigHandler
+from pype.exceptions import PypeException
+from tests import VALID_CONFIG, ConfigTypeForTest, create_test_env
+
+
+@pytest.fixture
+def validations(monkeypatch: Any) -> List[dict]:  # noqa: D103
+    calls: List[dict] = []
+    validate_config = PypeConfigHandler.validate_config
+
+    def __count_validation(config: dict) -> bool:
+        calls.append(config)
+        return validate_config(config)
+    monkeypatch.setattr(
+        PypeConfigHandler, 'validate_config', staticmethod(__count_validation))
+    return calls
+
+
+def _load(test_env: Any) -> PypeConfigHandler:
+    return PypeConfigHandler(test_env.config_dir, test_env.config_file)
+
+
+class TestPypeConfigHandlerCache:  # noqa: D101
+
+    def test_unchanged_config_is_validated_once(  # noqa: D102
+        self, validations: List[dict]
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            for _ in range(3):
+                assert _load(test_env).get_config() == VALID_CONFIG
+            assert len(validations) == 1
+            assert path.isfile(path.join(test_env.config_dir, 'config.cache'))
+
+    def test_cache_file_survives_process(  # noqa: D102
+        self, validations: List[dict]
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            _load(test_env)
+            config_handler._VALIDATED_CONFIG_CACHE.clear()
+            assert _load(test_env).get_config() == VALID_CONFIG
+            assert len(validations) == 1
+
+    def test_changed_config_is_validated_again(  # noqa: D102
+        self, validations: List[dict]
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            _load(test_env)
+            config_json = load(open(test_env.config_file, 'r'))
+            config_json['aliases'] = []
+            dump(config_json, open(test_env.config_file, 'w+'), indent=4)
+            assert _load(test_env).config_json['aliases'] == []
+            assert len(validations) == 2
+
+    def test_touched_config_matches_hash(  # noqa: D102
+        self, validations: List[dict]
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            _load(test_env)
+            utime(test_env.config_file, ns=(0, 0))
+            assert _load(test_env).get_config() == VALID_CONFIG
+            assert len(validations) == 1
+
+    def test_invalid_change_is_validated(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            _load(test_env)
+            with open(test_env.config_file, 'w+') as config_file:
+                config_file.write('{"plugins": 1}')
+            with pytest.raises(PypeException):
+                _load(test_env)
+
+    def test_set_config_updates_cache(  # noqa: D102
+        self, validations: List[dict]
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            handler = _load(test_env)
+            config = handler.get_config()
+            config.aliases = []
+            handler.set_config(config)
+            assert _load(test_env).get_config().aliases == []
+            assert len(validations) == 2
+
+    def test_changed_schema_is_validated_again(  # noqa: D102
+        self, validations: List[dict], monkeypatch: Any
+    ) -> None:
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            _load(test_env)
+            config_handler._VALIDATED_CONFIG_CACHE.clear()
+            schema_file = path.join(test_env.config_dir, 'schema.json')
+            copyfile(config_handler.CONFIG_SCHEMA_PATH, schema_file)
+            with open(schema_file, 'a') as schema_handle:
+                schema_handle.write('\n')
+            monkeypatch.setattr(
+                config_handler, 'CONFIG_SCHEMA_PATH', schema_file)
+            config_handler.get_config_schema_digest.cache_clear()
+            try:
+                assert _load(test_env).get_config() == VALID_CONFIG
+            finally:
+                config_handler.get_config_schema_digest.cache_clear()
+            assert len(validations) == 2
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""pype.config_handler.get_config_handler."""
+
+from json import dump, load
+from os import environ
+from threading import Thread
+from typing import List
+
+import pytest
+
+import pype
+from pype.config_handler import (PypeConfigHandler, get_config_handler,
+                                 invalidate_config_handlers)
+from pype.constants import ENV_CONFIG_FOLDER
+from pype.exceptions import PypeException
+from tests import VALID_CONFIG, ConfigTypeForTest, create_test_env
+
+
+class TestPypeConfigHandlerShared:  # noqa: D101
+
+    def test_handler_is_shared(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            assert isinstance(handler, PypeConfigHandler)
+            assert get_config_handler() is handler
+            assert pype.Config() is handler
+            assert handler.get_config() == VALID_CONFIG
+
+    def test_handler_is_shared_across_threads(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handlers: List[PypeConfigHandler] = []
+            threads = [
+                Thread(target=lambda: handlers.append(get_config_handler()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(set([id(handler) for handler in handlers])) == 1
+
+    def test_reload_picks_up_external_changes(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            config_json = load(open(test_env.config_file, 'r'))
+            config_json['aliases'] = []
+            dump(config_json, open(test_env.config_file, 'w+'))
+            assert handler.get_config().aliases != []
+            handler.reload()
+            assert handler.get_config().aliases == []
+
+    def test_set_config_writes_through(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            config = get_config_handler().get_config()
+            config.aliases = []
+            get_config_handler().set_config(config)
+            assert get_config_handler().get_config().aliases == []
+            assert load(open(test_env.config_file, 'r'))['aliases'] == []
+
+    def test_invalid_set_config_is_discarded(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            config = get_config_handler().get_config()
+            config.plugins[0].users = 'someuser'  # type: ignore
+            with pytest.raises(PypeException):
+                get_config_handler().set_config(config)
+            assert get_config_handler().get_config() == VALID_CONFIG
+
+    def test_invalidate(self) -> None:  # noqa: D102
+        with create_test_env(ConfigTypeForTest.VALID) as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            invalidate_config_handlers()
+            assert get_config_handler() is not handler
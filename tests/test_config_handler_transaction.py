@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""pype.config_handler.PypeConfigHandler.transaction."""
+
+import subprocess
+import sys
+from json import load
+from os import environ, listdir, path, stat
+from typing import Any
+
+import pytest
+
+from pype.config_handler import get_config_handler
+from pype.config_model import ConfigurationAlias
+from pype.constants import ENV_CONFIG_FOLDER
+from tests import create_test_env
+
+# Python code registering an alias given as first argument
+REGISTER_ALIAS_CODE = """import sys
+from pype.config_handler import get_config_handler
+from pype.config_model import ConfigurationAlias
+with get_config_handler().transaction() as config:
+    config.aliases.append(ConfigurationAlias(sys.argv[1], 'pype x y'))
+"""
+
+
+class TestPypeConfigHandlerTransaction:  # noqa: D101
+
+    def test_nested_changes_are_written_once(  # noqa: D102
+        self, monkeypatch: Any
+    ) -> None:
+        with create_test_env() as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            writes = []
+            write = handler._PypeConfigHandler__write  # type: ignore
+            monkeypatch.setattr(
+                handler, '_PypeConfigHandler__write',
+                lambda: writes.append(write()))
+            with handler.transaction() as config:
+                config.aliases.append(ConfigurationAlias('a1', 'pype a b'))
+                with handler.transaction() as inner_config:
+                    inner_config.aliases.append(
+                        ConfigurationAlias('a2', 'pype a b'))
+                    handler.set_config(inner_config)
+                assert load(open(test_env.config_file))['aliases'] == []
+            assert len(writes) == 1
+            assert [alias['alias'] for alias in load(
+                open(test_env.config_file))['aliases']] == ['a1', 'a2']
+
+    def test_failed_transaction_is_discarded(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            with pytest.raises(SystemExit):
+                with handler.transaction() as config:
+                    config.aliases.append(ConfigurationAlias('a1', 'x'))
+                    exit(1)
+            assert handler.get_config().aliases == []
+            assert load(open(test_env.config_file))['aliases'] == []
+
+    def test_unchanged_config_is_not_written(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            handler = get_config_handler()
+            inode = stat(test_env.config_file).st_ino
+            with handler.transaction():
+                pass
+            assert stat(test_env.config_file).st_ino == inode
+
+    def test_parallel_changes_are_kept(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            env = dict(environ)
+            env[ENV_CONFIG_FOLDER] = test_env.config_dir
+            env['PYTHONPATH'] = path.dirname(path.dirname(__file__))
+            processes = [
+                subprocess.Popen([
+                    sys.executable, '-c', REGISTER_ALIAS_CODE, f'alias{i}'
+                ], env=env)
+                for i in range(12)
+            ]
+            assert [process.wait() for process in processes] == [0] * 12
+            aliases = load(open(test_env.config_file))['aliases']
+            assert sorted([alias['alias'] for alias in aliases]) == sorted(
+                [f'alias{i}' for i in range(12)])
+            assert not [
+                filename for filename in listdir(test_env.config_dir)
+                if filename.startswith('config.json') and filename not in
+                ['config.json', 'config.json.lock']
+            ]
@@ -34,7 +34,8 @@ class TestPypeConfigModel:  # noqa: D101
             'plugins': [],
             'aliases': [],
             'core_config': {
-                'logging': logging_as_dict
+                'logging': logging_as_dict,
+                'scan_workers': 1
             }
         }
 
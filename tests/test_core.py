@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""pype.core."""
+
+from json import dump, load
+from os import environ, mkdir, path, stat, utime
+from typing import Any
+
+from pytest import raises
+
+from pype.config_handler import get_config_handler, invalidate_config_handlers
+from pype.config_model import ConfigurationAlias
+from pype.constants import ENV_CONFIG_FOLDER
+from pype.core import PypeCore
+from pype.exceptions import PypeException
+from tests import create_plugin, create_test_env
+
+
+def _set_scan_workers(config_file: str, workers: int) -> None:
+    config = load(open(config_file, 'r'))
+    config['core_config']['scan_workers'] = workers
+    dump(config, open(config_file, 'w'))
+
+
+class TestPypeCore:  # noqa: D101
+
+    def test_parallel_scan_keeps_order(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            names = [f'scan_plugin_{index}' for index in range(8)]
+            for name in reversed(names):
+                create_plugin(test_env, name, {
+                    f'pype_{index}': f'"""Pype {index}."""\n'
+                    for index in range(5)})
+            _set_scan_workers(test_env.config_file, 4)
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            invalidate_config_handlers()
+            core = PypeCore()
+            assert [plugin.name for plugin in core.get_plugins()] == list(
+                reversed(names)) + ['pype.config']
+            plugin = core.get_plugin('scan_plugin_3')
+            assert plugin and plugin.command_names == [
+                f'pype-{index}' for index in range(5)]
+
+    def test_parallel_scan_raises_first_error(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            create_plugin(test_env, 'scan_plugin_ok', {})
+            config = load(open(test_env.config_file, 'r'))
+            config['plugins'].extend([
+                {'name': 'scan_missing_1', 'path': '/nowhere', 'users': []},
+                {'name': 'scan_missing_2', 'path': '/nowhere', 'users': []}
+            ])
+            config['core_config']['scan_workers'] = 3
+            dump(config, open(test_env.config_file, 'w'))
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            invalidate_config_handlers()
+            with raises(PypeException, match='scan_missing_1'):
+                PypeCore()
+
+    def test_install_to_shell_rewrites_changes_only(  # noqa: D102
+        self,
+        monkeypatch: Any
+    ) -> None:
+        with create_test_env() as test_env:
+            home_dir = path.join(test_env.config_dir, 'home')
+            mkdir(home_dir)
+            rc_file = path.join(home_dir, '.bashrc')
+            with open(rc_file, 'w') as rc_handle:
+                rc_handle.write('export EDITOR=vim')
+            monkeypatch.setenv('HOME', home_dir)
+            monkeypatch.setattr('pype.core.in_virtualenv', lambda: False)
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            invalidate_config_handlers()
+            core = PypeCore()
+            core.install_to_shell()
+            init_file = path.join(test_env.config_dir, 'initfile-bsh')
+            complete_file = path.join(test_env.config_dir, 'complete-bsh')
+            files = [rc_file, init_file, complete_file]
+            for file in files:
+                utime(file, ns=(1, 1))
+            core.install_to_shell()
+            assert [stat(file).st_mtime_ns for file in files] == [1, 1, 1]
+            with get_config_handler().transaction() as config:
+                config.aliases.append(ConfigurationAlias('myalias', 'ls'))
+            core.install_to_shell()
+            assert [stat(file).st_mtime_ns == 1 for file in files] == [
+                True, False, True]
+            assert 'alias myalias="ls"' in open(init_file).read()
+            rc_lines = open(rc_file).read().split('\n')
+            assert rc_lines[0] == 'export EDITOR=vim'
+            assert len([line for line in rc_lines if 'pype-cli' in line]) == 2
+
+    def test_aliases_follow_in_place_changes(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            invalidate_config_handlers()
+            config_handler = get_config_handler()
+            config = config_handler.get_config()
+            config.aliases.append(ConfigurationAlias('a', 'x'))
+            config_handler.set_config(config)
+            core = PypeCore()
+            assert core.get_aliases() == ['a']
+            config = config_handler.get_config()
+            config.aliases[0] = ConfigurationAlias('b', 'y')
+            config_handler.set_config(config)
+            assert core.get_aliases() == ['b']
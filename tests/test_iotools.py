@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""pype.util.iotools."""
+
+from os import chmod, environ, listdir, path, stat
+from subprocess import DEVNULL
+from time import sleep, time
+from typing import Any
+
+from pype.constants import ENV_CONFIG_FOLDER
+from pype.util import iotools
+from pype.util.iotools import (atomic_write, clear_output_cache,
+                               get_output_cache_stats, resolve_cmdline,
+                               run_and_get_output, run_and_stream_output,
+                               run_interactive, run_many_and_get_output,
+                               run_many_interactive)
+from tests import create_test_env
+
+
+class TestAtomicWrite:  # noqa: D101
+
+    def test_replace_keeps_mode(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            target = path.join(test_env.config_dir, 'target.txt')
+            with open(target, 'w') as target_handle:
+                target_handle.write('old')
+            chmod(target, 0o640)
+            with atomic_write(target, 'w', durable=True) as target_handle:
+                target_handle.write('new')
+            assert open(target).read() == 'new'
+            assert stat(target).st_mode & 0o777 == 0o640
+
+    def test_error_keeps_target(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            target = path.join(test_env.config_dir, 'target.txt')
+            with open(target, 'w') as target_handle:
+                target_handle.write('old')
+            files = sorted(listdir(test_env.config_dir))
+            try:
+                with atomic_write(target, 'w') as target_handle:
+                    target_handle.write('new')
+                    raise ValueError()
+            except ValueError:
+                pass
+            assert open(target).read() == 'old'
+            assert sorted(listdir(test_env.config_dir)) == files
+
+
+class TestExecMode:  # noqa: D101
+
+    def test_resolve_modes(self) -> None:  # noqa: D102
+        assert resolve_cmdline('ls -la') == ('ls -la', {'shell': True})
+        assert resolve_cmdline(['ls -la']) == ('ls -la', {'shell': True})
+        args, kwargs = resolve_cmdline(['ls', '-la'])
+        assert args[0].startswith('/') and args[0].endswith('/ls')
+        assert args[1:] == ['-la']
+        assert kwargs == {'shell': False, 'close_fds': False}
+        args, kwargs = resolve_cmdline(['ls'], shell=False)
+        assert kwargs['shell'] is False
+        assert resolve_cmdline(['echo', 'a'], shell=True) == (
+            ['echo', 'a'], {'shell': True})
+
+    def test_argv_is_not_interpreted(self) -> None:  # noqa: D102
+        stdout, _ = run_and_get_output(['echo', '$HOME; echo', '*'])
+        assert stdout == '$HOME; echo *\n'
+        stdout, _ = run_and_get_output('echo a; echo b')
+        assert stdout == 'a\nb\n'
+        stdout, _ = run_and_get_output(['echo a | tr a b'])
+        assert stdout == 'b\n'
+
+    def test_exit_codes(self) -> None:  # noqa: D102
+        assert run_interactive(['sh', '-c', 'exit 3']) == 3
+        assert run_interactive(['no-such-pype-command', 'arg'],
+                               stderr=DEVNULL) == 127
+        _, stderr = run_and_get_output(['no-such-pype-command', 'arg'])
+        assert 'no-such-pype-command' in stderr
+
+
+class TestOutputCache:  # noqa: D101
+
+    def setup_method(self) -> None:  # noqa: D102
+        clear_output_cache()
+        for key in iotools.OUTPUT_CACHE_STATS.keys():
+            iotools.OUTPUT_CACHE_STATS[key] = 0
+
+    def test_memoized_in_process(self) -> None:  # noqa: D102
+        cmdline = 'echo $$'
+        first, _ = run_and_get_output(cmdline, cache_ttl=60)
+        assert run_and_get_output(cmdline, cache_ttl=60)[0] == first
+        assert run_and_get_output(cmdline)[0] != first
+        assert run_and_get_output(cmdline, cache_ttl=60, cwd='/')[0] != first
+        assert get_output_cache_stats() == {
+            'hits': 1, 'disk hits': 0, 'misses': 2, 'entries': 2}
+
+    def test_ttl_env_and_failures(self) -> None:  # noqa: D102
+        cmdline = 'echo $$'
+        first, _ = run_and_get_output(cmdline, cache_ttl=0.1)
+        sleep(0.2)
+        assert run_and_get_output(cmdline, cache_ttl=0.1)[0] != first
+        first, _ = run_and_get_output(
+            cmdline, cache_ttl=60, cache_env=['PYPE_TEST_SHO'])
+        environ['PYPE_TEST_SHO'] = '1'
+        try:
+            assert run_and_get_output(
+                cmdline, cache_ttl=60, cache_env=['PYPE_TEST_SHO'])[0] != first
+        finally:
+            del environ['PYPE_TEST_SHO']
+        run_and_get_output('exit 1', cache_ttl=60)
+        run_and_get_output('exit 1', cache_ttl=60)
+        assert get_output_cache_stats()['misses'] == 6
+
+    def test_disk_tier(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            environ[ENV_CONFIG_FOLDER] = test_env.config_dir
+            first, _ = run_and_get_output(
+                'echo $$', cache_ttl=60, cache_disk=True)
+            clear_output_cache()
+            assert run_and_get_output(
+                'echo $$', cache_ttl=60, cache_disk=True)[0] == first
+            assert run_and_get_output(
+                'echo $$', cache_ttl=60, cache_disk=True)[0] == first
+            assert get_output_cache_stats() == {
+                'hits': 1, 'disk hits': 1, 'misses': 1, 'entries': 1}
+            clear_output_cache(disk=True)
+            assert run_and_get_output(
+                'echo $$', cache_ttl=60, cache_disk=True)[0] != first
+
+
+class TestRunAndStreamOutput:  # noqa: D101
+
+    def test_lines_arrive_while_running(self) -> None:  # noqa: D102
+        start = time()
+        arrivals = []
+        with run_and_stream_output(
+            ['echo first; sleep 1; echo second']
+        ) as stream:
+            for line in stream:
+                arrivals.append((line, time() - start))
+            assert stream.wait() == 0
+        assert [line for line, _ in arrivals] == ['first\n', 'second\n']
+        assert arrivals[0][1] < 0.9
+
+    def test_stderr_and_exit_code(self) -> None:  # noqa: D102
+        stream = run_and_stream_output(
+            ['for i in 1 2 3; do echo err$i >&2; done; printf out; exit 3'],
+            stderr_lines=2)
+        assert list(stream) == ['out']
+        assert stream.wait() == 3
+        assert list(stream.stderr) == ['err2\n', 'err3\n']
+
+    def test_bounded_lines_and_decoding(self) -> None:  # noqa: D102
+        stream = run_and_stream_output(
+            ["printf 'abcdefg\\303'; printf '\\244\\n'"],
+            chunk_size=1, max_line_length=3)
+        assert list(stream) == ['abc', 'def', 'gä\n']
+
+    def test_close_terminates_child(self) -> None:  # noqa: D102
+        stream = run_and_stream_output(['yes'])
+        assert next(iter(stream)) == 'y\n'
+        stream.close()
+        assert stream.returncode is not None
+
+    def test_tee(self, capfd: Any) -> None:  # noqa: D102
+        stream = run_and_stream_output(['echo out; echo err >&2'], tee=True)
+        assert list(stream) == ['out\n']
+        stream.wait()
+        captured = capfd.readouterr()
+        assert captured.out == 'out\n'
+        assert captured.err == 'err\n'
+
+    def test_dry_run(self) -> None:  # noqa: D102
+        stream = run_and_stream_output(['echo out'], dry_run=True)
+        assert list(stream) == []
+        assert stream.wait() == 0
+
+
+class TestRunMany:  # noqa: D101
+
+    def test_output_in_order_of_commands(self) -> None:  # noqa: D102
+        results = run_many_and_get_output(
+            [[f'sleep 0.{9 - i}; echo {i}'] for i in range(5)],
+            max_workers=5)
+        assert [result.stdout for result in results] == [
+            f'{i}\n' for i in range(5)]
+        assert results.returncode == 0
+        assert results.summary() == '5/5 commands succeeded, 0 failed.'
+
+    def test_bounded_concurrency(self) -> None:  # noqa: D102
+        start = time()
+        run_many_and_get_output([['sleep 0.3']] * 4, max_workers=2)
+        assert time() - start >= 0.6
+
+    def test_timeout_and_exit_codes(self) -> None:  # noqa: D102
+        start = time()
+        results = run_many_and_get_output(
+            [['echo ok'], ['echo partial; sleep 10'], ['exit 3']],
+            timeout=0.5)
+        assert time() - start < 5
+        assert [result.timed_out for result in results] == [
+            False, True, False]
+        assert results[1].stdout == 'partial\n'
+        assert [result.returncode for result in results.failed][1] == 3
+        assert results.returncode == results[1].returncode != 0
+        assert '(1 timed out)' in results.summary()
+
+    def test_prefixed_output(self, capfd: Any) -> None:  # noqa: D102
+        results = run_many_interactive(
+            [['echo one; echo two'], ['echo three >&2']],
+            labels=['a', 'bb'])
+        assert results.returncode == 0
+        captured = capfd.readouterr()
+        assert sorted(captured.out.splitlines()) == [
+            '[a ] one', '[a ] two']
+        assert captured.err == '[bb] three\n'
+
+    def test_dry_run(self, capfd: Any) -> None:  # noqa: D102
+        results = run_many_interactive(
+            [['touch /nonexisting/file']], dry_run=True)
+        assert results.returncode == 0
+        assert capfd.readouterr().out == "$: ['touch /nonexisting/file']\n"
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""pype.manifest."""
+
+from concurrent.futures import ThreadPoolExecutor
+from json import dump, load
+from os import mkdir, path, utime
+
+from pype.config_model import ConfigurationPlugin
+from pype.manifest import PluginManifest
+from pype.type_plugin import Plugin
+from tests import create_test_env
+
+
+def _create_plugin(config_dir: str, name: str) -> ConfigurationPlugin:
+    plugin_dir = path.join(config_dir, name)
+    mkdir(plugin_dir)
+    with open(path.join(plugin_dir, '__init__.py'), 'w+') as init:
+        init.write('"""Test plugin."""\n')
+    with open(path.join(plugin_dir, 'first.py'), 'w+') as pype:
+        pype.write('"""First pype."""\n')
+    return ConfigurationPlugin(name, config_dir)
+
+
+class TestPluginManifest:  # noqa: D101
+
+    def test_manifest_written(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            plugin_cfg = _create_plugin(test_env.config_dir, 'mfplugin_a')
+            manifest = PluginManifest(test_env.config_dir)
+            plugin = Plugin(plugin_cfg, test_env.config_file, manifest)
+            manifest.save()
+            assert [pype.doc for pype in plugin.pypes] == ['First pype.']
+            content = load(open(manifest.filepath, 'r'))
+            entry = content['plugins'][plugin.abspath]
+            assert entry['files']['first.py']['doc'] == 'First pype.'
+
+    def test_cached_docstring_reused(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            plugin_cfg = _create_plugin(test_env.config_dir, 'mfplugin_b')
+            manifest = PluginManifest(test_env.config_dir)
+            plugin = Plugin(plugin_cfg, test_env.config_file, manifest)
+            manifest.save()
+            # Tamper with cache to verify it is used for unchanged files
+            content = load(open(manifest.filepath, 'r'))
+            content['plugins'][plugin.abspath]['files'][
+                'first.py']['doc'] = 'From cache.'
+            dump(content, open(manifest.filepath, 'w'))
+            manifest = PluginManifest(test_env.config_dir)
+            plugin = Plugin(plugin_cfg, test_env.config_file, manifest)
+            assert [pype.doc for pype in plugin.pypes] == ['From cache.']
+
+    def test_changed_file_rescanned(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            plugin_cfg = _create_plugin(test_env.config_dir, 'mfplugin_c')
+            manifest = PluginManifest(test_env.config_dir)
+            plugin = Plugin(plugin_cfg, test_env.config_file, manifest)
+            manifest.save()
+            pype_file = path.join(plugin.abspath, 'first.py')
+            with open(pype_file, 'w') as pype:
+                pype.write('"""Changed pype."""\n')
+            utime(pype_file, ns=(0, 0))
+            with open(path.join(plugin.abspath, 'second.py'), 'w+') as pype:
+                pype.write('"""Second pype."""\n')
+            manifest = PluginManifest(test_env.config_dir)
+            plugin = Plugin(plugin_cfg, test_env.config_file, manifest)
+            assert [pype.doc for pype in plugin.pypes] == [
+                'Changed pype.', 'Second pype.']
+
+    def test_concurrent_access(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            manifest = PluginManifest(test_env.config_dir)
+
+            def __update(index: int) -> None:
+                abspath = f'/plugin/{index % 10}'
+                manifest.get_plugin(abspath)
+                manifest.set_plugin(abspath, {'mtime': index, 'files': {}})
+                if index % 7 == 0:
+                    manifest.save()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(__update, range(2000)))
+            manifest.save()
+            content = load(open(manifest.filepath, 'r'))
+            assert sorted(content['plugins'].keys()) == [
+                f'/plugin/{index}' for index in range(10)]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""pype.plugin_finder."""
+
+import importlib
+import sys
+from importlib import _bootstrap_external
+from typing import Any, Callable, List
+
+from pype.config_model import ConfigurationPlugin
+from pype.plugin_finder import PLUGIN_FINDER
+from pype.type_plugin import Plugin
+from tests import create_plugin, create_test_env
+
+
+def _count_stats(monkeypatch: Any, action: Callable[[], Any]) -> int:
+    calls: List[str] = []
+    original_stat = _bootstrap_external._path_stat  # type: ignore
+
+    def __counting_stat(filepath: str) -> Any:
+        calls.append(filepath)
+        return original_stat(filepath)
+    monkeypatch.setattr(_bootstrap_external, '_path_stat', __counting_stat)
+    try:
+        action()
+    finally:
+        monkeypatch.setattr(_bootstrap_external, '_path_stat', original_stat)
+    return len(calls)
+
+
+def _import_missing() -> None:
+    try:
+        importlib.import_module('pype_finder_no_such_module')
+    except ImportError:
+        pass
+
+
+class TestPluginFinder:  # noqa: D101
+
+    def test_stat_counts_independent_of_plugins(  # noqa: D102
+        self,
+        monkeypatch: Any
+    ) -> None:
+        sys_path = list(sys.path)
+        counts = []
+        for plugin_count in [1, 10]:
+            with create_test_env() as test_env:
+                names = [f'finder_plugin_{plugin_count}_{index}'
+                         for index in range(plugin_count)]
+                for name in names:
+                    create_plugin(test_env, name, {'my_pype': '"""Pype."""\n'})
+                    Plugin(ConfigurationPlugin(name, test_env.config_dir),
+                           test_env.config_file)
+                    Plugin(ConfigurationPlugin(name, test_env.config_dir),
+                           test_env.config_file)
+                assert sys.path == sys_path
+                importlib.invalidate_caches()
+                counts.append((
+                    _count_stats(monkeypatch, lambda: importlib.import_module(
+                        f'{names[-1]}.my_pype')),
+                    _count_stats(monkeypatch, _import_missing)
+                ))
+                assert sys.modules[f'{names[-1]}.my_pype'].__doc__ == 'Pype.'
+                for name in names:
+                    sys.modules.pop(f'{name}.my_pype', None)
+                    sys.modules.pop(name, None)
+                    PLUGIN_FINDER.plugins.pop(name)
+        assert counts[0] == counts[1]
+
+    def test_unregistered_and_missing_plugins(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            PLUGIN_FINDER.register('finder_missing', test_env.config_dir)
+            try:
+                assert PLUGIN_FINDER.find_spec('finder_missing') is None
+                assert PLUGIN_FINDER.find_spec('finder_unknown') is None
+            finally:
+                PLUGIN_FINDER.plugins.pop('finder_missing')
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""pype.util.profiler."""
+
+from json import load
+from os import path
+from tempfile import TemporaryDirectory
+
+import click
+
+from pype.util.profiler import (NO_SPAN, ROOT_VALUE_OPTIONS, Profiler,
+                                startup_profile_requested)
+
+
+def _profile() -> Profiler:
+    profiler = Profiler()
+    profiler.activate()
+    for _ in range(2):
+        with profiler.span('outer'):
+            with profiler.span('inner', key='value'):
+                profiler.count('things')
+    with profiler.span('other'):
+        pass
+    return profiler
+
+
+class TestProfiler:  # noqa: D101
+
+    def test_inactive_profiler_is_noop(self) -> None:  # noqa: D102
+        profiler = Profiler()
+        assert profiler.span('span') is NO_SPAN
+        with profiler.span('span'):
+            profiler.count('things')
+        assert not profiler.spans
+        assert not profiler.counters
+
+    def test_nested_spans_are_aggregated(self) -> None:  # noqa: D102
+        profiler = _profile()
+        stats = profiler.aggregate()
+        assert list(stats.keys()) == [
+            ('outer',), ('outer', 'inner'), ('other',)]
+        calls, total_ns, self_ns = stats[('outer',)]
+        assert calls == 2
+        assert self_ns == total_ns - stats[('outer', 'inner')][1]
+        assert profiler.counters == {'things': 2}
+        profiler.finish()
+
+    def test_report(self) -> None:  # noqa: D102
+        profiler = _profile()
+        lines = profiler.format_report().split('\n')
+        assert lines[0].startswith('PYPE STARTUP PROFILE')
+        assert lines[2].endswith('     2  outer')
+        assert lines[3].endswith('     2    inner')
+        assert lines[4].endswith('     1  other')
+        assert lines[-1].endswith('  things')
+        profiler.finish()
+
+    def test_chrome_trace(self) -> None:  # noqa: D102
+        profiler = _profile()
+        with TemporaryDirectory() as tmp_dir:
+            trace_file = path.join(tmp_dir, 'trace.json')
+            profiler.write_trace(trace_file)
+            trace = load(open(trace_file, 'r'))
+        spans = [event for event in trace['traceEvents']
+                 if event['ph'] == 'X']
+        assert [event['name'] for event in spans] == [
+            'outer', 'inner', 'outer', 'inner', 'other']
+        assert spans[1]['args'] == {'key': 'value'}
+        assert spans[0]['ts'] <= spans[1]['ts']
+        assert spans[0]['dur'] >= spans[1]['dur']
+        assert trace['otherData']['counters']['things'] == 2
+        profiler.finish()
+
+    def test_startup_profile_requested(self) -> None:  # noqa: D102
+        assert startup_profile_requested(['pype', '--profile-startup'])
+        assert startup_profile_requested(
+            ['pype', '-l', '--profile-startup'])
+        assert not startup_profile_requested(
+            ['pype', 'plugin', 'pype', '--profile-startup'])
+        assert not startup_profile_requested(['pype'])
+        assert startup_profile_requested(
+            ['pype', '-l', '--filter', 'basics*', '--profile-startup'])
+        assert startup_profile_requested(
+            ['pype', '-u', 'myalias', '--profile-startup'])
+        assert startup_profile_requested(
+            ['pype', '-lr', 'myalias', '--profile-startup'])
+        assert not startup_profile_requested(
+            ['pype', '-rmyalias', 'plugin', '--profile-startup'])
+
+    def test_root_value_options(self) -> None:  # noqa: D102
+        from pype.__main__ import main
+        value_options = [
+            opt for param in main.params
+            if isinstance(param, click.Option) and not param.is_flag
+            for opt in param.opts]
+        assert sorted(value_options) == sorted(ROOT_VALUE_OPTIONS)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""pype.type_plugin."""
+
+import sys
+from os import mkdir, path
+
+from pytest import raises
+
+from pype.config_model import ConfigurationPlugin
+from pype.exceptions import PypeException
+from pype.type_plugin import Plugin
+from tests import create_plugin, create_test_env
+
+
+class TestPlugin:  # noqa: D101
+
+    def test_module_imported_lazily(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            name = 'lazy_test_plugin'
+            plugin_dir = path.join(test_env.config_dir, name)
+            mkdir(plugin_dir)
+            with open(path.join(plugin_dir, '__init__.py'), 'w+') as init:
+                init.write('"""Lazy plugin."""\n')
+            plugin = Plugin(
+                ConfigurationPlugin(name, test_env.config_dir),
+                test_env.config_file)
+            assert plugin.doc == 'Lazy plugin.'
+            assert name not in sys.modules
+            assert plugin.module.__doc__ == 'Lazy plugin.'
+            assert name in sys.modules
+
+    def test_missing_plugin(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            with raises(PypeException):
+                Plugin(
+                    ConfigurationPlugin('not_there', test_env.config_dir),
+                    test_env.config_file)
+
+    def test_pype_lookup(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            create_plugin(test_env, 'lookup_test_plugin', {
+                'my_pype': '"""My pype."""\n',
+                'other': '"""Other."""\n'
+            })
+            plugin = Plugin(
+                ConfigurationPlugin('lookup_test_plugin', test_env.config_dir),
+                test_env.config_file)
+            assert plugin.command_names == ['my-pype', 'other']
+            pype = plugin.get_pype('my_pype')
+            assert pype and pype.doc == 'My pype.'
+            assert plugin.get_pype('my-pype') is None
+
+    def test_pype_filenames(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            create_plugin(test_env, 'filename_test_plugin', {
+                'my__pype': '"""Double underscores inside."""\n',
+                '__commons__': '"""Shared code."""\n',
+                '__hidden': '"""Hidden."""\n'
+            })
+            plugin_dir = path.join(test_env.config_dir, 'filename_test_plugin')
+            mkdir(path.join(plugin_dir, 'folder.py'))
+            plugin = Plugin(
+                ConfigurationPlugin(
+                    'filename_test_plugin', test_env.config_dir),
+                test_env.config_file)
+            assert plugin.command_names == ['my--pype']
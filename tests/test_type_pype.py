@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""pype.type_pype.get_module_docstring."""
+
+from os import path
+from typing import IO, Any, List
+
+from pype import type_pype
+from pype.constants import NOT_DOCUMENTED_YET
+from pype.type_pype import get_module_docstring
+from tests import create_test_env
+
+
+def _write_module(directory: str, name: str, content: str) -> str:
+    filepath = path.join(directory, name)
+    with open(filepath, 'w+') as module_file:
+        module_file.write(content)
+    return filepath
+
+
+def _function(index: int) -> str:
+    return f'def func_{index}() -> int:\n    return {index}\n\n\n'
+
+
+class _CountingReader:
+    """Binary file counting the lines read from it."""
+
+    def __init__(self, file_handle: IO[bytes], lines: List[bytes]) -> None:
+        self.file_handle = file_handle
+        self.lines = lines
+
+    def readline(self) -> bytes:
+        line = self.file_handle.readline()
+        self.lines.append(line)
+        return line
+
+    def __enter__(self) -> '_CountingReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.file_handle.close()
+
+
+def _lines_read(filepath: str, monkeypatch: Any) -> int:
+    lines: List[bytes] = []
+    monkeypatch.setattr(
+        type_pype, 'open',
+        lambda filepath, mode: _CountingReader(open(filepath, 'rb'), lines),
+        raising=False)
+    get_module_docstring(filepath)
+    monkeypatch.delattr(type_pype, 'open')
+    return len(lines)
+
+
+class TestGetModuleDocstring:  # noqa: D101
+
+    def test_docstrings(self) -> None:  # noqa: D102
+        with create_test_env() as test_env:
+            cases = {
+                '"""Simple."""\n': 'Simple.',
+                '# -*- coding: utf-8 -*-\n\n"""After comment."""\n':
+                'After comment.',
+                '"""Multi\n\nline."""\nimport os\n': 'Multi\n\nline.',
+                '"Con" "cat"\n': 'Concat',
+                '"""Semi."""; import os\n': 'Semi.',
+                'import os\n"""Not first."""\n': NOT_DOCUMENTED_YET,
+                '"""Expr.""".strip()\n': NOT_DOCUMENTED_YET,
+                'b"""Bytes."""\n': NOT_DOCUMENTED_YET,
+                '': NOT_DOCUMENTED_YET,
+                '"""Unterminated\n': NOT_DOCUMENTED_YET,
+            }
+            for index, (content, expected) in enumerate(cases.items()):
+                filepath = _write_module(
+                    test_env.config_dir, f'module_{index}.py', content)
+                assert get_module_docstring(filepath) == expected
+
+    def test_cost_independent_of_file_length(  # noqa: D102
+        self, monkeypatch: Any
+    ) -> None:
+        with create_test_env() as test_env:
+            header = '# -*- coding: utf-8 -*-\n"""Benchmark pype."""\n\n'
+            small_file = _write_module(
+                test_env.config_dir, 'small.py', header + _function(0))
+            huge_file = _write_module(
+                test_env.config_dir, 'huge.py',
+                header + ''.join([_function(i) for i in range(20000)]))
+            assert get_module_docstring(huge_file) == 'Benchmark pype.'
+            small_lines = _lines_read(small_file, monkeypatch)
+            assert small_lines > 0
+            assert _lines_read(huge_file, monkeypatch) == small_lines